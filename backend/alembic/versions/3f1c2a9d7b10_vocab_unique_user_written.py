@@ -0,0 +1,65 @@
+"""Unique vocabulary word per user and written form
+
+Revision ID: 3f1c2a9d7b10
+Revises:
+Create Date: 2026-10-19 10:12:41.508316
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2a9d7b10"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("vocab_words"):
+        return
+
+    indexes = {index["name"] for index in inspector.get_indexes("vocab_words")}
+    if "uq_user_written" in indexes:
+        return
+
+    # Words created with their lemma are already unique by primary key
+    columns = {column["name"] for column in inspector.get_columns("vocab_words")}
+    if "written" not in columns:
+        return
+
+    # Keep only the most recent row of each duplicated word
+    op.execute("""
+        DELETE FROM vocab_words
+        WHERE EXISTS (
+            SELECT 1 FROM vocab_words AS newer
+            WHERE newer.user_id = vocab_words.user_id
+            AND newer.written = vocab_words.written
+            AND (
+                newer.updated_at > vocab_words.updated_at
+                OR (
+                    newer.updated_at = vocab_words.updated_at
+                    AND newer.id > vocab_words.id
+                )
+            )
+        )
+        """)
+
+    # Status summaries counted the duplicates, they are rebuilt on next use
+    if inspector.has_table("vocab_status"):
+        op.execute("DELETE FROM vocab_status")
+
+    op.create_index(
+        "uq_user_written", "vocab_words", ["user_id", "written"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_user_written", table_name="vocab_words")
@@ -0,0 +1,70 @@
+"""Vocabulary change sequence and tombstones
+
+Revision ID: 8b4e6d2c1f57
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-19 11:03:27.114208
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8b4e6d2c1f57"
+down_revision: Union[str, None] = "3f1c2a9d7b10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    # Existing words come first in the change sequence
+    for table in ("vocab_words", "vocab_status"):
+        if not inspector.has_table(table):
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "change_seq" not in columns:
+            op.add_column(
+                table,
+                sa.Column(
+                    "change_seq", sa.Integer(), nullable=False, server_default="0"
+                ),
+            )
+
+    indexes = {index["name"] for index in inspector.get_indexes("vocab_words")}
+    if "idx_user_change" not in indexes:
+        op.create_index(
+            "idx_user_change", "vocab_words", ["user_id", "change_seq", "written"]
+        )
+
+    if not inspector.has_table("vocab_tombstones"):
+        op.create_table(
+            "vocab_tombstones",
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("written", sa.String(), nullable=False),
+            sa.Column("change_seq", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("user_id", "written"),
+        )
+        op.create_index(
+            "idx_tombstone_user_change",
+            "vocab_tombstones",
+            ["user_id", "change_seq", "written"],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_tombstone_user_change", table_name="vocab_tombstones")
+    op.drop_table("vocab_tombstones")
+    op.drop_index("idx_user_change", table_name="vocab_words")
+    inspector = sa.inspect(op.get_bind())
+    for table in ("vocab_words", "vocab_status"):
+        if inspector.has_table(table):
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.drop_column("change_seq")
@@ -0,0 +1,51 @@
+"""Ranked word lists for bulk vocabulary marking
+
+Revision ID: a9f3c6e2b714
+Revises: e2d94b6a0c81
+Create Date: 2026-10-19 17:12:31.508264
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a9f3c6e2b714"
+down_revision: Union[str, None] = "e2d94b6a0c81"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("word_lists"):
+        return
+
+    op.create_table(
+        "word_lists",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "word_list_entries",
+        sa.Column("list_id", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("lemma_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["list_id"], ["word_lists.id"]),
+        sa.ForeignKeyConstraint(["lemma_id"], ["lemmas.id"]),
+        sa.PrimaryKeyConstraint("list_id", "rank"),
+        sqlite_with_rowid=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("word_list_entries")
+    op.drop_table("word_lists")
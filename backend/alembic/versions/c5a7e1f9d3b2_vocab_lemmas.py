@@ -0,0 +1,167 @@
+"""Shared lemma table and compact vocabulary words
+
+Revision ID: c5a7e1f9d3b2
+Revises: 8b4e6d2c1f57
+Create Date: 2026-10-19 14:26:09.731542
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5a7e1f9d3b2"
+down_revision: Union[str, None] = "8b4e6d2c1f57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Stored code of each vocabulary status
+STATUS_CODES = {"unknown": 0, "learned": 1, "ignore": 2, "seen": 3}
+
+STATUS_TO_CODE = (
+    "CASE status "
+    + " ".join(f"WHEN '{status}' THEN {code}" for status, code in STATUS_CODES.items())
+    + " ELSE 0 END"
+)
+CODE_TO_STATUS = (
+    "CASE status "
+    + " ".join(f"WHEN {code} THEN '{status}'" for status, code in STATUS_CODES.items())
+    + " ELSE 'unknown' END"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("vocab_words")}
+    if "lemma_id" in columns:
+        return
+
+    if not inspector.has_table("lemmas"):
+        op.create_table(
+            "lemmas",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("written", sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("written"),
+        )
+    op.execute("""
+        INSERT INTO lemmas (written)
+        SELECT written FROM vocab_words
+        UNION
+        SELECT written FROM vocab_tombstones
+        EXCEPT
+        SELECT written FROM lemmas
+        """)
+
+    # Tables are rebuilt, as their primary keys change
+    op.create_table(
+        "vocab_words_new",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("lemma_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.SmallInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("change_seq", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["lemma_id"], ["lemmas.id"]),
+        sa.PrimaryKeyConstraint("user_id", "lemma_id"),
+        sqlite_with_rowid=False,
+    )
+    op.execute(f"""
+        INSERT INTO vocab_words_new
+            (user_id, lemma_id, status, updated_at, change_seq)
+        SELECT user_id, lemmas.id, {STATUS_TO_CODE}, updated_at, change_seq
+        FROM vocab_words JOIN lemmas USING (written)
+        """)
+    op.drop_table("vocab_words")
+    op.rename_table("vocab_words_new", "vocab_words")
+    op.create_index(
+        "idx_user_status", "vocab_words", ["user_id", "status", "updated_at"]
+    )
+    op.create_index("idx_user_updated", "vocab_words", ["user_id", "updated_at"])
+    op.create_index(
+        "idx_user_change", "vocab_words", ["user_id", "change_seq", "lemma_id"]
+    )
+
+    op.create_table(
+        "vocab_tombstones_new",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("lemma_id", sa.Integer(), nullable=False),
+        sa.Column("change_seq", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["lemma_id"], ["lemmas.id"]),
+        sa.PrimaryKeyConstraint("user_id", "lemma_id"),
+        sqlite_with_rowid=False,
+    )
+    op.execute("""
+        INSERT INTO vocab_tombstones_new (user_id, lemma_id, change_seq)
+        SELECT user_id, lemmas.id, change_seq
+        FROM vocab_tombstones JOIN lemmas USING (written)
+        """)
+    op.drop_table("vocab_tombstones")
+    op.rename_table("vocab_tombstones_new", "vocab_tombstones")
+    op.create_index(
+        "idx_tombstone_user_change",
+        "vocab_tombstones",
+        ["user_id", "change_seq", "lemma_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        "vocab_words_old",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("written", sa.String(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("change_seq", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(f"""
+        INSERT INTO vocab_words_old
+            (written, status, updated_at, change_seq, user_id)
+        SELECT lemmas.written, {CODE_TO_STATUS}, updated_at, change_seq, user_id
+        FROM vocab_words JOIN lemmas ON lemmas.id = vocab_words.lemma_id
+        """)
+    op.drop_table("vocab_words")
+    op.rename_table("vocab_words_old", "vocab_words")
+    op.create_index("ix_vocab_words_written", "vocab_words", ["written"])
+    op.create_index("ix_vocab_words_updated_at", "vocab_words", ["updated_at"])
+    op.create_index("ix_vocab_words_user_id", "vocab_words", ["user_id"])
+    op.create_index("idx_user_updated", "vocab_words", ["user_id", "updated_at"])
+    op.create_index("idx_user_status", "vocab_words", ["user_id", "status"])
+    op.create_index(
+        "uq_user_written", "vocab_words", ["user_id", "written"], unique=True
+    )
+    op.create_index(
+        "idx_user_change", "vocab_words", ["user_id", "change_seq", "written"]
+    )
+
+    op.create_table(
+        "vocab_tombstones_old",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("written", sa.String(), nullable=False),
+        sa.Column("change_seq", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "written"),
+    )
+    op.execute("""
+        INSERT INTO vocab_tombstones_old (user_id, written, change_seq)
+        SELECT user_id, lemmas.written, change_seq
+        FROM vocab_tombstones JOIN lemmas ON lemmas.id = vocab_tombstones.lemma_id
+        """)
+    op.drop_table("vocab_tombstones")
+    op.rename_table("vocab_tombstones_old", "vocab_tombstones")
+    op.create_index(
+        "idx_tombstone_user_change",
+        "vocab_tombstones",
+        ["user_id", "change_seq", "written"],
+    )
+
+    op.drop_table("lemmas")
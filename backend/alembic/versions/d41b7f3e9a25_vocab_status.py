@@ -0,0 +1,45 @@
+"""Vocabulary status summary per user
+
+Revision ID: d41b7f3e9a25
+Revises: a9f3c6e2b714
+Create Date: 2026-10-19 19:41:05.226947
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41b7f3e9a25"
+down_revision: Union[str, None] = "a9f3c6e2b714"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("vocab_status"):
+        return
+
+    # Summaries are created from the words on first use
+    op.create_table(
+        "vocab_status",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("unknown_count", sa.Integer(), nullable=False),
+        sa.Column("learned_count", sa.Integer(), nullable=False),
+        sa.Column("ignore_count", sa.Integer(), nullable=False),
+        sa.Column("seen_count", sa.Integer(), nullable=False),
+        sa.Column("last_update", sa.DateTime(), nullable=True),
+        sa.Column("change_seq", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("vocab_status")
@@ -0,0 +1,42 @@
+"""Covering index for the vocabulary listing by update timestamp
+
+Revision ID: e2d94b6a0c81
+Revises: c5a7e1f9d3b2
+Create Date: 2026-10-19 16:02:48.216930
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2d94b6a0c81"
+down_revision: Union[str, None] = "c5a7e1f9d3b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    indexes = {
+        index["name"]: index["column_names"]
+        for index in inspector.get_indexes("vocab_words")
+    }
+    if indexes.get("idx_user_updated") == ["user_id", "updated_at", "status"]:
+        return
+
+    if "idx_user_updated" in indexes:
+        op.drop_index("idx_user_updated", table_name="vocab_words")
+    op.create_index(
+        "idx_user_updated", "vocab_words", ["user_id", "updated_at", "status"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_user_updated", table_name="vocab_words")
+    op.create_index("idx_user_updated", "vocab_words", ["user_id", "updated_at"])
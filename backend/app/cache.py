@@ -0,0 +1,99 @@
+"""
+Module for in-process caches.
+
+Caches are bounded in size and in time, each worker holding its own copy.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from app.config import settings
+from app.metrics import metrics
+from app.schemas import CurrentUserSchema, VocImportSchema
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Least recently used cache whose entries expire after a time to live.
+    """
+
+    def __init__(self, name: str, ttl: float, max_size: int) -> None:
+        """
+        Initialize the TTLCache.
+
+        Args:
+            name (str): Name prefixing the cache metrics.
+            ttl (float): Seconds an entry stays valid.
+            max_size (int): Maximum number of entries.
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        Retrieve a valid entry.
+
+        Args:
+            key (K): Entry key.
+
+        Returns:
+            Optional[V]: Entry value, None if missing or expired.
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            metrics.increment(f"{self.name}.misses")
+            return None
+        self.entries.move_to_end(key)
+        metrics.increment(f"{self.name}.hits")
+        return entry[1]
+
+    def set(self, key: K, value: V) -> None:
+        """
+        Add or replace an entry, evicting the least recently used if full.
+
+        Args:
+            key (K): Entry key.
+            value (V): Entry value.
+        """
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """
+        Remove an entry.
+
+        Args:
+            key (K): Entry key.
+        """
+        self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        self.entries.clear()
+
+
+# Authenticated users keyed by "<provider>:<provider id>", left to expire as
+# users are never changed once created, and unknown users are not cached
+user_cache: TTLCache[str, CurrentUserSchema] = TTLCache(
+    "user_cache", settings.USER_CACHE_TTL, settings.USER_CACHE_SIZE
+)
+
+# Vocabulary word statuses of each user, keyed by user id
+vocab_cache: TTLCache[int, Dict[str, str]] = TTLCache(
+    "vocab_cache", settings.VOC_CACHE_TTL, settings.VOC_CACHE_SIZE
+)
+
+# Progress of the last vocabulary import of each user, keyed by user id
+import_progress: TTLCache[int, VocImportSchema] = TTLCache(
+    "import_progress", settings.VOC_IMPORT_PROGRESS_TTL, settings.USER_CACHE_SIZE
+)
@@ -2,6 +2,8 @@
 Module for application configuration settings.
 """
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -19,11 +21,62 @@ class Settings(BaseSettings):
     DATABASE_MAIN_URL: str
     DATABASE_DICT_URL: str
 
+    # Main database connection pool, recycled and pinged for server backends
+    DATABASE_MAIN_POOL_SIZE: int = 10
+    DATABASE_MAIN_MAX_OVERFLOW: int = 10
+    DATABASE_MAIN_POOL_TIMEOUT: float = 30
+    DATABASE_MAIN_POOL_RECYCLE: int = 1800
+    DATABASE_MAIN_POOL_PRE_PING: bool = True
+    DATABASE_MAIN_STATEMENT_CACHE_SIZE: int = 100
+
+    # Main database connections, for SQLite
+    DATABASE_MAIN_SQLITE_JOURNAL_MODE: Literal["WAL", "DELETE", "TRUNCATE"] = "WAL"
+    DATABASE_MAIN_SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL"] = "NORMAL"
+    DATABASE_MAIN_SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Vocabulary writes serialization, for SQLite
+    VOC_WRITER_MAX_GROUP: int = 64
+
+    # Dictionary lookups coalescing
+    DICT_LOADER_ENABLED: bool = True
+    DICT_LOADER_WINDOW_MS: float = 2
+    DICT_LOADER_MAX_BATCH: int = 5000
+
     # Auth
     GOOGLE_CLIENT_ID: str
     APPLE_CLIENT_ID: str
     AUTH_SECRET: str
 
+    # Identity providers key sets
+    GOOGLE_CERTS_URL: str = "https://www.googleapis.com/oauth2/v3/certs"
+    APPLE_CERTS_URL: str = "https://appleid.apple.com/auth/keys"
+    JWKS_DEFAULT_MAX_AGE: float = 3600
+    JWKS_REFRESH_MARGIN: float = 60
+    JWKS_MIN_REFRESH_INTERVAL: float = 10
+    JWKS_TIMEOUT: float = 5
+
+    # Authenticated users cache
+    USER_CACHE_TTL: float = 60
+    USER_CACHE_SIZE: int = 10000
+
+    # Vocabulary statuses cache
+    VOC_CACHE_TTL: float = 30
+    VOC_CACHE_SIZE: int = 1000
+
+    # Vocabulary imports
+    VOC_IMPORT_CHUNK_SIZE: int = 1000
+    VOC_IMPORT_MAX_ERRORS: int = 100
+    VOC_IMPORT_PROGRESS_TTL: float = 600
+
+    # Vocabulary updates coalescing
+    VOC_WRITE_BEHIND_ENABLED: bool = False
+    VOC_WRITE_BEHIND_WINDOW_MS: float = 1000
+    VOC_WRITE_BEHIND_MAX_PENDING: int = 500
+
+    # Vocabulary change notifications
+    VOC_EVENTS_POLL_INTERVAL: float = 1
+    VOC_EVENTS_HEARTBEAT: float = 15
+
     # Mobile min version
     MIN_VERSION_IOS: str
     MIN_VERSION_ANDROID: str
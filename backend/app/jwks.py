@@ -0,0 +1,185 @@
+"""
+Module for caching the JSON Web Key Sets of the identity providers.
+
+Key sets are kept for the max-age advertised by the provider, refreshed in the
+background shortly before they expire, and refetched when a token is signed
+with a key not seen yet, as providers rotate their keys.
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+import jwt
+
+from app.config import settings
+from app.logs import get_logger
+from app.metrics import metrics
+
+logger = get_logger(__name__)
+
+MAX_AGE_PATTERN = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)", re.IGNORECASE)
+
+# Client shared by all key sets, so connections to the providers are pooled
+http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Retrieve the shared HTTP client, creating it if needed.
+
+    Returns:
+        httpx.AsyncClient: Pooled HTTP client.
+    """
+    global http_client  # pylint: disable=global-statement
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(timeout=settings.JWKS_TIMEOUT)
+    return http_client
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared HTTP client and its pooled connections.
+    """
+    global http_client  # pylint: disable=global-statement
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
+
+def parse_max_age(cache_control: Optional[str]) -> float:
+    """
+    Compute how long a response may be cached from its Cache-Control header.
+
+    Args:
+        cache_control (Optional[str]): Cache-Control header value.
+
+    Returns:
+        float: Freshness lifetime in seconds, JWKS_DEFAULT_MAX_AGE if unspecified.
+    """
+    if cache_control is None:
+        return settings.JWKS_DEFAULT_MAX_AGE
+    directives = cache_control.lower()
+    if "no-store" in directives or "no-cache" in directives:
+        return 0
+    match = MAX_AGE_PATTERN.search(cache_control)
+    if match is None:
+        return settings.JWKS_DEFAULT_MAX_AGE
+    return float(match.group(1))
+
+
+class JWKSCache:
+    """
+    Cached signing keys of an identity provider.
+    """
+
+    def __init__(self, name: str, url: str) -> None:
+        """
+        Initialize the JWKSCache.
+
+        Args:
+            name (str): Provider name prefixing the cache metrics.
+            url (str): URL of the provider JWKS.
+        """
+        self.name = name
+        self.url = url
+        self.keys: Dict[str, Any] = {}
+        self.expires_at = 0.0
+        self.fetched_at = float("-inf")
+        self.refresh_task: Optional["asyncio.Task[None]"] = None
+
+    async def get_key(self, kid: str) -> Optional[Any]:
+        """
+        Retrieve a signing key, fetching the key set if it is stale.
+
+        An unknown kid triggers one refetch, at most every
+        JWKS_MIN_REFRESH_INTERVAL seconds so that forged kids cannot flood the
+        provider.
+
+        Args:
+            kid (str): Key ID.
+
+        Returns:
+            Optional[Any]: The signing key, None if the provider has none.
+        """
+        now = time.monotonic()
+        if now >= self.expires_at:
+            await self.refresh()
+        elif (
+            now >= self.expires_at - settings.JWKS_REFRESH_MARGIN
+            and now - self.fetched_at >= settings.JWKS_MIN_REFRESH_INTERVAL
+        ):
+            # Keys kept after a failed fetch expire within the margin
+            self.refresh_in_background()
+
+        key = self.keys.get(kid)
+        if key is None and (
+            time.monotonic() - self.fetched_at >= settings.JWKS_MIN_REFRESH_INTERVAL
+        ):
+            metrics.increment(f"jwks.{self.name}.unknown_kid")
+            await self.refresh()
+            key = self.keys.get(kid)
+        return key
+
+    async def refresh(self) -> None:
+        """
+        Fetch the key set, or join the fetch already in flight.
+        """
+        self.refresh_in_background()
+        assert self.refresh_task is not None
+        await asyncio.shield(self.refresh_task)
+
+    def refresh_in_background(self) -> None:
+        """
+        Start fetching the key set unless a fetch is already in flight.
+        """
+        if self.refresh_task is None or self.refresh_task.done():
+            self.refresh_task = asyncio.ensure_future(self.fetch())
+
+    async def fetch(self) -> None:
+        """
+        Fetch the key set from the provider.
+
+        On failure the previous keys are kept, so a slow or failing provider
+        does not prevent logins with known keys.
+        """
+        self.fetched_at = time.monotonic()
+        try:
+            response = await get_http_client().get(self.url)
+            response.raise_for_status()
+            certs = response.json()
+            if not isinstance(certs, dict):
+                raise ValueError("JWKS is not an object")
+        except (httpx.HTTPError, ValueError) as e:
+            metrics.increment(f"jwks.{self.name}.errors")
+            logger.warning("Failed to fetch {} JWKS: {}", self.name, e)
+
+            # Keep serving the previous keys for a while before retrying
+            if self.keys:
+                self.expires_at = max(
+                    self.expires_at,
+                    self.fetched_at + settings.JWKS_MIN_REFRESH_INTERVAL,
+                )
+            return
+
+        keys = {}
+        for jwk in certs.get("keys", []):
+            if not isinstance(jwk, dict) or "kid" not in jwk:
+                continue
+            try:
+                keys[jwk["kid"]] = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
+            except jwt.InvalidKeyError:
+                continue
+
+        self.keys = keys
+        self.expires_at = self.fetched_at + parse_max_age(
+            response.headers.get("cache-control")
+        )
+        metrics.increment(f"jwks.{self.name}.fetches")
+
+
+# Key sets of the supported identity providers
+google_jwks = JWKSCache("google", settings.GOOGLE_CERTS_URL)
+apple_jwks = JWKSCache("apple", settings.APPLE_CERTS_URL)
@@ -0,0 +1,93 @@
+"""
+Module for the in-memory lexicon of the dictionary written forms.
+
+Many vocabulary forms derived from an analysis (names, slang, segmentation
+errors) are not in the dictionary. The lexicon holds the exact set of written
+forms so those misses are dropped before reaching any cache or the database.
+"""
+
+import sys
+from typing import FrozenSet, Iterable, List
+
+from app.databases.dict_db import SessionLocal
+from app.metrics import metrics
+from app.repository import WordRepository
+
+
+class Lexicon:
+    """
+    Exact membership set of the dictionary written forms.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty Lexicon, letting every written form through until built.
+        """
+        self.writtens: FrozenSet[str] = frozenset()
+        self.loaded = False
+
+    def build(self, writtens: Iterable[str]) -> None:
+        """
+        Build the lexicon from written forms.
+
+        Args:
+            writtens (Iterable[str]): Written forms of the dictionary.
+        """
+        self.writtens = frozenset(writtens)
+        self.loaded = True
+        metrics.set("lexicon.size", len(self.writtens))
+        metrics.set("lexicon.memory_bytes", self.memory_size())
+
+    def memory_size(self) -> int:
+        """
+        Estimate the memory used by the lexicon.
+
+        Returns:
+            int: Size in bytes of the set and its strings.
+        """
+        return sys.getsizeof(self.writtens) + sum(
+            sys.getsizeof(written) for written in self.writtens
+        )
+
+    def __contains__(self, written: str) -> bool:
+        """
+        Check if a written form may be in the dictionary.
+
+        Args:
+            written (str): Written form.
+
+        Returns:
+            bool: False only if the written form is known to be missing.
+        """
+        return not self.loaded or written in self.writtens
+
+    def filter(self, writtens: Iterable[str]) -> List[str]:
+        """
+        Drop the written forms missing from the dictionary.
+
+        Args:
+            writtens (Iterable[str]): Written forms to look up.
+
+        Returns:
+            List[str]: Written forms present in the dictionary, in order.
+        """
+        candidates = list(writtens)
+        found = [written for written in candidates if written in self]
+        metrics.increment("lexicon.lookups", len(candidates))
+        metrics.increment("lexicon.misses", len(candidates) - len(found))
+        metrics.ratio("lexicon.miss_rate", "lexicon.misses", "lexicon.lookups")
+        return found
+
+
+# Shared lexicon of the dictionary, built on startup
+lexicon = Lexicon()
+
+
+async def init_lexicon() -> None:
+    """
+    Initialize the lexicon from the dictionary database.
+    """
+    async with SessionLocal() as session:
+        repository = WordRepository(session)
+        writtens = await repository.get_all_writtens(searchable=False)
+    lexicon.build(writtens)
@@ -0,0 +1,142 @@
+"""
+Module for coalescing concurrent dictionary lookups.
+
+Lookups of written forms arriving within a short window, from any request, are
+merged into a single deduplicated query whose results are fanned back out to
+every waiting caller, in the spirit of a DataLoader.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Set
+
+from app.config import settings
+from app.databases.dict_db import SessionLocal
+from app.metrics import metrics
+from app.repository import WordOptions, WordRepository
+from app.schemas import WordSchema
+
+
+@dataclass
+class Batch:
+    """
+    Pending lookups sharing the same options.
+
+    Attributes:
+        writtens (Set[str]): Written forms requested so far.
+        enqueued_at (List[float]): Enqueue time of each request.
+        future (asyncio.Future): Words by written form once dispatched.
+    """
+
+    writtens: Set[str] = field(default_factory=set)
+    enqueued_at: List[float] = field(default_factory=list)
+    future: "asyncio.Future[Dict[str, List[WordSchema]]]" = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class WordLoader:
+    """
+    Loader coalescing concurrent word lookups into batched queries.
+    """
+
+    def __init__(self, enabled: bool, window: float, max_batch: int) -> None:
+        """
+        Initialize the WordLoader.
+
+        Args:
+            enabled (bool): If False, every lookup runs its own query.
+            window (float): Seconds to wait for lookups to join a batch, 0 waits
+                for a single event loop tick.
+            max_batch (int): Maximum number of written forms in a batch.
+        """
+        self.enabled = enabled
+        self.window = window
+        self.max_batch = max_batch
+        self.pending: Dict[WordOptions, Batch] = {}
+        self.tasks: Set["asyncio.Task[None]"] = set()
+
+    async def load(
+        self, writtens: List[str], options: WordOptions = WordOptions()
+    ) -> List[WordSchema]:
+        """
+        Retrieve the words of written forms, ordered as the written forms.
+
+        Args:
+            writtens (List[str]): Written forms to look up.
+            options (WordOptions): Parts of the words to include.
+
+        Returns:
+            List[WordSchema]: Matching words.
+        """
+        if len(writtens) == 0:
+            return []
+        if not self.enabled:
+            async with SessionLocal() as session:
+                repository = WordRepository(session)
+                return await repository.get_by_writtens(writtens, options)
+
+        # Join the open batch of these options, or open a new one
+        batch = self.pending.get(options)
+        if batch is None:
+            batch = Batch()
+            self.pending[options] = batch
+            task = asyncio.create_task(self.dispatch(options, batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+        batch.writtens.update(writtens)
+        batch.enqueued_at.append(time.perf_counter())
+        if len(batch.writtens) >= self.max_batch:
+            self.pending.pop(options, None)
+
+        # Shielded so a cancelled caller does not cancel the shared lookup
+        found = await asyncio.shield(batch.future)
+        return [
+            word
+            for written in dict.fromkeys(writtens)
+            for word in found.get(written, [])
+        ]
+
+    async def dispatch(self, options: WordOptions, batch: Batch) -> None:
+        """
+        Run the query of a batch once its window elapsed.
+
+        Args:
+            options (WordOptions): Options of the batch.
+            batch (Batch): Batch to dispatch.
+        """
+        await asyncio.sleep(self.window)
+        if self.pending.get(options) is batch:
+            del self.pending[options]
+
+        # Record the batch size and the latency added to each request
+        dispatched_at = time.perf_counter()
+        metrics.observe("loader.batch_writtens", len(batch.writtens))
+        metrics.observe("loader.batch_requests", len(batch.enqueued_at))
+        for enqueued_at in batch.enqueued_at:
+            metrics.observe("loader.wait_ms", (dispatched_at - enqueued_at) * 1000)
+
+        try:
+            async with SessionLocal() as session:
+                repository = WordRepository(session)
+                words = await repository.get_by_writtens(
+                    list(batch.writtens), options, order=False
+                )
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            batch.future.set_exception(exception)
+            return
+
+        # Group the words by written form for the fan out
+        found: Dict[str, List[WordSchema]] = {}
+        for word in words:
+            found.setdefault(word.written, []).append(word)
+        batch.future.set_result(found)
+
+
+# Shared loader of the worker
+word_loader = WordLoader(
+    enabled=settings.DICT_LOADER_ENABLED,
+    window=settings.DICT_LOADER_WINDOW_MS / 1000,
+    max_batch=settings.DICT_LOADER_MAX_BATCH,
+)
@@ -0,0 +1,75 @@
+"""
+Module for the loggers of the application.
+
+Log messages use the str.format style, {} placeholders being replaced by the
+arguments, as configured for pylint.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any, Tuple
+
+if TYPE_CHECKING:
+    LoggerAdapter = logging.LoggerAdapter[logging.Logger]
+else:
+    LoggerAdapter = logging.LoggerAdapter
+
+
+class BraceMessage:
+    """
+    Log message formatted with str.format once it is emitted.
+    """
+
+    def __init__(self, fmt: str, args: Tuple[Any, ...]) -> None:
+        """
+        Initialize the BraceMessage.
+
+        Args:
+            fmt (str): Format string with {} placeholders.
+            args (Tuple[Any, ...]): Arguments of the placeholders.
+        """
+        self.fmt = fmt
+        self.args = args
+
+    def __str__(self) -> str:
+        """
+        Format the message.
+
+        Returns:
+            str: Formatted message.
+        """
+        return self.fmt.format(*self.args) if self.args else self.fmt
+
+
+class BraceStyleAdapter(LoggerAdapter):
+    """
+    Logger taking str.format style messages.
+    """
+
+    def log(self, level: int, msg: object, *args: object, **kwargs: Any) -> None:
+        """
+        Log a message, formatted only if the level is enabled.
+
+        Args:
+            level (int): Logging level.
+            msg (object): Format string with {} placeholders.
+            *args (object): Arguments of the placeholders.
+            **kwargs (Any): Keyword arguments of logging.Logger.log.
+        """
+        if self.isEnabledFor(level):
+            msg, options = self.process(msg, kwargs)
+            # Report the caller of the adapter rather than the adapter
+            options["stacklevel"] = options.get("stacklevel", 1) + 1
+            self.logger.log(level, BraceMessage(str(msg), args), **options)
+
+
+def get_logger(name: str) -> BraceStyleAdapter:
+    """
+    Retrieve the logger of a module.
+
+    Args:
+        name (str): Module name.
+
+    Returns:
+        BraceStyleAdapter: Logger taking str.format style messages.
+    """
+    return BraceStyleAdapter(logging.getLogger(name), {})
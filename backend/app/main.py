@@ -2,13 +2,20 @@
 Main FastAPI application module.
 """
 
+from typing import Dict
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.databases import dict_db, main_db
+from app.jwks import close_http_client
+from app.lexicon import init_lexicon
+from app.metrics import metrics
 from app.routes import analysis, auth, user
 from app.schemas import MobileInfoSchema
+from app.search import init_index
+from app.writebehind import voc_write_behind
 
 # Create FastAPI app
 app = FastAPI(tittle=settings.APP_NAME)
@@ -49,11 +56,37 @@ def get_mobile_info() -> MobileInfoSchema:
     )
 
 
+# Metrics route
+@app.get("/metrics", response_model=Dict[str, float])
+def get_metrics() -> Dict[str, float]:
+    """
+    Retrieves the in-process metrics of the worker.
+
+    Returns:
+        Dict[str, float]: Metric values by name.
+    """
+    return metrics.snapshot()
+
+
 # Init databases on startup
 @app.on_event("startup")
 async def startup() -> None:
     """
-    Startup event handler, initialize the databases.
+    Startup event handler, initialize the databases and the in-memory indexes.
     """
     await dict_db.init_db()
     await main_db.init_db()
+    await init_lexicon()
+    await init_index()
+
+
+# Write pending words and release pooled connections on shutdown
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    """
+    Shutdown event handler, write the pending vocabulary words, close the
+    HTTP client used for the providers JWKS and the main database connections.
+    """
+    await voc_write_behind.flush_all()
+    await close_http_client()
+    await main_db.close_db()
@@ -0,0 +1,147 @@
+"""
+Module for maintenance tasks on the main database.
+
+Usage:
+    python -m app.maintenance check [--user ID ...]
+    python -m app.maintenance backfill [--user ID ...]
+    python -m app.maintenance load-list --list NAME --file PATH
+
+The check task compares each user's vocabulary status summary with the one
+computed from the vocabulary words, the backfill task rewrites the summaries
+which are missing or differ. The load-list task creates or replaces a word
+list, such as a frequency ranking, from a text file with a written form per
+line in rank order.
+"""
+
+import argparse
+import asyncio
+from typing import List, Optional, Sequence
+
+from app.databases.main_db import SessionLocal, init_db
+from app.models import VocabStatus
+from app.repository import UserRepository, WordListRepository
+from app.vocabulary import VocSummaryRepository
+
+# Attributes compared between the stored and the computed summaries
+SUMMARY_FIELDS = [
+    column.key
+    for column in VocabStatus.__table__.columns
+    if column.key not in ("user_id", "change_seq")
+]
+
+
+def summary_differences(
+    stored: Optional[VocabStatus], computed: VocabStatus
+) -> List[str]:
+    """
+    List the differences between a stored summary and the computed one.
+
+    Args:
+        stored (Optional[VocabStatus]): Summary stored in the database, if any.
+        computed (VocabStatus): Summary computed from the vocabulary words.
+
+    Returns:
+        List[str]: Description of each differing attribute.
+    """
+    if stored is None:
+        return ["missing"]
+    differences = [
+        f"{field}: {getattr(stored, field)} != {getattr(computed, field)}"
+        for field in SUMMARY_FIELDS
+        if getattr(stored, field) != getattr(computed, field)
+    ]
+    # The stored sequence number may be ahead, after writes changing nothing
+    if stored.change_seq < computed.change_seq:
+        differences.append(f"change_seq: {stored.change_seq} < {computed.change_seq}")
+    return differences
+
+
+async def check_summaries(user_ids: Sequence[int], fix: bool) -> int:
+    """
+    Check the vocabulary status summaries of users, rewriting the wrong ones.
+
+    Args:
+        user_ids (Sequence[int]): Users to check, all if empty.
+        fix (bool): Whether to rewrite the missing or wrong summaries.
+
+    Returns:
+        int: Number of missing or wrong summaries found.
+    """
+    async with SessionLocal() as session:
+        if not user_ids:
+            user_ids = await UserRepository(session).get_all_ids()
+
+        wrong = 0
+        for user_id in user_ids:
+            stored = await session.get(VocabStatus, user_id)
+            computed = await VocSummaryRepository(session, user_id).compute_summary()
+            differences = summary_differences(stored, computed)
+            if not differences:
+                continue
+
+            wrong += 1
+            print(f"user {user_id}: {', '.join(differences)}")
+            if fix:
+                if stored is not None:
+                    # A new sequence number, so that cached statuses are fetched
+                    computed.change_seq = (
+                        max(computed.change_seq, stored.change_seq) + 1
+                    )
+                await session.merge(computed)
+                await session.commit()
+
+        print(f"{wrong} of {len(user_ids)} summaries missing or wrong")
+        return wrong
+
+
+async def load_list(name: str, path: str) -> int:
+    """
+    Create or replace a word list from a text file.
+
+    Args:
+        name (str): Word list name.
+        path (str): Path of the file, with a written form per line in rank
+            order, only the first tab-separated field of each line being read.
+
+    Returns:
+        int: Number of written forms of the list.
+    """
+    with open(path, encoding="utf-8") as file:
+        writtens = [
+            line.split("\t", 1)[0].strip()
+            for line in file
+            if line.strip() and not line.startswith("#")
+        ]
+
+    async with SessionLocal() as session:
+        word_list = await WordListRepository(session).replace(name, writtens)
+        print(f"word list {word_list.name} ({word_list.id}): {word_list.size} words")
+        return word_list.size
+
+
+def main() -> None:
+    """
+    Run the maintenance task given on the command line.
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.maintenance")
+    parser.add_argument("task", choices=["check", "backfill", "load-list"])
+    parser.add_argument("--user", type=int, action="append", default=[])
+    parser.add_argument("--list", help="word list name, for load-list")
+    parser.add_argument("--file", help="word list file, for load-list")
+    args = parser.parse_args()
+    if args.task == "load-list" and (not args.list or not args.file):
+        parser.error("load-list requires --list and --file")
+
+    async def run() -> int:
+        await init_db()
+        if args.task == "load-list":
+            return await load_list(args.list, args.file)
+        return await check_summaries(args.user, fix=args.task == "backfill")
+
+    wrong = asyncio.run(run())
+    if args.task == "check" and wrong:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Module for in-process application metrics.
+
+Metrics are plain counters, gauges and summaries kept in memory by each worker
+and exposed as a flat mapping on the /metrics route.
+"""
+
+from typing import Dict
+
+
+class Metrics:
+    """
+    Registry of named metrics.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty Metrics registry.
+        """
+        self.values: Dict[str, float] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name (str): Counter name.
+            value (float): Increment.
+        """
+        self.values[name] = self.values.get(name, 0) + value
+
+    def set(self, name: str, value: float) -> None:
+        """
+        Set a gauge.
+
+        Args:
+            name (str): Gauge name.
+            value (float): Current value.
+        """
+        self.values[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """
+        Record an observation in a summary of its count, sum and maximum.
+
+        Args:
+            name (str): Summary name.
+            value (float): Observed value.
+        """
+        self.increment(f"{name}.count")
+        self.increment(f"{name}.sum", value)
+        self.values[f"{name}.max"] = max(self.values.get(f"{name}.max", value), value)
+
+    def ratio(self, name: str, numerator: str, denominator: str) -> None:
+        """
+        Set a gauge to the ratio of two counters.
+
+        Args:
+            name (str): Gauge name.
+            numerator (str): Numerator counter name.
+            denominator (str): Denominator counter name.
+        """
+        total = self.values.get(denominator, 0)
+        self.values[name] = self.values.get(numerator, 0) / total if total else 0
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Retrieve the current value of every metric.
+
+        Returns:
+            Dict[str, float]: Metric values by name.
+        """
+        return dict(sorted(self.values.items()))
+
+
+# Shared registry of the worker
+metrics = Metrics()
@@ -3,8 +3,17 @@ Aggregates all ORM database models
 """
 
 from .dictionary import Example, Sense, SenseTranslation, Word
-from .user import User, VocabWord
+from .user import (
+    Lemma,
+    User,
+    VocabStatus,
+    VocabTombstone,
+    VocabWord,
+    WordList,
+    WordListEntry,
+)
 
 __all__ = []
 __all__ += ["Word", "Sense", "SenseTranslation", "Example"]
-__all__ += ["User", "VocabWord"]
+__all__ += ["User", "Lemma", "VocabWord", "VocabStatus", "VocabTombstone"]
+__all__ += ["WordList", "WordListEntry"]
@@ -2,13 +2,164 @@
 Module defining ORM models for user-related database entities.
 """
 
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Type
 
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    DateTime,
+    Dialect,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    TypeDecorator,
+    select,
+)
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from app.databases.main_db import Base
+from app.schemas import VOCAB_STATUSES
+
+# Stored code of each vocabulary status, new statuses must be appended
+VOCAB_STATUS_CODES = {status: code for code, status in enumerate(VOCAB_STATUSES)}
+
+
+class VocabStatusType(TypeDecorator[str]):  # pylint: disable=too-many-ancestors
+    """
+    Vocabulary status stored as a small integer code.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect: Dialect) -> Any:
+        """
+        Convert a status into its code.
+
+        Args:
+            value (Optional[str]): Status.
+            dialect (Dialect): Database dialect.
+
+        Returns:
+            Any: Status code.
+        """
+        return VOCAB_STATUS_CODES[value] if value is not None else None
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> Optional[str]:
+        """
+        Convert a code into its status.
+
+        Args:
+            value (Any): Status code.
+            dialect (Dialect): Database dialect.
+
+        Returns:
+            Optional[str]: Status.
+        """
+        return VOCAB_STATUSES[value] if value is not None else None
+
+    def process_literal_param(self, value: Optional[str], dialect: Dialect) -> Any:
+        """
+        Convert a status into its code, rendered as a small integer literal.
+
+        Args:
+            value (Optional[str]): Status.
+            dialect (Dialect): Database dialect.
+
+        Returns:
+            Any: Status code.
+        """
+        return self.process_bind_param(value, dialect)
+
+    @property
+    def python_type(self) -> Type[str]:
+        """
+        Python type of the statuses.
+
+        Returns:
+            Type[str]: String type.
+        """
+        return str
+
+
+def naive_utc(value: datetime) -> datetime:
+    """
+    Convert a timestamp into UTC without time zone, naive ones being UTC.
+
+    Args:
+        value (datetime): Timestamp.
+
+    Returns:
+        datetime: Naive UTC timestamp.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class UTCDateTime(TypeDecorator[datetime]):  # pylint: disable=too-many-ancestors
+    """
+    Timestamp stored in UTC without time zone, as not every backend accepts
+    timestamps with a time zone in such columns.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(
+        self, value: Optional[datetime], dialect: Dialect
+    ) -> Optional[datetime]:
+        """
+        Convert a timestamp into UTC without time zone.
+
+        Args:
+            value (Optional[datetime]): Timestamp.
+            dialect (Dialect): Database dialect.
+
+        Returns:
+            Optional[datetime]: Naive UTC timestamp.
+        """
+        return naive_utc(value) if value is not None else None
+
+    def process_literal_param(self, value: Optional[datetime], dialect: Dialect) -> Any:
+        """
+        Convert a timestamp into UTC without time zone, rendered as a timestamp
+        literal.
+
+        Args:
+            value (Optional[datetime]): Timestamp.
+            dialect (Dialect): Database dialect.
+
+        Returns:
+            Any: Naive UTC timestamp.
+        """
+        return self.process_bind_param(value, dialect)
+
+    def process_result_value(
+        self, value: Optional[datetime], dialect: Dialect
+    ) -> Optional[datetime]:
+        """
+        Read a stored timestamp, naive and in UTC.
+
+        Args:
+            value (Optional[datetime]): Stored timestamp.
+            dialect (Dialect): Database dialect.
+
+        Returns:
+            Optional[datetime]: Naive UTC timestamp.
+        """
+        return value
+
+    @property
+    def python_type(self) -> Type[datetime]:
+        """
+        Python type of the timestamps.
+
+        Returns:
+            Type[datetime]: Datetime type.
+        """
+        return datetime
 
 
 class User(Base):
@@ -24,6 +175,7 @@ class User(Base):
         name (str): Unique username.
         picture (Optional[str]): Link to avatar picture.
         vocab_words (List[VocabWord]): Vocabulary words.
+        vocab_status (Optional[VocabStatus]): Vocabulary status summary.
     """
 
     __tablename__ = "users"
@@ -44,38 +196,172 @@ class User(Base):
     vocab_words: Mapped[List["VocabWord"]] = relationship(
         "VocabWord", back_populates="user"
     )
+    vocab_status: Mapped[Optional["VocabStatus"]] = relationship(
+        "VocabStatus", back_populates="user"
+    )
 
 
-class VocabWord(Base):
+class Lemma(Base):
     """
-    Represents a word vocabulary word from a user.
+    Represents a written form, shared by the vocabularies of all users.
 
     Attributes:
         id (int): Unique identifier.
         written (str): Written form.
+    """
+
+    __tablename__ = "lemmas"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    written: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+
+
+class WordList(Base):
+    """
+    Represents a ranked list of written forms, such as a frequency ranking,
+    whose bands can be marked at once in a vocabulary.
+
+    Attributes:
+        id (int): Unique identifier.
+        name (str): Unique name.
+        size (int): Number of written forms.
+    """
+
+    __tablename__ = "word_lists"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    size: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class WordListEntry(Base):
+    """
+    Represents a written form of a word list.
+
+    Attributes:
+        list_id (int): Foreign key to the word list, primary key.
+        rank (int): Rank of the written form in the list, from 0, primary key.
+        lemma_id (int): Foreign key to the written form.
+    """
+
+    __tablename__ = "word_list_entries"
+
+    # The rows are stored in rank order, so a band is a primary key range
+    list_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("word_lists.id"), primary_key=True
+    )
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    lemma_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("lemmas.id"), nullable=False
+    )
+
+    __table_args__ = ({"sqlite_with_rowid": False},)
+
+
+class VocabWord(Base):
+    """
+    Represents a word vocabulary word from a user.
+
+    Attributes:
+        user_id (int): Foreign key to the user, primary key.
+        lemma_id (int): Foreign key to the written form, primary key.
         status (str): Satus of the words.
         updated_at (datetime): Timestamp of the last update.
-        user_id (int): Foreign key to the user.
+        change_seq (int): User change sequence number of the last update.
+        written (str): Written form, read only.
         user (User): Associated user.
     """
 
     __tablename__ = "vocab_words"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    written: Mapped[str] = mapped_column(String, nullable=False, index=True)
-    status: Mapped[str] = mapped_column(String(16), nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
-
-    # User relation
+    # The rows are stored in the primary key, one word per written form
     user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=False, index=True
+        Integer, ForeignKey("users.id"), primary_key=True
+    )
+    lemma_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("lemmas.id"), primary_key=True
     )
+    status: Mapped[str] = mapped_column(VocabStatusType, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)
+    change_seq: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
     user: Mapped["User"] = relationship("User", back_populates="vocab_words")
 
+    # Written form, looked up by primary key along with each loaded word
+    written: Mapped[str] = column_property(
+        select(Lemma.written).where(Lemma.id == lemma_id).scalar_subquery()
+    )
+
+    # Index
+    __table_args__ = (
+        # To get status counts and last update by status, and list by status
+        Index("idx_user_status", "user_id", "status", "updated_at"),
+        # To get changes since a timestamp, and list by update timestamp
+        Index("idx_user_updated", "user_id", "updated_at", "status"),
+        # To get changes since a sync cursor
+        Index("idx_user_change", "user_id", "change_seq", "lemma_id"),
+        {"sqlite_with_rowid": False},
+    )
+
+
+class VocabStatus(Base):
+    """
+    Represents the vocabulary status summary of a user, updated along with
+    each write to the vocabulary words.
+
+    Attributes:
+        user_id (int): Foreign key to the user, primary key.
+        unknown_count (int): Number of words with the unknown status.
+        learned_count (int): Number of words with the learned status.
+        ignore_count (int): Number of words with the ignore status.
+        seen_count (int): Number of words with the seen status.
+        last_update (Optional[datetime]): Timestamp of the most recent update.
+        change_seq (int): Last change sequence number given to the user writes.
+        user (User): Associated user.
+    """
+
+    __tablename__ = "vocab_status"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), primary_key=True
+    )
+    unknown_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    learned_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ignore_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    seen_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_update: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, nullable=True)
+    change_seq: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    user: Mapped["User"] = relationship("User", back_populates="vocab_status")
+
+
+class VocabTombstone(Base):
+    """
+    Represents a word removed from the vocabulary of a user, kept so that the
+    removal is synced to the other devices.
+
+    Attributes:
+        user_id (int): Foreign key to the user.
+        lemma_id (int): Foreign key to the written form of the removed word.
+        change_seq (int): User change sequence number of the removal.
+    """
+
+    __tablename__ = "vocab_tombstones"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), primary_key=True
+    )
+    lemma_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("lemmas.id"), primary_key=True
+    )
+    change_seq: Mapped[int] = mapped_column(Integer, nullable=False)
+
     # Index
     __table_args__ = (
-        # To get last update
-        Index("idx_user_updated", "user_id", "updated_at"),
-        # To get status count
-        Index("idx_user_status", "user_id", "status"),
+        # To get changes since a sync cursor
+        Index("idx_tombstone_user_change", "user_id", "change_seq", "lemma_id"),
+        {"sqlite_with_rowid": False},
     )
@@ -0,0 +1,137 @@
+"""
+Module for notifying the vocabulary changes to connected devices.
+
+Writes of the worker are published to the subscribers of the user at once.
+Writes of the other workers, which share the main database but no memory, are
+detected by polling the change sequence numbers of the subscribed users, with a
+single query per worker whatever the number of connected devices.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.databases.main_db import SessionLocal
+from app.logs import get_logger
+from app.metrics import metrics
+from app.models import VocabStatus
+
+logger = get_logger(__name__)
+
+# Maximum number of users whose sequence numbers are polled by query
+POLL_CHUNK_SIZE = 500
+
+
+class ChangeNotifier:
+    """
+    In-process publish and subscribe of the vocabulary changes of each user.
+    """
+
+    def __init__(self, poll_interval: float) -> None:
+        """
+        Initialize the ChangeNotifier.
+
+        Args:
+            poll_interval (float): Seconds between two polls of the changes of
+                the other workers.
+        """
+        self.poll_interval = poll_interval
+        self.subscribers: Dict[int, Set[asyncio.Event]] = {}
+        self.change_seqs: Dict[int, int] = {}
+        self.poll_task: Optional["asyncio.Task[None]"] = None
+
+    def publish(self, user_id: int, change_seq: int) -> None:
+        """
+        Notify the subscribers of a user that their vocabulary changed.
+
+        Args:
+            user_id (int): User identifier.
+            change_seq (int): Change sequence number of the write.
+        """
+        events = self.subscribers.get(user_id)
+        if not events:
+            return
+        self.change_seqs[user_id] = max(self.change_seqs.get(user_id, 0), change_seq)
+        for event in events:
+            event.set()
+        metrics.increment("notifier.published")
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Event]:
+        """
+        Subscribe to the vocabulary changes of a user.
+
+        Args:
+            user_id (int): User identifier.
+
+        Yields:
+            asyncio.Event: Event set on each change, initially set so that the
+            subscriber reads the changes it missed.
+        """
+        event = asyncio.Event()
+        event.set()
+        self.subscribers.setdefault(user_id, set()).add(event)
+        metrics.increment("notifier.subscribers")
+        if self.poll_task is None or self.poll_task.done():
+            self.poll_task = asyncio.create_task(self.poll())
+        try:
+            yield event
+        finally:
+            metrics.increment("notifier.subscribers", -1)
+            events = self.subscribers[user_id]
+            events.discard(event)
+            if not events:
+                del self.subscribers[user_id]
+                self.change_seqs.pop(user_id, None)
+
+    async def poll(self) -> None:
+        """
+        Poll the change sequence numbers of the subscribed users while there
+        are subscribers, publishing the changes made by other workers.
+        """
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self.subscribers:
+                break
+            user_ids = list(self.subscribers)
+            try:
+                change_seqs = await self.get_change_seqs(user_ids)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception(
+                    "Failed to poll the vocabulary changes of {} users", len(user_ids)
+                )
+                continue
+            metrics.increment("notifier.polls")
+
+            for user_id, change_seq in change_seqs.items():
+                # Unknown sequence numbers are published too, in case a change
+                # happened while the subscriber was reading
+                if change_seq > self.change_seqs.get(user_id, -1):
+                    self.publish(user_id, change_seq)
+
+    async def get_change_seqs(self, user_ids: List[int]) -> Dict[int, int]:
+        """
+        Retrieve the change sequence numbers of users.
+
+        Args:
+            user_ids (List[int]): User identifiers.
+
+        Returns:
+            Dict[int, int]: Change sequence number of each user with a summary.
+        """
+        change_seqs: Dict[int, int] = {}
+        async with SessionLocal() as session:
+            for start in range(0, len(user_ids), POLL_CHUNK_SIZE):
+                stmt = select(VocabStatus.user_id, VocabStatus.change_seq).where(
+                    VocabStatus.user_id.in_(user_ids[start : start + POLL_CHUNK_SIZE])
+                )
+                result = await session.execute(stmt)
+                change_seqs.update(result.tuples().all())
+        return change_seqs
+
+
+# Shared notifier of the worker
+voc_changes = ChangeNotifier(poll_interval=settings.VOC_EVENTS_POLL_INTERVAL)
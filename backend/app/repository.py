@@ -4,23 +4,134 @@ Module providing async repositories for database models.
 Each repository provides methods to perform operations on specific records.
 """
 
-from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from random import randint
-from typing import List, Optional, Sequence
-
-from sqlalchemy import case, delete
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from sqlalchemy import ColumnElement, and_, delete, null
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload, with_loader_criteria
-from sqlalchemy.sql import functions
 
-from app.models import Example, Sense, SenseTranslation, User, VocabWord, Word
-from app.schemas import VocabWordSchema, VocStatusSchema
+from app.models import (
+    Example,
+    Lemma,
+    Sense,
+    SenseTranslation,
+    User,
+    Word,
+    WordList,
+    WordListEntry,
+)
+from app.schemas import SenseSchema, TranslationSchema, WordSchema, WordWithSensesSchema
+
+# Maximum number of writtens bound in a single lookup query
+WRITTENS_CHUNK_SIZE = 500
+
+
+def dialect_insert(
+    session: AsyncSession, model: Any
+) -> Union[postgresql.Insert, sqlite.Insert]:
+    """
+    Create an insert statement supporting ON CONFLICT clauses for the session
+    database.
+
+    Args:
+        session (AsyncSession): Session the statement will be executed with.
+        model (Any): ORM model to insert into.
+
+    Returns:
+        Union[postgresql.Insert, sqlite.Insert]: Dialect specific insert
+        statement.
+    """
+    assert session.bind is not None
+    if session.bind.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+class WordOptions(NamedTuple):
+    """
+    Parts of the words to include in a lookup.
+
+    Attributes:
+        senses (bool): If True, include associated senses.
+        language (str): Language code to for translation.
+        translations (Tuple[str, ...]): Language codes of the per-language
+            translations map of the senses, no map if empty.
+        definitions (bool): If True, include the definitions of the senses.
+    """
+
+    senses: bool = False
+    language: str = "en_US"
+    translations: Tuple[str, ...] = ()
+    definitions: bool = True
+
+
+def build_senses(
+    rows: Iterable[Tuple[int, str, str, Optional[str]]],
+    language: Optional[str],
+    translations: Sequence[str],
+    definitions: bool = True,
+) -> List[SenseSchema]:
+    """
+    Build senses from their translation rows, grouped by sense.
+
+    Args:
+        rows (Iterable[Tuple[int, str, str, Optional[str]]]): (sense id, language,
+            translation, definition) rows ordered by sense.
+        language (Optional[str]): Language code of the main translation, the
+            first one found if None.
+        translations (Sequence[str]): Language codes of the per-language
+            translations map, no map if empty.
+        definitions (bool): If True, include the definitions.
+
+    Returns:
+        List[SenseSchema]: Senses having a main translation.
+    """
+    senses = []
+    for sense_id, sense_rows in groupby(rows, key=itemgetter(0)):
+        # Keep the first translation of each language
+        found: Dict[str, Dict[str, Any]] = {}
+        for _, row_language, translation, definition in sense_rows:
+            if row_language not in found:
+                found[row_language] = {"translation": translation}
+                if definitions:
+                    found[row_language]["definition"] = definition
+
+        main = found.get(language) if language else next(iter(found.values()))
+        if main is None:
+            continue
+
+        sense = SenseSchema(id=sense_id, **main)
+        if translations:
+            sense.translations = {
+                code: TranslationSchema(**found[code])
+                for code in translations
+                if code in found
+            }
+        senses.append(sense)
+
+    return senses
 
 
 class WordRepository:
     """
     Repository for Word model.
+
+    Reads are done on Core row tuples and directly build the response schemas,
+    without hydrating ORM objects in the session.
     """
 
     def __init__(self, session: AsyncSession):
@@ -32,125 +143,201 @@ class WordRepository:
         """
         self.session = session
 
-    async def get_by_id(
-        self, word_id: int, senses: bool = False, language: str = "en_US"
-    ) -> Optional[Word]:
+    async def select_words(
+        self,
+        condition: ColumnElement[bool],
+        options: WordOptions = WordOptions(),
+        order_by: Sequence[ColumnElement[Any]] = (),
+    ) -> List[WordSchema]:
         """
-        Retrieve a Word by id.
+        Retrieve the words matching a condition in a single query.
 
         Args:
-            id (int): Word identifier.
-            senses (bool): If True, eagerly load associated senses.
-            language (str): Language code to for translation.
+            condition (ColumnElement[bool]): Filter on the words.
+            options (WordOptions): Parts of the words to include.
+            order_by (Sequence[ColumnElement[Any]]): Leading ordering of the words.
 
         Returns:
-            Optional[Word]: Matching Word object.
-        """
-        stmt = select(Word).where(Word.id == word_id)
-        if senses:
-            stmt = stmt.options(
-                selectinload(Word.senses).selectinload(Sense.translations),
-                with_loader_criteria(
-                    SenseTranslation,
-                    lambda translation: translation.language == language,
-                    include_aliases=True,
+            List[WordSchema]: Matching words, with senses when requested.
+        """
+        if options.senses:
+            return await self.select_words_with_senses(condition, options, order_by)
+        return await self.select_bare_words(condition, order_by)
+
+    async def select_bare_words(
+        self,
+        condition: ColumnElement[bool],
+        order_by: Sequence[ColumnElement[Any]] = (),
+    ) -> List[WordSchema]:
+        """
+        Retrieve the words matching a condition, without their senses.
+
+        Args:
+            condition (ColumnElement[bool]): Filter on the words.
+            order_by (Sequence[ColumnElement[Any]]): Leading ordering of the words.
+
+        Returns:
+            List[WordSchema]: Matching words.
+        """
+        stmt = (
+            select(Word.id, Word.written, Word.category)
+            .where(condition)
+            .order_by(*order_by, Word.id)
+        )
+        result = await self.session.execute(stmt)
+        return [
+            WordSchema(id=word_id, written=written, category=category)
+            for word_id, written, category in result.tuples()
+        ]
+
+    async def select_words_with_senses(
+        self,
+        condition: ColumnElement[bool],
+        options: WordOptions,
+        order_by: Sequence[ColumnElement[Any]] = (),
+    ) -> List[WordSchema]:
+        """
+        Retrieve the words matching a condition, joined with their senses and
+        the translations of the requested languages.
+
+        Args:
+            condition (ColumnElement[bool]): Filter on the words.
+            options (WordOptions): Languages and parts of the senses to include.
+            order_by (Sequence[ColumnElement[Any]]): Leading ordering of the words.
+
+        Returns:
+            List[WordSchema]: Matching words, with their senses.
+        """
+        stmt = (
+            select(
+                Word.id,
+                Word.written,
+                Word.category,
+                Sense.id,
+                SenseTranslation.language,
+                SenseTranslation.written,
+                SenseTranslation.definition if options.definitions else null(),
+            )
+            .outerjoin(Sense, Sense.word_id == Word.id)
+            .outerjoin(
+                SenseTranslation,
+                and_(
+                    SenseTranslation.sense_id == Sense.id,
+                    SenseTranslation.language.in_(
+                        {options.language, *options.translations}
+                    ),
                 ),
             )
-
+            .where(condition)
+            .order_by(*order_by, Word.id, Sense.id, SenseTranslation.id)
+        )
         result = await self.session.execute(stmt)
-        word = result.scalars().first()
 
-        return word
+        # Rows are grouped by word then by sense
+        words: List[WordSchema] = []
+        for (word_id, written, category), rows in groupby(
+            result.tuples(), key=itemgetter(0, 1, 2)
+        ):
+            sense_rows = (
+                (sense_id, language, translation, definition)
+                for _, _, _, sense_id, language, translation, definition in rows
+                if translation is not None
+            )
+            words.append(
+                WordWithSensesSchema(
+                    id=word_id,
+                    written=written,
+                    category=category,
+                    senses=build_senses(
+                        sense_rows,
+                        options.language,
+                        options.translations,
+                        options.definitions,
+                    ),
+                )
+            )
+
+        return words
+
+    async def get_by_id(
+        self, word_id: int, options: WordOptions = WordOptions()
+    ) -> Optional[WordSchema]:
+        """
+        Retrieve a Word by id.
+
+        Args:
+            id (int): Word identifier.
+            options (WordOptions): Parts of the word to include.
+
+        Returns:
+            Optional[WordSchema]: Matching word.
+        """
+        words = await self.select_words(Word.id == word_id, options)
+        return words[0] if words else None
 
     async def get_by_written(
-        self, written: str, senses: bool = False, language: str = "en_US"
-    ) -> Sequence[Word]:
+        self, written: str, options: WordOptions = WordOptions()
+    ) -> List[WordSchema]:
         """
         Retrieve Word(s) by its written form. Optionally loading associated its senses.
 
         Args:
             written (str): Written form.
-            senses (bool): If True, eagerly load associated senses.
-            language (str): Language code to for translation.
+            options (WordOptions): Parts of the words to include.
 
         Returns:
-            Sequence[Word]: Matching Word objects.
+            List[WordSchema]: Matching words.
         """
-        stmt = select(Word).where(Word.written == written)
-
-        if senses:
-            stmt = stmt.options(
-                selectinload(Word.senses).selectinload(Sense.translations),
-                with_loader_criteria(
-                    SenseTranslation,
-                    lambda translation: translation.language == language,
-                    include_aliases=True,
-                ),
-            )
-
-        result = await self.session.execute(stmt)
-        words = result.scalars().all()
-        return words
+        return await self.select_words(Word.written == written, options)
 
     async def get_by_writtens(
         self,
         writtens: List[str],
-        senses: bool = False,
-        language: str = "en_US",
+        options: WordOptions = WordOptions(),
         order: bool = True,
-    ) -> Sequence[Word]:
+    ) -> List[WordSchema]:
         """
         Retrieve Words whose 'written' field is in the provided list.
 
         Args:
             writtens (List[str]): All written values.
-            senses (bool): If True, eagerly load associated senses.
-            language (str): Language code to for translation.
+            options (WordOptions): Parts of the words to include.
             order (bool): If True, order results to match the writtens list.
 
         Returns:
-            Sequence[Word]: Matching Word objects.
+            List[WordSchema]: Matching words.
         """
         if len(writtens) == 0:
             return []
 
-        stmt = select(Word).where(Word.written.in_(writtens))
+        # Query unique writtens by bounded chunks to keep the statement size and
+        # the number of bound parameters constant
+        unique_writtens = list(dict.fromkeys(writtens))
+        words: List[WordSchema] = []
+        for start in range(0, len(unique_writtens), WRITTENS_CHUNK_SIZE):
+            chunk = unique_writtens[start : start + WRITTENS_CHUNK_SIZE]
+            words += await self.select_words(Word.written.in_(chunk), options)
+
+        # Reconstruct the writtens ordering, the sort being stable words sharing
+        # the same written stay ordered by id
         if order:
-            order_expr = case(
-                *[(Word.written == w, i) for i, w in enumerate(writtens)],
-                else_=len(writtens),
-            )
-            stmt = stmt.order_by(order_expr)
-        if senses:
-            stmt = stmt.options(
-                selectinload(Word.senses).selectinload(Sense.translations),
-                with_loader_criteria(
-                    SenseTranslation,
-                    lambda translation: translation.language == language,
-                    include_aliases=True,
-                ),
-            )
-        result = await self.session.execute(stmt)
-        words = result.scalars().all()
+            positions = {written: i for i, written in enumerate(unique_writtens)}
+            words.sort(key=lambda word: positions[word.written])
 
         return words
 
     async def search_by_fragment(
-        self,
-        fragment: str,
-        senses: bool = False,
-        language: str = "en_US",
-    ) -> Sequence[Word]:
+        self, fragment: str, options: WordOptions = WordOptions()
+    ) -> List[WordSchema]:
         """
         Searches for words whose written form starts with the given fragment.
 
         Args:
             fragment (str): Fragment of the written.
-            senses (bool): If True, eagerly load associated senses.
-            language (str): Language code to for translation.
+            options (WordOptions): Parts of the words to include.
 
         Returns:
-            Sequence[Word]: List of words matching the criterion.
+            List[WordSchema]: List of words matching the criterion.
         """
         subq = (
             select(Word.written)
@@ -161,21 +348,23 @@ class WordRepository:
             .scalar_subquery()
         )
 
-        stmt = select(Word).where(Word.written.in_(subq))
+        return await self.select_words(Word.written.in_(subq), options)
 
-        if senses:
-            stmt = stmt.options(
-                selectinload(Word.senses).selectinload(Sense.translations),
-                with_loader_criteria(
-                    SenseTranslation,
-                    lambda translation: translation.language == language,
-                    include_aliases=True,
-                ),
-            )
+    async def get_all_writtens(self, searchable: bool = True) -> Sequence[str]:
+        """
+        Retrieve all distinct written forms of the words.
 
+        Args:
+            searchable (bool): If True, skip the words without category.
+
+        Returns:
+            Sequence[str]: Written forms of the words.
+        """
+        stmt = select(Word.written).distinct()
+        if searchable:
+            stmt = stmt.where(Word.category != "none")
         result = await self.session.execute(stmt)
-        words = result.scalars().all()
-        return words
+        return result.scalars().all()
 
 
 class SenseRepository:
@@ -193,34 +382,46 @@ class SenseRepository:
         self.session = session
 
     async def get_by_word_id(
-        self, word_id: int, language: Optional[str] = "en_US"
-    ) -> Sequence[Sense]:
+        self,
+        word_id: int,
+        language: Optional[str] = "en_US",
+        translations: Sequence[str] = (),
+        definitions: bool = True,
+    ) -> List[SenseSchema]:
         """
         Retrieve Sense(s) by a Word id.
 
         Args:
             word_id (int): Identifier of the Word.
-            language (Optional[str]): Language code to for translation.
+            language (Optional[str]): Language code to for translation, any
+                language if None.
+            translations (Sequence[str]): Language codes of the per-language
+                translations map, no map if empty.
+            definitions (bool): If True, include the definitions.
 
         Returns:
-            Sequence[Sense]: Associated Sense objects.
+            List[SenseSchema]: Associated senses having a translation.
         """
-        stmt = select(Sense).where(Sense.word_id == word_id)
-        if language is None:
-            stmt = stmt.options(selectinload(Sense.translations))
-        else:
-            stmt = stmt.options(
-                selectinload(Sense.translations),
-                with_loader_criteria(
-                    SenseTranslation,
-                    lambda translation: translation.language == language,
-                    include_aliases=True,
-                ),
+        condition = SenseTranslation.sense_id == Sense.id
+        if language is not None:
+            condition = and_(
+                condition, SenseTranslation.language.in_({language, *translations})
+            )
+
+        stmt = (
+            select(
+                Sense.id,
+                SenseTranslation.language,
+                SenseTranslation.written,
+                SenseTranslation.definition if definitions else null(),
             )
+            .join(SenseTranslation, condition)
+            .where(Sense.word_id == word_id)
+            .order_by(Sense.id, SenseTranslation.id)
+        )
         result = await self.session.execute(stmt)
-        senses = result.scalars().all()
 
-        return senses
+        return build_senses(result.tuples(), language, translations, definitions)
 
 
 class ExampleRepository:
@@ -268,6 +469,17 @@ class UserRepository:
         """
         self.session = session
 
+    async def get_all_ids(self) -> Sequence[int]:
+        """
+        Retrieve the identifiers of all users.
+
+        Returns:
+            Sequence[int]: User identifiers.
+        """
+        stmt = select(User.id).order_by(User.id)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
     async def get_by_google_id(self, google_id: str) -> Optional[User]:
         """
         Retrieve an Example by a Google id.
@@ -370,204 +582,134 @@ class UserRepository:
         return user
 
 
-class VocRepository:
+class LemmaRepository:
     """
-    Repository for VocabWord model.
+    Repository for Lemma model.
     """
 
-    def __init__(self, session: AsyncSession, user_id: int):
+    def __init__(self, session: AsyncSession):
         """
-        Initialize the vocabulary repository.
+        Initialize the lemma repository.
 
         Args:
             session (AsyncSession): Async session used for operations.
-            user_id (int): User identifier for operation.
         """
         self.session = session
-        self.user_id = user_id
 
-    async def get_by_written(self, written: str) -> Optional[VocabWord]:
+    async def get_ids(
+        self, writtens: Sequence[str], create: bool = False
+    ) -> Dict[str, int]:
         """
-        Retrieve a VocabWord record by its written form.
+        Retrieve the identifiers of written forms.
 
         Args:
-            written (str): Written form of the word.
+            writtens (Sequence[str]): Written forms.
+            create (bool): Whether to create the missing written forms, the
+                change being committed with the session.
 
         Returns:
-            Optional[VocabWord]: Matching VocabWord record if found,
-            otherwise, None.
-        """
-        stmt = select(VocabWord).where(
-            VocabWord.user_id == self.user_id, VocabWord.written == written
-        )
-        result = await self.session.execute(stmt)
-        return result.scalars().first()
-
-    async def get_by_writtens(
-        self,
-        writtens: List[str],
-    ) -> Sequence[VocabWord]:
-        """
-        Retrieve VocabWord records by many writtens form.
-
-        Args:
-            writtens (List[str]): Written forms of the words.
-
-        Returns:
-            Sequence[VocabWord]: Matching VocabWord records if found
-        """
-        if len(writtens) == 0:
-            return []
-
-        stmt = select(VocabWord).where(
-            VocabWord.user_id == self.user_id, VocabWord.written.in_(writtens)
-        )
-        result = await self.session.execute(stmt)
-        words = result.scalars().all()
-
-        return words
+            Dict[str, int]: Identifier of each known written form.
+        """
+        ids: Dict[str, int] = {}
+        unique_writtens = list(dict.fromkeys(writtens))
+        for start in range(0, len(unique_writtens), WRITTENS_CHUNK_SIZE):
+            chunk = unique_writtens[start : start + WRITTENS_CHUNK_SIZE]
+            stmt = select(Lemma.written, Lemma.id).where(Lemma.written.in_(chunk))
+            result = await self.session.execute(stmt)
+            ids.update(result.tuples().all())
+
+            missing = [written for written in chunk if written not in ids]
+            if not create or not missing:
+                continue
+
+            # Written forms may be created concurrently by other users
+            insert = dialect_insert(
+                self.session, Lemma.__table__
+            ).on_conflict_do_nothing(index_elements=[Lemma.written])
+            await self.session.execute(insert, [{"written": w} for w in missing])
+            created = select(Lemma.written, Lemma.id).where(Lemma.written.in_(missing))
+            result = await self.session.execute(created)
+            ids.update(result.tuples().all())
+        return ids
+
+
+class WordListRepository:
+    """
+    Repository for WordList model.
+    """
 
-    async def get_all(self, statuses: Sequence[str]) -> Sequence[VocabWord]:
+    def __init__(self, session: AsyncSession):
         """
-        Retrieve all VocabWord records whose status is in the provided list.
+        Initialize the word list repository.
 
         Args:
-            statuses (Sequence[str]): List of statuses to filter by.
-
-        Returns:
-            Sequence[VocabWord]: Matching VocabWord.
+            session (AsyncSession): Async session used for operations.
         """
-        if not statuses:
-            return []
-
-        stmt = select(VocabWord).where(
-            VocabWord.user_id == self.user_id, VocabWord.status.in_(statuses)
-        )
-        result = await self.session.execute(stmt)
-        return result.scalars().all()
+        self.session = session
+        self.lemmas = LemmaRepository(session)
 
-    async def get_since(self, since: datetime) -> Sequence[VocabWord]:
+    async def get_all(self) -> Sequence[WordList]:
         """
-        Retrieve all VocabWord records updated on or after the specified datetime.
-
-        Args:
-            since (datetime): Datetime to start the search from.
+        Retrieve all the word lists.
 
         Returns:
-            Sequence[VocabWord]: VocabWord records updated since the given datetime.
+            Sequence[WordList]: Word lists, by name.
         """
-        stmt = select(VocabWord).where(
-            VocabWord.user_id == self.user_id, VocabWord.updated_at >= since
-        )
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(select(WordList).order_by(WordList.name))
         return result.scalars().all()
 
-    async def add_word(self, word: VocabWordSchema) -> VocabWord:
+    async def get_by_id(self, list_id: int) -> Optional[WordList]:
         """
-        Add a new VocabWord record to the user's vocabulary.
+        Retrieve a word list by its identifier.
 
         Args:
-            word (VocabWordSchema): Data schema containing the VocabWord details.
+            list_id (int): Word list identifier.
 
         Returns:
-            VocabWord: Newly created VocabWord record.
+            Optional[WordList]: The word list if found; otherwise, None.
         """
-        vocab_word = VocabWord(
-            written=word.written,
-            status=word.status,
-            updated_at=word.updated_at,
-            user_id=self.user_id,
-        )
-        self.session.add(vocab_word)
-        await self.session.commit()
-        return vocab_word
+        return await self.session.get(WordList, list_id)
 
-    async def add_words(self, words: List[VocabWordSchema]) -> List[VocabWord]:
+    async def replace(self, name: str, writtens: Sequence[str]) -> WordList:
         """
-        Add a new VocabWord record to the user's vocabulary.
+        Create or replace a word list.
 
         Args:
-            word (List[VocabWordSchema]): Data schema containing the VocabWord details.
+            name (str): Word list name.
+            writtens (Sequence[str]): Written forms in rank order, the repeated
+                ones keeping their first rank.
 
         Returns:
-            VocabWord: Newly created VocabWord records.
-        """
-        vocab_words = []
-        for word in words:
-            vocab_word = VocabWord(
-                written=word.written,
-                status=word.status,
-                updated_at=word.updated_at,
-                user_id=self.user_id,
-            )
-            self.session.add(vocab_word)
-            vocab_words.append(vocab_word)
-        await self.session.commit()
-        return vocab_words
-
-    async def remove_word(self, word: VocabWord) -> None:
+            WordList: Created or replaced word list.
         """
-        Remove an existing VocabWord record from the user's vocabulary.
+        unique_writtens = list(dict.fromkeys(writtens))
 
-        Args:
-            word (VocabWord): VocabWord record to remove.
-        """
-        await self.session.delete(word)
-        await self.session.commit()
-
-    async def get_last_update_at(self) -> Optional[datetime]:
-        """
-        Retrieve the timestamp of the most recent update among VocabWord records.
-
-        Returns:
-            Optional[datetime]: Last update timestamp if available; otherwise, None.
-        """
-        stmt = (
-            select(VocabWord)
-            .where(VocabWord.user_id == self.user_id)
-            .order_by(VocabWord.updated_at.desc())
-            .limit(1)
+        result = await self.session.execute(
+            select(WordList).where(WordList.name == name)
         )
-        result = await self.session.execute(stmt)
-        word = result.scalars().first()
-        return word.updated_at if word else None
-
-    async def get_count(self, statuses: Sequence[str]) -> int:
-        """
-        Count the number of VocabWord records filter by statues.
-
-        Args:
-            statuses (Sequence[str]): List of statuses to filter by.
-
-        Returns:
-            int: Count of words matching statuses.
-        """
-        if not statuses:
-            return 0
-
-        stmt = select(functions.count()).where(
-            VocabWord.user_id == self.user_id, VocabWord.status.in_(statuses)
-        )
-        result = await self.session.execute(stmt)
-        return result.scalar_one_or_none() or 0
-
-    async def get_status(self) -> VocStatusSchema:
-        """
-        Retrieve the user's vocabulary status.
-
-        Returns:
-            VocStatusSchema: Schema containing vocabulary status details.
-        """
-        status_count = await self.get_count(["learned", "seen", "ignore"])
-        if status_count != 0:
-            last_update_at = await self.get_last_update_at()
+        word_list = result.scalars().first()
+        if word_list is None:
+            word_list = WordList(name=name)
+            self.session.add(word_list)
+            await self.session.flush()
         else:
-            last_update_at = datetime.fromtimestamp(0)
-        return VocStatusSchema(status_count=status_count, last_update=last_update_at)
-
-    async def clear_all(self) -> None:
-        """
-        Delete all vocabulary words for the user.
-        """
-        stmt = delete(VocabWord).where(VocabWord.user_id == self.user_id)
-        await self.session.execute(stmt)
+            stmt = delete(WordListEntry).where(WordListEntry.list_id == word_list.id)
+            await self.session.execute(stmt)
+
+        for start in range(0, len(unique_writtens), WRITTENS_CHUNK_SIZE):
+            chunk = unique_writtens[start : start + WRITTENS_CHUNK_SIZE]
+            lemma_ids = await self.lemmas.get_ids(chunk, create=True)
+            await self.session.execute(
+                dialect_insert(self.session, WordListEntry.__table__),
+                [
+                    {
+                        "list_id": word_list.id,
+                        "rank": start + offset,
+                        "lemma_id": lemma_ids[written],
+                    }
+                    for offset, written in enumerate(chunk)
+                ],
+            )
+        word_list.size = len(unique_writtens)
+        await self.session.commit()
+        return word_list
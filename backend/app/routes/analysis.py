@@ -7,19 +7,35 @@ Endpoints:
 - GET /words/{word_id}/senses: Retrieve senses for a given word.
 - GET /words/{word_id}: Retrieve a word by its identifier.
 - GET /written/{written}/words: Retrieve words by their written form.
+- GET /written/{written}/similar: Retrieve words close to a misspelled written form.
 """
 
-from typing import List, Sequence, Union
+import unicodedata
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
 
 import khaiii
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Cookie, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.analyse import get_vocabulary
-from app.databases.dict_db import SessionLocal, get_session
-from app.models import Word
-from app.repository import ExampleRepository, SenseRepository, WordRepository
+from app.databases import main_db
+from app.databases.dict_db import get_session
+from app.lexicon import lexicon
+from app.loader import word_loader
+from app.logs import get_logger
+from app.repository import (
+    ExampleRepository,
+    SenseRepository,
+    WordOptions,
+    WordRepository,
+)
+from app.routes.user import get_current_user, get_vocab_statuses
 from app.schemas import (
+    ANALYSIS_FIELDS,
+    FILTERED_STATUSES,
+    LANGUAGES_SUPPORTED,
+    WORD_FIELDS,
     AnalyseRequestSchema,
     AnalysisSchema,
     ExampleSchema,
@@ -28,73 +44,111 @@ from app.schemas import (
     UnitSchema,
     WordSchema,
     WordWithSensesSchema,
+    check_fields,
 )
+from app.search import fuzzy_index
+from app.singleflight import SingleFlight
+
+logger = get_logger(__name__)
 
 # Create API root router
 router = APIRouter(prefix="", tags=["Analysis"])
 
 
-def convert_word_to_schema(word: Word) -> WordWithSensesSchema:
+def split_languages(
+    language: str, languages: Optional[List[str]]
+) -> Tuple[str, List[str]]:
     """
-    Converts a single Word object into a WordWithSensesSchema object.
+    Split the requested languages into the main language and the languages of
+    the per-language translations map.
 
     Args:
-        word (Word): The Word object to convert.
+        language (str): Language code to for translation.
+        languages (Optional[List[str]]): Language codes of the translations map,
+            the first one being the main language.
 
     Returns:
-        WordWithSensesSchema: The converted WordWithSensesSchema object.
+        Tuple[str, List[str]]: Main language and translations map languages.
+
+    Raises:
+        HTTPException: If a language of the translations map is unsupported.
     """
-    return WordWithSensesSchema(
-        id=word.id,
-        written=word.written,
-        category=word.category,
-        senses=[
-            SenseSchema(
-                id=sense.id,
-                translation=sense.translations[0].written,
-                definition=sense.translations[0].definition,
-            )
-            for sense in word.senses
-            if sense.translations
-        ],
-    )
+    if not languages:
+        return language, []
+    if not LANGUAGES_SUPPORTED.issuperset(languages):
+        raise HTTPException(
+            status_code=422,
+            detail=f"Languages must be among {sorted(LANGUAGES_SUPPORTED)}",
+        )
+    return languages[0], list(dict.fromkeys(languages))
 
 
-def convert_words_to_schema(words: Sequence[Word]) -> List[WordWithSensesSchema]:
+def split_fields(senses: bool, fields: Optional[List[str]]) -> Tuple[bool, bool]:
     """
-    Converts a list of Word objects into a list of WordWithSensesSchema objects,
-    using the convert_word_to_schema helper function.
+    Resolve the parts of the words to return.
 
     Args:
-        words (List[Word]): A list of Word objects to convert.
+        senses (bool): If True, include senses.
+        fields (Optional[List[str]]): Parts of the words to return, among
+            WORD_FIELDS, all if None.
 
     Returns:
-        List[WordWithSensesSchema]: A list of converted WordWithSensesSchema objects.
-    """
-    return [convert_word_to_schema(word) for word in words]
+        Tuple[bool, bool]: Whether to include the senses and their definitions.
 
-
-@router.post("/analyze", response_model=AnalysisSchema)
-async def analyze_text(request: AnalyseRequestSchema) -> AnalysisSchema:
+    Raises:
+        HTTPException: If a requested part is unknown.
     """
-    Analyze Korean text: morphological segmentation and vocabulary.
+    if fields is None:
+        return senses, True
+    try:
+        check_fields(fields, WORD_FIELDS)
+    except ValueError as exception:
+        raise HTTPException(status_code=422, detail=str(exception)) from exception
+    return senses or "senses" in fields, "definitions" in fields
+
+
+def word_options(
+    senses: bool,
+    language: str,
+    languages: Optional[List[str]],
+    fields: Optional[List[str]],
+) -> WordOptions:
+    """
+    Resolve the lookup options of the word routes.
 
     Args:
-        request (AnalyseRequestSchema): Request containing the text.
+        senses (bool): If True, include senses.
+        language (str): Language code to for translation.
+        languages (Optional[List[str]]): Language codes of the per-language
+            translations map, the first one overriding language.
+        fields (Optional[List[str]]): Parts of the words to return, among
+            WORD_FIELDS, all if None.
 
     Returns:
-        AnalysisSchema: Analysis result.
+        WordOptions: Parts of the words to include.
+
+    Raises:
+        HTTPException: If a requested part is unknown.
     """
-    # Get text
-    text = request.text.strip()
+    language, translations = split_languages(language, languages)
+    senses, definitions = split_fields(senses, fields)
+    return WordOptions(senses, language, tuple(translations), definitions)
 
-    # Skip analyzing if empty text
-    if len(text) == 0:
-        return AnalysisSchema(units=[], vocab=[])
-    # Max length limit
-    if len(text) > 1000:
-        return AnalysisSchema(units=[], vocab=[])
 
+def segment_text(
+    text: str, units: bool = True, morphs: bool = True
+) -> Tuple[List[UnitSchema], List[str]]:
+    """
+    Segment Korean text with khaiii into units and vocabulary forms.
+
+    Args:
+        text (str): Text to segment.
+        units (bool): If True, construct the units.
+        morphs (bool): If True, include the morphs of the units.
+
+    Returns:
+        Tuple[List[UnitSchema], List[str]]: Analyzed units and vocabulary forms.
+    """
     # Create khaiii handle
     api = khaiii.KhaiiiApi()
 
@@ -107,7 +161,7 @@ async def analyze_text(request: AnalyseRequestSchema) -> AnalysisSchema:
         ) from exception
 
     # Construct the analysis units and vocabulary entries
-    units = []
+    unit_list = []
     vocs = []
 
     # Loop through analyzed words
@@ -116,31 +170,175 @@ async def analyze_text(request: AnalyseRequestSchema) -> AnalysisSchema:
         surface = "".join([m.lex for m in word.morphs])
 
         # Encode morphs
-        morphs = [MorphSchema(lex=morph.lex, tag=morph.tag) for morph in word.morphs]
+        morph_list = [MorphSchema(lex=m.lex, tag=m.tag) for m in word.morphs]
 
         # Get dictionary entry
         try:
             vocabulary = get_vocabulary(word)
             if vocabulary is not None:
                 vocs.append(vocabulary)
-        except (AssertionError, ValueError) as _:
-            print(f"Error in parsing of {word}.")
+        except (AssertionError, ValueError) as e:
+            logger.warning("Failed to parse the vocabulary of {}: {}", word.lex, e)
             vocabulary = None
 
-        # Craft and add unit
-        unit = UnitSchema(
-            surface=surface, morphs=morphs, word=word.lex, vocabulary=vocabulary
-        )
-        units.append(unit)
+        # Craft and add unit, with its morphs if requested
+        if units:
+            unit = UnitSchema(surface=surface, word=word.lex, vocabulary=vocabulary)
+            if morphs:
+                unit.morphs = morph_list
+            unit_list.append(unit)
+
+    return unit_list, vocs
+
+
+async def analyze(
+    text: str, language: str, translations: Tuple[str, ...], fields: FrozenSet[str]
+) -> AnalysisSchema:
+    """
+    Analyze Korean text and look up its vocabulary in the dictionary.
+
+    Args:
+        text (str): Text to analyze.
+        language (str): Language code to for translation.
+        translations (Tuple[str, ...]): Language codes of the per-language
+            translations map of the senses, no map if empty.
+        fields (FrozenSet[str]): Parts of the analysis to return.
+
+    Returns:
+        AnalysisSchema: Analysis result.
+    """
+    # Segment in a worker thread to keep serving requests meanwhile
+    units, vocs = await run_in_threadpool(
+        segment_text, text, "units" in fields, "morphs" in fields
+    )
 
-    async with SessionLocal() as session:
-        repository = WordRepository(session)
-        words = await repository.get_by_writtens(
-            list(dict.fromkeys(vocs)), senses=True, language=request.language
+    # Only set the requested parts, the others are not serialized
+    analysis = AnalysisSchema()
+    if "units" in fields:
+        analysis.units = units
+    if "vocab" in fields:
+        analysis.vocab = list(
+            await word_loader.load(
+                lexicon.filter(dict.fromkeys(vocs)),
+                WordOptions(
+                    senses="senses" in fields,
+                    language=language,
+                    translations=translations,
+                    definitions="definitions" in fields,
+                ),
+            )
         )
 
-        vocab = convert_words_to_schema(words)
-    return AnalysisSchema(units=units, vocab=vocab)
+    return analysis
+
+
+def annotate(
+    analysis: AnalysisSchema,
+    statuses: Dict[str, str],
+    with_status: bool,
+    drop_known: bool,
+) -> AnalysisSchema:
+    """
+    Annotate an analysis with the statuses of a user's vocabulary.
+
+    The analysis may be shared with other requests, so it is copied rather
+    than modified.
+
+    Args:
+        analysis (AnalysisSchema): Analysis result.
+        statuses (Dict[str, str]): Status of each written form, unknown if
+            missing.
+        with_status (bool): Whether to set the status of the units and words.
+        drop_known (bool): Whether to drop the words with a FILTERED_STATUSES
+            status.
+
+    Returns:
+        AnalysisSchema: Annotated analysis result.
+    """
+    annotated = analysis.model_copy()
+    if analysis.units is not None and with_status:
+        annotated.units = [
+            (
+                unit.model_copy(
+                    update={"status": statuses.get(unit.vocabulary, "unknown")}
+                )
+                if unit.vocabulary is not None
+                else unit
+            )
+            for unit in analysis.units
+        ]
+    if analysis.vocab is not None:
+        vocab = analysis.vocab
+        if drop_known:
+            vocab = [
+                word
+                for word in vocab
+                if statuses.get(word.written) not in FILTERED_STATUSES
+            ]
+        if with_status:
+            vocab = [
+                word.model_copy(
+                    update={"status": statuses.get(word.written, "unknown")}
+                )
+                for word in vocab
+            ]
+        annotated.vocab = vocab
+    return annotated
+
+
+# In-flight analyses shared by identical concurrent requests
+analyses: SingleFlight[AnalysisSchema] = SingleFlight("analyze")
+
+
+@router.post(
+    "/analyze", response_model=AnalysisSchema, response_model_exclude_unset=True
+)
+async def analyze_text(
+    request: AnalyseRequestSchema,
+    auth_session: Optional[str] = Cookie(None),
+) -> AnalysisSchema:
+    """
+    Analyze Korean text: morphological segmentation and vocabulary.
+
+    Identical concurrent requests share a single analysis, which is then
+    annotated with the statuses of the authenticated user if requested. The
+    session token is only checked in that case.
+
+    Args:
+        request (AnalyseRequestSchema): Request containing the text.
+        auth_session (Optional[str]): Session token from cookie, if any.
+
+    Returns:
+        AnalysisSchema: Analysis result.
+
+    Raises:
+        HTTPException: If statuses are requested without authentication.
+    """
+    # Get normalized text
+    text = unicodedata.normalize("NFC", request.text.strip())
+
+    # Skip analyzing if empty text
+    if len(text) == 0:
+        return AnalysisSchema(units=[], vocab=[])
+    # Max length limit
+    if len(text) > 1000:
+        return AnalysisSchema(units=[], vocab=[])
+
+    language, languages = split_languages(request.language, request.languages)
+    translations = tuple(languages)
+    fields = frozenset(ANALYSIS_FIELDS if request.fields is None else request.fields)
+    analysis = await analyses.do(
+        (text, language, translations, fields),
+        lambda: analyze(text, language, translations, fields),
+    )
+
+    # Annotate with the user's vocabulary
+    if not request.with_status and not request.drop_known:
+        return analysis
+    async with main_db.SessionLocal() as session:
+        user = await get_current_user(auth_session, session)
+        statuses = await get_vocab_statuses(user.id, session)
+    return annotate(analysis, statuses, request.with_status, request.drop_known)
 
 
 @router.get("/senses/{sense_id}/examples", response_model=List[ExampleSchema])
@@ -162,9 +360,17 @@ async def get_sense_examples(
     return [ExampleSchema.from_orm(example) for example in examples]
 
 
-@router.get("/words/{word_id}/senses", response_model=List[SenseSchema])
+@router.get(
+    "/words/{word_id}/senses",
+    response_model=List[SenseSchema],
+    response_model_exclude_unset=True,
+)
 async def get_word_senses(
-    word_id: int, language: str = "en_US", session: AsyncSession = Depends(get_session)
+    word_id: int,
+    language: str = "en_US",
+    languages: Optional[List[str]] = Query(default=None),
+    fields: Optional[List[str]] = Query(default=None),
+    session: AsyncSession = Depends(get_session),
 ) -> List[SenseSchema]:
     """
     Retrieve senses for a given word.
@@ -173,20 +379,33 @@ async def get_word_senses(
         word_id (int): Word unique identifier.
         session (AsyncSession): Database session dependency.
         language (str): Language code to for translation.
+        languages (Optional[List[str]]): Language codes of the per-language
+            translations map, the first one overriding language.
+        fields (Optional[List[str]]): Parts of the words to return, among
+            WORD_FIELDS, all if None.
 
     Returns:
         List[SenseSchema]: Associated senses.
     """
+    language, translations = split_languages(language, languages)
+    _, definitions = split_fields(True, fields)
     repository = SenseRepository(session)
-    senses = await repository.get_by_word_id(word_id, language=language)
-    return [SenseSchema.from_orm(sense) for sense in senses]
+    return await repository.get_by_word_id(
+        word_id, language=language, translations=translations, definitions=definitions
+    )
 
 
-@router.get("/words/{word_id}", response_model=Union[WordSchema | WordWithSensesSchema])
+@router.get(
+    "/words/{word_id}",
+    response_model=Union[WordSchema | WordWithSensesSchema],
+    response_model_exclude_unset=True,
+)
 async def get_word(
     word_id: int,
     senses: bool = False,
     language: str = "en_US",
+    languages: Optional[List[str]] = Query(default=None),
+    fields: Optional[List[str]] = Query(default=None),
     session: AsyncSession = Depends(get_session),
 ) -> Union[WordSchema | WordWithSensesSchema]:
     """
@@ -197,6 +416,10 @@ async def get_word(
         word_id (int): Word unique identifier.
         senses (bool): If True, include senses.
         language (str): Language code to for translation.
+        languages (Optional[List[str]]): Language codes of the per-language
+            translations map, the first one overriding language.
+        fields (Optional[List[str]]): Parts of the words to return, among
+            WORD_FIELDS, all if None.
         session (AsyncSession): Database session dependency.
 
     Returns:
@@ -204,21 +427,25 @@ async def get_word(
         with associated senses.
     """
     repository = WordRepository(session)
-    word = await repository.get_by_id(word_id, senses=senses, language=language)
-    if word is not None and senses:
-        return convert_word_to_schema(word)
-    return WordSchema.from_orm(word)
+    word = await repository.get_by_id(
+        word_id, word_options(senses, language, languages, fields)
+    )
+    if word is None:
+        raise HTTPException(status_code=404, detail="Word not found")
+    return word
 
 
 @router.get(
     "/written/{written}/words",
     response_model=List[Union[WordSchema, WordWithSensesSchema]],
+    response_model_exclude_unset=True,
 )
 async def get_words(
     written: str,
     senses: bool = False,
     language: str = "en_US",
-    session: AsyncSession = Depends(get_session),
+    languages: Optional[List[str]] = Query(default=None),
+    fields: Optional[List[str]] = Query(default=None),
 ) -> Sequence[Union[WordSchema, WordWithSensesSchema]]:
     """
     Retrieve words by their written form, optionally including their associated senses.
@@ -227,28 +454,31 @@ async def get_words(
         written (str): Word written form.
         senses (bool): If True, include associated senses.
         language (str): Language code to for translation.
-        session (AsyncSession): Database session dependency.
+        languages (Optional[List[str]]): Language codes of the per-language
+            translations map, the first one overriding language.
+        fields (Optional[List[str]]): Parts of the words to return, among
+            WORD_FIELDS, all if None.
 
     Returns:
         List[Union[WordSchema, WordWithSensesSchema]]: Corresponding words,
         optionally with associated senses.
     """
-    repository = WordRepository(session)
-    words = await repository.get_by_written(written, senses=senses, language=language)
-    if senses:
-        return convert_words_to_schema(words)
-    return [WordSchema.from_orm(word) for word in words]
+    return await word_loader.load(
+        lexicon.filter([written]), word_options(senses, language, languages, fields)
+    )
 
 
 @router.get(
     "/writtens/{writtens_str}/words",
     response_model=List[Union[WordSchema, WordWithSensesSchema]],
+    response_model_exclude_unset=True,
 )
 async def get_words_batch(
     writtens_str: str,
     senses: bool = False,
     language: str = "en_US",
-    session: AsyncSession = Depends(get_session),
+    languages: Optional[List[str]] = Query(default=None),
+    fields: Optional[List[str]] = Query(default=None),
 ) -> Sequence[Union[WordSchema, WordWithSensesSchema]]:
     """
     Retrieve words by their writtens form, optionally including their associated senses.
@@ -257,30 +487,31 @@ async def get_words_batch(
         writtens (List[str]): Words written form.
         senses (bool): If True, include associated senses.
         language (str): Language code to for translation.
-        session (AsyncSession): Database session dependency.
+        languages (Optional[List[str]]): Language codes of the per-language
+            translations map, the first one overriding language.
+        fields (Optional[List[str]]): Parts of the words to return, among
+            WORD_FIELDS, all if None.
 
     Returns:
         List[Union[WordSchema, WordWithSensesSchema]]: Corresponding words,
         optionally with associated senses.
     """
-    writtens = writtens_str.split(",")
-    repository = WordRepository(session)
-    words = await repository.get_by_writtens(
-        writtens, senses=senses, language=language, order=False
-    )
-    if senses:
-        return convert_words_to_schema(words)
-    return [WordSchema.from_orm(word) for word in words]
+    options = word_options(senses, language, languages, fields)
+    writtens = lexicon.filter(writtens_str.split(","))
+    return await word_loader.load(writtens, options)
 
 
 @router.get(
     "/written/{fragment}/fragments",
     response_model=List[Union[WordSchema | WordWithSensesSchema]],
+    response_model_exclude_unset=True,
 )
 async def get_words_from_fragment(
     fragment: str,
     senses: bool = False,
     language: str = "en_US",
+    languages: Optional[List[str]] = Query(default=None),
+    fields: Optional[List[str]] = Query(default=None),
     session: AsyncSession = Depends(get_session),
 ) -> Sequence[Union[WordSchema, WordWithSensesSchema]]:
     """
@@ -290,6 +521,10 @@ async def get_words_from_fragment(
         fragment (str): Fragment to search for in the word's written form.
         senses (bool): If True, include associated senses.
         language (str): Language code to for translation.
+        languages (Optional[List[str]]): Language codes of the per-language
+            translations map, the first one overriding language.
+        fields (Optional[List[str]]): Parts of the words to return, among
+            WORD_FIELDS, all if None.
         session (AsyncSession): Database session dependency.
 
     Returns:
@@ -297,9 +532,47 @@ async def get_words_from_fragment(
         optionally with associated senses.
     """
     repository = WordRepository(session)
-    words = await repository.search_by_fragment(
-        fragment, senses=senses, language=language
+    return await repository.search_by_fragment(
+        fragment, word_options(senses, language, languages, fields)
     )
-    if senses:
-        return convert_words_to_schema(words)
-    return [WordSchema.from_orm(word) for word in words]
+
+
+@router.get(
+    "/written/{written}/similar",
+    response_model=List[Union[WordSchema | WordWithSensesSchema]],
+    response_model_exclude_unset=True,
+)
+async def get_similar_words(
+    written: str,
+    distance: int = Query(default=1, ge=0, le=2),
+    senses: bool = False,
+    language: str = "en_US",
+    languages: Optional[List[str]] = Query(default=None),
+    fields: Optional[List[str]] = Query(default=None),
+    session: AsyncSession = Depends(get_session),
+) -> Sequence[Union[WordSchema, WordWithSensesSchema]]:
+    """
+    Retrieves the words closest to a possibly misspelled written form.
+
+    Words are compared on their jamo decomposition, so a wrong vowel or a missing
+    final consonant counts as a single edit.
+
+    Args:
+        written (str): Possibly misspelled written form.
+        distance (int): Maximum jamo edit distance.
+        senses (bool): If True, include associated senses.
+        language (str): Language code to for translation.
+        languages (Optional[List[str]]): Language codes of the per-language
+            translations map, the first one overriding language.
+        fields (Optional[List[str]]): Parts of the words to return, among
+            WORD_FIELDS, all if None.
+        session (AsyncSession): Database session dependency.
+
+    Returns:
+        List[Union[WordSchema, WordWithSensesSchema]]: Corresponding words, closest
+        first, optionally with associated senses.
+    """
+    options = word_options(senses, language, languages, fields)
+    writtens = fuzzy_index.search(written, distance, limit=10)
+    repository = WordRepository(session)
+    return await repository.get_by_writtens(writtens, options)
@@ -1,74 +1,37 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict
 
-import httpx
 import jwt
-from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
 from fastapi import APIRouter, Depends, Form, HTTPException
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.databases.main_db import get_session
+from app.jwks import JWKSCache, apple_jwks, google_jwks
 from app.repository import UserRepository
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 # Auth config for Apple
 APPLE_CLIENT_ID = settings.APPLE_CLIENT_ID
-APPLE_CERTS_URL = "https://appleid.apple.com/auth/keys"
 
 # Auth config for Google
 GOOGLE_CLIENT_ID = settings.GOOGLE_CLIENT_ID
-GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v3/certs"
 
 # Secret for signing auth session JWTs
 AUTH_SECRET = settings.AUTH_SECRET
 
 
-async def fetch_jwks(jwks_url: str) -> Any:
-    """
-    Fetch the JWKS from the given URL.
-
-    Args:
-        jwks_url (str): URL of the JWKS.
-
-    Returns:
-        dict: JSON Web Key Set.
-    """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(jwks_url)
-        response.raise_for_status()
-        return response.json()
-
-
-def get_signing_key(
-    certs: Dict[str, Any], kid: str
-) -> Optional[RSAPublicKey | RSAPrivateKey]:
-    """
-    Get the signing key matching the provided kid.
-
-    Args:
-        certs (dict): JWKS.
-        kid (str): Key ID.
-
-    Returns:
-        Any: The rsa signing key or None.
-    """
-    for jwk in certs.get("keys", []):
-        if jwk.get("kid") == kid:
-            return jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
-    return None
-
-
 async def verify_token(
-    token: str, jwks_url: str, audience: str, issuer: str
+    token: str, jwks: JWKSCache, audience: str, issuer: str
 ) -> Dict[str, Any]:
     """
     Verify a JWT using JWKS.
 
     Args:
         token (str): JWT token.
-        jwks_url (str): JWKS URL.
+        jwks (JWKSCache): Cached JWKS of the provider.
         audience (str): Expected audience.
         issuer (str): Expected issuer.
 
@@ -85,11 +48,10 @@ async def verify_token(
             raise HTTPException(
                 status_code=401, detail="Malformed token: missing 'kid'"
             )
-        certs = await fetch_jwks(jwks_url)
-        if not isinstance(certs, Dict):
-            raise HTTPException(status_code=401, detail="Bad certs type from server")
-        key = get_signing_key(certs, kid)
+        key = await jwks.get_key(kid)
         if key is None:
+            if not jwks.keys:
+                raise HTTPException(status_code=503, detail="Certs server unavailable")
             raise HTTPException(status_code=401, detail="Signing key not found")
         if not isinstance(key, RSAPublicKey):
             raise HTTPException(
@@ -118,7 +80,7 @@ async def verify_google_token(token: str) -> Dict[str, Any]:
         dict: Decoded payload.
     """
     return await verify_token(
-        token, GOOGLE_CERTS_URL, GOOGLE_CLIENT_ID, "https://accounts.google.com"
+        token, google_jwks, GOOGLE_CLIENT_ID, "https://accounts.google.com"
     )
 
 
@@ -133,7 +95,7 @@ async def verify_apple_token(token: str) -> Dict[str, Any]:
         dict: Decoded payload.
     """
     return await verify_token(
-        token, APPLE_CERTS_URL, APPLE_CLIENT_ID, "https://appleid.apple.com"
+        token, apple_jwks, APPLE_CLIENT_ID, "https://appleid.apple.com"
     )
 
 
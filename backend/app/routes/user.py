@@ -1,32 +1,319 @@
-from datetime import datetime
-from typing import List
+import asyncio
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import jwt
-from fastapi import APIRouter, Cookie, Depends, HTTPException, Response, status
+from fastapi import (
+    APIRouter,
+    Cookie,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import import_progress, user_cache, vocab_cache
 from app.config import settings
-from app.databases.main_db import get_session
-from app.models import User
-from app.repository import UserRepository, VocRepository
-from app.schemas import UserInfoSchema, VocabWordSchema, VocStatusSchema
+from app.databases.main_db import SessionLocal, get_session
+from app.metrics import metrics
+from app.notifier import voc_changes
+from app.repository import UserRepository, WordListRepository
+from app.schemas import (
+    KNOWN_STATUSES,
+    VOCAB_SORTS,
+    VOCAB_STATUSES,
+    CurrentUserSchema,
+    ImportErrorSchema,
+    UserInfoSchema,
+    VocabWordSchema,
+    VocChangesSchema,
+    VocImportSchema,
+    VocMarkSchema,
+    VocPageSchema,
+    VocStatusSchema,
+    WordListSchema,
+)
+from app.vocab_files import (
+    EXPORT_FORMATS,
+    decode_csv,
+    decode_ndjson,
+    describe_error,
+    encode_csv,
+    encode_ndjson,
+    iter_lines,
+)
+from app.vocabulary import VocOrder, VocRepository
+from app.writebehind import voc_write_behind
+from app.writer import voc_writer
 
 router = APIRouter(prefix="/user", tags=["User"])
 
 
+def encode_cursor(change_seq: int, lemma_id: int) -> str:
+    """
+    Encode the position of a change into a sync cursor.
+
+    Args:
+        change_seq (int): Change sequence number.
+        lemma_id (int): Lemma identifier of the changed word.
+
+    Returns:
+        str: Sync cursor.
+    """
+    return f"{change_seq}.{lemma_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Decode the position of a change from a sync cursor.
+
+    Args:
+        cursor (str): Sync cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+
+    Returns:
+        Tuple[int, int]: Change sequence number and lemma identifier.
+    """
+    change_seq, separator, lemma_id = cursor.partition(".")
+    if separator and change_seq.isdigit() and lemma_id.isdigit():
+        return int(change_seq), int(lemma_id)
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_page_cursor(sort: str, word: Tuple[str, str, datetime, int]) -> str:
+    """
+    Encode the sort key of the last word of a page into a listing cursor.
+
+    Args:
+        sort (str): Sort key of the listing, among VOCAB_SORTS.
+        word (Tuple[str, str, datetime, int]): Written form, status, update
+            timestamp and lemma identifier of the word.
+
+    Returns:
+        str: Listing cursor.
+    """
+    written, word_status, updated_at, lemma_id = word
+    keys: Dict[str, List[Any]] = {
+        "written": [written],
+        "updated_at": [updated_at.isoformat(), word_status, lemma_id],
+        "status": [word_status, updated_at.isoformat(), lemma_id],
+    }
+    key = keys[sort]
+    data = json.dumps([sort, *key], ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_page_cursor(sort: str, cursor: str) -> List[Any]:
+    """
+    Decode the sort key of the last word of a page from a listing cursor.
+
+    Args:
+        sort (str): Sort key of the listing, among VOCAB_SORTS.
+        cursor (str): Listing cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed or of another sort key.
+
+    Returns:
+        List[Any]: Sort key values, as expected by VocRepository.get_page.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, *key = json.loads(data)
+        if cursor_sort != sort:
+            raise ValueError("Cursor of another sort")
+        if sort == "written":
+            (written,) = key
+            if not isinstance(written, str):
+                raise ValueError("Invalid written form")
+            return [written]
+
+        if sort == "updated_at":
+            updated_at, word_status, lemma_id = key
+        else:
+            word_status, updated_at, lemma_id = key
+        if word_status not in VOCAB_STATUSES or not isinstance(lemma_id, int):
+            raise ValueError("Invalid status or lemma")
+        updated_at = datetime.fromisoformat(updated_at)
+        if sort == "updated_at":
+            return [updated_at, word_status, lemma_id]
+        return [word_status, updated_at, lemma_id]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def make_etag(user_id: int, change_seq: int) -> str:
+    """
+    Make the entity tag of a version of a user's vocabulary.
+
+    The user identifier is part of the tag, as clients may share their cache
+    between the users signing in.
+
+    Args:
+        user_id (int): User identifier.
+        change_seq (int): Change sequence number of the user's last write.
+
+    Returns:
+        str: Quoted entity tag.
+    """
+    return f'"{user_id}.{change_seq}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check whether an If-None-Match header matches an entity tag.
+
+    Args:
+        if_none_match (Optional[str]): If-None-Match header value.
+        etag (str): Quoted entity tag of the current version.
+
+    Returns:
+        bool: True if the client has the current version.
+    """
+    if if_none_match is None:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        # Weak comparison, as mandated for If-None-Match
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def to_milliseconds(value: datetime) -> int:
+    """
+    Convert a timestamp into milliseconds since epoch, naive ones being UTC.
+
+    Args:
+        value (datetime): Timestamp.
+
+    Returns:
+        int: Milliseconds since epoch.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def format_event(event: str, data: str, event_id: Optional[str] = None) -> str:
+    """
+    Format a server-sent event.
+
+    Args:
+        event (str): Event type.
+        data (str): Event data, on a single line.
+        event_id (Optional[str]): Event ID, sent back by the browser as
+            Last-Event-ID when reconnecting.
+
+    Returns:
+        str: Event in the text/event-stream format.
+    """
+    lines = [f"event: {event}", f"data: {data}"]
+    if event_id is not None:
+        lines.insert(0, f"id: {event_id}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def read_changes(
+    repository: VocRepository, cursor: Optional[str], limit: int
+) -> VocChangesSchema:
+    """
+    Read the vocabulary changes following a sync cursor.
+
+    Args:
+        repository (VocRepository): Vocabulary repository of the user.
+        cursor (Optional[str]): Cursor of the last change read, None to read
+            from the start.
+        limit (int): Maximum number of changes read.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+
+    Returns:
+        VocChangesSchema: The next changes and their cursor.
+    """
+    # A cursor ahead of the user's sequence comes from another database
+    after = decode_cursor(cursor) if cursor is not None else None
+    if after is not None:
+        summary = await repository.summary.get_summary()
+        if after[0] > summary.change_seq:
+            return VocChangesSchema(changes=[], cursor=None, more=False, reset=True)
+
+    changes = await repository.get_changes(after, limit)
+    if changes:
+        _, _, _, change_seq, lemma_id = changes[-1]
+        cursor = encode_cursor(change_seq, lemma_id)
+
+    return VocChangesSchema(
+        changes=[
+            (
+                written,
+                status,
+                to_milliseconds(updated_at) if updated_at is not None else None,
+            )
+            for written, status, updated_at, _, _ in changes
+        ],
+        cursor=cursor,
+        more=len(changes) == limit,
+    )
+
+
+async def check_not_modified(
+    repository: VocRepository,
+    if_none_match: Optional[str],
+    response: Response,
+) -> Optional[Response]:
+    """
+    Answer a conditional read of the user's vocabulary from its version.
+
+    The version is read before the vocabulary, so a write in between only
+    makes the client fetch again on its next request.
+
+    Args:
+        repository (VocRepository): Vocabulary repository of the user.
+        if_none_match (Optional[str]): If-None-Match header value.
+        response (Response): Response of the read, given the version headers.
+
+    Returns:
+        Optional[Response]: Not Modified response if the client has the current
+        version; otherwise, None.
+    """
+    headers = {"Cache-Control": "private, no-cache"}
+    change_seq = await repository.summary.get_change_seq()
+    if change_seq is not None:
+        headers["ETag"] = make_etag(repository.user_id, change_seq)
+        if etag_matches(if_none_match, headers["ETag"]):
+            metrics.increment("voc.not_modified")
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
 async def get_current_user(
-    auth_session: str = Cookie(None),
+    auth_session: Optional[str] = Cookie(None),
     session: AsyncSession = Depends(get_session),
-) -> User:
+) -> CurrentUserSchema:
     """
     Retrieve the current user from the session token.
 
+    Resolved users are cached for a short time, so most requests skip the
+    database round trip.
+
     Args:
-        auth_session (str): Session token from cookie.
+        auth_session (Optional[str]): Session token from cookie.
         session (AsyncSession): DB session dependency.
 
     Returns:
-        User: Authenticated user
+        CurrentUserSchema: Authenticated user
 
     Raises:
         HTTPException: If authentication fails or user is not found.
@@ -45,33 +332,65 @@ async def get_current_user(
     if "google_id" in token and "apple_id" in token:
         raise HTTPException(status_code=401, detail="Two user ids found in token")
 
+    # Look for the user in the cache first
+    if "google_id" in token:
+        cache_key = f"google:{token['google_id']}"
+    elif "apple_id" in token:
+        cache_key = f"apple:{token['apple_id']}"
+    else:
+        raise HTTPException(status_code=401, detail="No user id found in token")
+    current_user = user_cache.get(cache_key)
+    if current_user is not None:
+        return current_user
+
     # Create repository instance to access user data
     repository = UserRepository(session)
 
-    user = None
     # Retrieve user by Google ID or Apple ID
     if "google_id" in token:
         user = await repository.get_by_google_id(token["google_id"])
-    elif "apple_id" in token:
-        user = await repository.get_by_apple_id(token["apple_id"])
     else:
-        raise HTTPException(status_code=401, detail="No user id found in token")
+        user = await repository.get_by_apple_id(token["apple_id"])
 
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return user
+    current_user = CurrentUserSchema.from_orm(user)
+    user_cache.set(cache_key, current_user)
+    return current_user
+
+
+async def get_vocab_statuses(user_id: int, session: AsyncSession) -> Dict[str, str]:
+    """
+    Retrieve the status of a user's vocabulary words, except unknown ones.
+
+    Statuses are cached for a short time, the cache being invalidated by the
+    writes of the worker. The pending words of the user are written first.
+
+    Args:
+        user_id (int): User identifier.
+        session (AsyncSession): DB session.
+
+    Returns:
+        Dict[str, str]: Status of each written form.
+    """
+    await voc_write_behind.flush(user_id)
+    statuses = vocab_cache.get(user_id)
+    if statuses is None:
+        statuses = await VocRepository(session, user_id).get_statuses()
+        vocab_cache.set(user_id, statuses)
+    return statuses
 
 
 @router.get("/me", response_model=UserInfoSchema)
 async def get_user_info(
-    user: User = Depends(get_current_user),
+    user: CurrentUserSchema = Depends(get_current_user),
 ) -> UserInfoSchema:
     """
     Get current user information.
 
     Args:
-        user (User): Authenticated user.
+        user (CurrentUserSchema): Authenticated user.
 
     Returns:
         UserInfoSchema: Information of the current user.
@@ -82,15 +401,18 @@ async def get_user_info(
 @router.put("/voc", response_model=VocStatusSchema)
 async def update_voc(
     voc_req: VocabWordSchema,
-    user: User = Depends(get_current_user),
+    user: CurrentUserSchema = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> VocStatusSchema:
     """
     Update a vocabulary word.
 
+    With VOC_WRITE_BEHIND_ENABLED, the word is written behind together with
+    the next words put by the user within VOC_WRITE_BEHIND_WINDOW_MS.
+
     Args:
         voc_req (VocabWordSchema): Vocabulary word details to put.
-        user (User): Authenticated user.
+        user (CurrentUserSchema): Authenticated user.
         session (AsyncSession): DB session dependency.
 
     Returns:
@@ -99,19 +421,19 @@ async def update_voc(
     # Create repository instance to access user data
     repository = VocRepository(session, user.id)
 
-    # Get previous status and vocab word
-    status = await repository.get_status()
-    vocab_word = await repository.get_by_written(voc_req.written)
-
-    if vocab_word is None:
-        # New word: add to vocabulary
-        await repository.add_word(voc_req)
+    if voc_write_behind.enabled:
+        # Previous status, including the words still pending
+        status = await repository.get_status(voc_write_behind.get_pending(user.id))
+        await voc_write_behind.put(user.id, voc_req)
         return status
 
-    # Update existing word
-    vocab_word.status = voc_req.status
-    vocab_word.updated_at = voc_req.updated_at
-    await session.commit()
+    # Get previous status
+    status = await repository.get_status()
+
+    # Add or update the word
+    await voc_writer.run(
+        lambda write_session: VocRepository(write_session, user.id).put_words([voc_req])
+    )
 
     return status
 
@@ -119,7 +441,7 @@ async def update_voc(
 @router.put("/voc/batch", response_model=VocStatusSchema)
 async def update_voc_batch(
     voc_req: List[VocabWordSchema],
-    user: User = Depends(get_current_user),
+    user: CurrentUserSchema = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> VocStatusSchema:
     """
@@ -127,12 +449,15 @@ async def update_voc_batch(
 
     Args:
         voc_req (List[VocabWordSchema]): List of vocabulary word details to update.
-        user (User): DB session dependency.
+        user (CurrentUserSchema): Authenticated user.
         session (AsyncSession): Database session dependency.
 
     Returns:
         VocStatusSchema: The previous vocabulary status.
     """
+    # Write the pending words first, so they do not override these ones
+    await voc_write_behind.flush(user.id)
+
     # Create repository instance to access vocabulary data
     repository = VocRepository(session, user.id)
 
@@ -140,60 +465,351 @@ async def update_voc_batch(
     status = await repository.get_status()
 
     # Filter voc_req for unique entries keyed by 'written'.
-    unique_voc = {word.written: word for word in voc_req}.values()
-    writtens = [word.written for word in unique_voc]
-
-    # Retrieve existing vocab words for these written forms.
-    existing_vocab = await repository.get_by_writtens(writtens)
-    existing_dict = {lw.written: lw for lw in existing_vocab}
-
-    new_words = []
-    # Process each unique incoming word.
-    for word in unique_voc:
-        if word.written not in existing_dict:
-            # Word does not exist; mark it for insertion.
-            new_words.append(word)
-        else:
-            # Update existing word.
-            existing = existing_dict[word.written]
-            existing.status = word.status
-            existing.updated_at = word.updated_at
+    unique_voc = list({word.written: word for word in voc_req}.values())
 
-    # Add new words in batch if any.
-    if new_words:
-        await repository.add_words(new_words)
+    # Add or update the words.
+    await voc_writer.run(
+        lambda write_session: VocRepository(write_session, user.id).put_words(
+            unique_voc
+        )
+    )
 
-    await session.commit()
     return status
 
 
+@router.get("/voc/lists", response_model=List[WordListSchema])
+async def get_word_lists(
+    user: CurrentUserSchema = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> List[WordListSchema]:
+    """
+    Retrieve the word lists whose bands can be marked in the vocabulary.
+
+    Args:
+        user (CurrentUserSchema): Authenticated user.
+        session (AsyncSession): DB session dependency.
+
+    Returns:
+        List[WordListSchema]: Word lists, by name.
+    """
+    word_lists = await WordListRepository(session).get_all()
+    return [WordListSchema.from_orm(word_list) for word_list in word_lists]
+
+
+@router.post("/voc/mark", response_model=VocStatusSchema)
+async def mark_voc(
+    mark_req: VocMarkSchema,
+    user: CurrentUserSchema = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> VocStatusSchema:
+    """
+    Give a status to the words of a band of a word list, such as the most
+    frequent words, in a single statement.
+
+    Args:
+        mark_req (VocMarkSchema): Word list band and status to give.
+        user (CurrentUserSchema): Authenticated user.
+        session (AsyncSession): DB session dependency.
+
+    Raises:
+        HTTPException: If the word list does not exist.
+
+    Returns:
+        VocStatusSchema: The vocabulary status, once marked.
+    """
+    word_list = await WordListRepository(session).get_by_id(mark_req.list_id)
+    if word_list is None:
+        raise HTTPException(status_code=404, detail="Word list not found")
+
+    # Write the pending words first, so they are marked too
+    await voc_write_behind.flush(user.id)
+
+    # Create repository instance to access user data
+    repository = VocRepository(session, user.id)
+
+    now = datetime.utcnow()
+    await voc_writer.run(
+        lambda write_session: VocRepository(write_session, user.id).mark_list(
+            mark_req, now
+        )
+    )
+
+    return await repository.get_status()
+
+
 @router.get("/voc", response_model=List[VocabWordSchema])
 async def get_voc(
-    user: User = Depends(get_current_user),
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    user: CurrentUserSchema = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> List[VocabWordSchema]:
+) -> Union[List[VocabWordSchema], Response]:
     """
     Retrieve all learned or seen vocabulary words.
 
     Args:
-        user (User): Authenticated user.
+        response (Response): Response, given the version headers.
+        if_none_match (Optional[str]): Entity tags of the versions the client
+            has, answered with Not Modified if current.
+        user (CurrentUserSchema): Authenticated user.
         session (AsyncSession): DB session dependency.
 
     Returns:
-        List[VocabWordSchema]: A list of learned or seen vocabulary words.
+        Union[List[VocabWordSchema], Response]: A list of learned or seen
+        vocabulary words, or a Not Modified response.
     """
+    # Write the pending words, so they are read
+    await voc_write_behind.flush(user.id)
+
     # Create repository instance to access user data
     repository = VocRepository(session, user.id)
 
+    not_modified = await check_not_modified(repository, if_none_match, response)
+    if not_modified is not None:
+        return not_modified
+
     vocab_words = await repository.get_all(["learned", "seen", "ignore"])
 
     return [VocabWordSchema.from_orm(word) for word in vocab_words]
 
 
+@router.get("/voc/list", response_model=VocPageSchema)
+async def list_voc(
+    sort: str = Query(default="written"),
+    order: str = Query(default="asc"),
+    statuses: Optional[List[str]] = Query(default=None, alias="status"),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=1000),
+    user: CurrentUserSchema = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> VocPageSchema:
+    """
+    List the vocabulary words page by page, sorted by the server.
+
+    Pages follow the cursor of the previous one, so each page is read from an
+    index range whatever its position and the vocabulary size.
+
+    Args:
+        sort (str): Sort key, among VOCAB_SORTS, the written forms being sorted
+            in Hangul order.
+        order (str): Sort order, asc or desc.
+        statuses (Optional[List[str]]): Statuses of the listed words, learned,
+            seen and ignore ones if None.
+        cursor (Optional[str]): Cursor returned with the previous page, None
+            for the first page.
+        limit (int): Maximum number of words of the page.
+        user (CurrentUserSchema): Authenticated user.
+        session (AsyncSession): DB session dependency.
+
+    Raises:
+        HTTPException: If the sort, order or a status is unknown, or the cursor
+            is malformed.
+
+    Returns:
+        VocPageSchema: The page of words and its cursor.
+    """
+    if sort not in VOCAB_SORTS:
+        raise HTTPException(
+            status_code=422, detail=f"Sort must be among {list(VOCAB_SORTS)}"
+        )
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=422, detail="Order must be asc or desc")
+    if statuses is not None and not set(VOCAB_STATUSES).issuperset(statuses):
+        raise HTTPException(
+            status_code=422, detail=f"Status must be among {list(VOCAB_STATUSES)}"
+        )
+    after = decode_page_cursor(sort, cursor) if cursor is not None else None
+
+    # Write the pending words, so they are listed
+    await voc_write_behind.flush(user.id)
+
+    # Create repository instance to access user data
+    repository = VocRepository(session, user.id)
+
+    words = await repository.get_page(
+        VocOrder(sort, order == "desc"),
+        statuses if statuses is not None else KNOWN_STATUSES,
+        after,
+        limit,
+    )
+
+    return VocPageSchema(
+        words=[
+            VocabWordSchema(written=written, status=word_status, updated_at=updated_at)
+            for written, word_status, updated_at, _ in words
+        ],
+        cursor=encode_page_cursor(sort, words[-1]) if words else cursor,
+        more=len(words) == limit,
+    )
+
+
+@router.get("/voc/export", response_class=StreamingResponse)
+async def export_voc(
+    file_format: str = Query(default="ndjson", alias="format"),
+    statuses: Optional[List[str]] = Query(default=None, alias="status"),
+    user: CurrentUserSchema = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Export the vocabulary words as a NDJSON or CSV file.
+
+    The file is written while the words are fetched by chunks, so the memory
+    used does not depend on the vocabulary size.
+
+    Args:
+        file_format (str): Format of the file, among EXPORT_FORMATS.
+        statuses (Optional[List[str]]): Statuses of the exported words, all if
+            None.
+        user (CurrentUserSchema): Authenticated user.
+
+    Raises:
+        HTTPException: If the format or a status is unknown.
+
+    Returns:
+        StreamingResponse: The vocabulary file.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=422, detail=f"Format must be among {sorted(EXPORT_FORMATS)}"
+        )
+    if statuses is not None and not set(VOCAB_STATUSES).issuperset(statuses):
+        raise HTTPException(
+            status_code=422, detail=f"Status must be among {list(VOCAB_STATUSES)}"
+        )
+    export_statuses = statuses if statuses is not None else VOCAB_STATUSES
+
+    # Write the pending words, so they are exported
+    await voc_write_behind.flush(user.id)
+
+    async def generate() -> AsyncIterator[str]:
+        # The session must outlive the route, it is opened by the stream itself
+        async with SessionLocal() as session:
+            repository = VocRepository(session, user.id)
+            if file_format == "csv":
+                yield encode_csv([], header=True)
+            async for rows in repository.stream(export_statuses):
+                if file_format == "csv":
+                    yield encode_csv(rows)
+                else:
+                    yield encode_ndjson(rows)
+
+    return StreamingResponse(
+        generate(),
+        media_type=EXPORT_FORMATS[file_format],
+        headers={
+            "Content-Disposition": (f'attachment; filename="vocabulary.{file_format}"')
+        },
+    )
+
+
+@router.post("/voc/import", response_model=VocImportSchema)
+async def import_voc(
+    request: Request,
+    file_format: str = Query(default="ndjson", alias="format"),
+    user: CurrentUserSchema = Depends(get_current_user),
+) -> VocImportSchema:
+    """
+    Import vocabulary words from a NDJSON or CSV file sent as request body.
+
+    Lines are validated while the file is uploaded, valid words being written
+    by transactions of VOC_IMPORT_CHUNK_SIZE words, so the memory used does not
+    depend on the file size. Invalid lines are skipped and reported. The
+    progress can be followed with /user/voc/import/progress.
+
+    Args:
+        request (Request): Request streaming the file.
+        file_format (str): Format of the file, among EXPORT_FORMATS.
+        user (CurrentUserSchema): Authenticated user.
+
+    Raises:
+        HTTPException: If the format is unknown or the file is not text lines.
+
+    Returns:
+        VocImportSchema: Outcome of the import.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=422, detail=f"Format must be among {sorted(EXPORT_FORMATS)}"
+        )
+    decode = decode_csv if file_format == "csv" else decode_ndjson
+
+    # Write the pending words first, so they do not override imported ones
+    await voc_write_behind.flush(user.id)
+
+    async def put_words(words: List[VocabWordSchema]) -> None:
+        await voc_writer.run(
+            lambda write_session: VocRepository(write_session, user.id).put_words(words)
+        )
+
+    progress = VocImportSchema()
+    import_progress.set(user.id, progress)
+    now = datetime.utcnow()
+    chunk: Dict[str, VocabWordSchema] = {}
+    try:
+        # The progress is updated by chunk rather than by line
+        line_number = 0
+        async for line_number, line in iter_lines(request.stream()):
+            if not line.strip():
+                continue
+            try:
+                word = decode(line, now)
+            except ValueError as e:
+                progress.failed += 1
+                if len(progress.errors) < settings.VOC_IMPORT_MAX_ERRORS:
+                    progress.errors.append(
+                        ImportErrorSchema(line=line_number, error=describe_error(e))
+                    )
+                continue
+            if word is None:
+                continue
+
+            chunk[word.written] = word
+            if len(chunk) >= settings.VOC_IMPORT_CHUNK_SIZE:
+                await put_words(list(chunk.values()))
+                progress.lines = line_number
+                progress.imported += len(chunk)
+                chunk.clear()
+
+        if chunk:
+            await put_words(list(chunk.values()))
+            progress.imported += len(chunk)
+        progress.lines = line_number
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid file: {e}")
+    finally:
+        progress.done = True
+
+    return progress
+
+
+@router.get("/voc/import/progress", response_model=VocImportSchema)
+async def get_voc_import_progress(
+    user: CurrentUserSchema = Depends(get_current_user),
+) -> VocImportSchema:
+    """
+    Retrieve the progress of the last vocabulary import.
+
+    The progress is kept by the worker running the import, for
+    VOC_IMPORT_PROGRESS_TTL seconds.
+
+    Args:
+        user (CurrentUserSchema): Authenticated user.
+
+    Raises:
+        HTTPException: If no import is known.
+
+    Returns:
+        VocImportSchema: Progress of the import.
+    """
+    progress = import_progress.get(user.id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="No import found")
+    return progress
+
+
 @router.get("/voc/change/{since}", response_model=List[VocabWordSchema])
 async def get_voc_change(
     since: datetime,
-    user: User = Depends(get_current_user),
+    user: CurrentUserSchema = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> List[VocabWordSchema]:
     """
@@ -201,12 +817,15 @@ async def get_voc_change(
 
     Args:
         since (datetime): Datetime from which to retrieve updates.
-        user (User): Authenticated user.
+        user (CurrentUserSchema): Authenticated user.
         session (AsyncSession): DB session dependency.
 
     Returns:
         List[VocabWordSchema]: Vocabulary words updated since the specified datetime.
     """
+    # Write the pending words, so they are read
+    await voc_write_behind.flush(user.id)
+
     # Create repository instance to access user data
     repository = VocRepository(session, user.id)
 
@@ -215,24 +834,140 @@ async def get_voc_change(
     return [VocabWordSchema.from_orm(word) for word in vocab_words]
 
 
+@router.get("/voc/sync", response_model=VocChangesSchema)
+async def get_voc_sync(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=1000, ge=1, le=10000),
+    user: CurrentUserSchema = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> VocChangesSchema:
+    """
+    Retrieve the vocabulary changes following a sync cursor.
+
+    Changes are ordered by a per-user sequence number given by the server, so
+    syncing does not depend on the devices clocks. Removed words are returned
+    as tombstones.
+
+    Args:
+        cursor (Optional[str]): Cursor returned by the previous sync, None to
+            sync from the start.
+        limit (int): Maximum number of changes returned.
+        user (CurrentUserSchema): Authenticated user.
+        session (AsyncSession): DB session dependency.
+
+    Returns:
+        VocChangesSchema: The next changes and their cursor.
+    """
+    # Write the pending words, so they are read
+    await voc_write_behind.flush(user.id)
+
+    # Create repository instance to access user data
+    repository = VocRepository(session, user.id)
+
+    return await read_changes(repository, cursor, limit)
+
+
+@router.get("/voc/events", response_class=StreamingResponse)
+async def get_voc_events(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=1000, ge=1, le=10000),
+    last_event_id: Optional[str] = Header(default=None),
+    user: CurrentUserSchema = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Stream the vocabulary changes as server-sent events.
+
+    A "changes" event, with the same data as /user/voc/sync and the cursor as
+    ID, is sent for the changes following the cursor, then whenever the
+    vocabulary is written by any device. Comments are sent every
+    VOC_EVENTS_HEARTBEAT seconds to keep the connection open.
+
+    Args:
+        cursor (Optional[str]): Cursor returned by the previous sync, None to
+            sync from the start.
+        limit (int): Maximum number of changes by event.
+        last_event_id (Optional[str]): Cursor of the last event received,
+            taking precedence over the cursor when the browser reconnects.
+        user (CurrentUserSchema): Authenticated user.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+
+    Returns:
+        StreamingResponse: The stream of events.
+    """
+    if last_event_id:
+        cursor = last_event_id
+    if cursor is not None:
+        decode_cursor(cursor)
+
+    # Write the pending words, so they are sent
+    await voc_write_behind.flush(user.id)
+
+    async def generate() -> AsyncIterator[str]:
+        nonlocal cursor
+        async with voc_changes.subscribe(user.id) as changed:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        changed.wait(), timeout=settings.VOC_EVENTS_HEARTBEAT
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+
+                # Cleared before reading, so no change is missed
+                changed.clear()
+                # The session must outlive the route, it is opened by the stream
+                async with SessionLocal() as session:
+                    repository = VocRepository(session, user.id)
+                    page = await read_changes(repository, cursor, limit)
+                if page.reset or page.changes:
+                    yield format_event(
+                        "changes", page.model_dump_json(), page.cursor or ""
+                    )
+                if page.reset or page.more:
+                    changed.set()
+                cursor = page.cursor if not page.reset else None
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/voc/status", response_model=VocStatusSchema)
 async def get_last_voc(
-    user: User = Depends(get_current_user),
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    user: CurrentUserSchema = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> VocStatusSchema:
+) -> Union[VocStatusSchema, Response]:
     """
     Retrieve the vocabulary status.
 
     Args:
-        user (User): Authenticated user.
+        response (Response): Response, given the version headers.
+        if_none_match (Optional[str]): Entity tags of the versions the client
+            has, answered with Not Modified if current.
+        user (CurrentUserSchema): Authenticated user.
         session (AsyncSession): DB session dependency.
 
     Returns:
-        VocStatusSchema: The vocabulary status of the user.
+        Union[VocStatusSchema, Response]: The vocabulary status of the user, or
+        a Not Modified response.
     """
+    # Write the pending words, so they are accounted for
+    await voc_write_behind.flush(user.id)
+
     # Create repository instance to access user data
     repository = VocRepository(session, user.id)
 
+    not_modified = await check_not_modified(repository, if_none_match, response)
+    if not_modified is not None:
+        return not_modified
+
     status = await repository.get_status()
 
     return status
@@ -240,21 +975,22 @@ async def get_last_voc(
 
 @router.delete("/voc", status_code=status.HTTP_204_NO_CONTENT)
 async def clear_vocabulary(
-    user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    user: CurrentUserSchema = Depends(get_current_user),
 ) -> Response:
     """
     Deletes all vocabulary words for the authenticated user.
 
     Args:
-        user (User): Authenticated user.
-        session (AsyncSession): DB session dependency.
+        user (CurrentUserSchema): Authenticated user.
 
     Returns:
         Response: Responds with HTTP 204 No Content upon success.
     """
-    repository = VocRepository(session, user.id)
+    # Write the pending words first, so they are cleared too
+    await voc_write_behind.flush(user.id)
 
-    await repository.clear_all()
+    await voc_writer.run(
+        lambda write_session: VocRepository(write_session, user.id).clear_all()
+    )
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
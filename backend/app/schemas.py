@@ -3,7 +3,7 @@ Pydantic schemas for requests and responses.
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 from pydantic import BaseModel, Field, validator
 
@@ -27,15 +27,17 @@ class UnitSchema(BaseModel):
 
     Attributes:
         surface (str): Surface form.
-        morphs (List[MorphSchema]): Associated morphemes.
+        morphs (Optional[List[MorphSchema]]): Associated morphemes, if requested.
         word (str): Word form.
         vocabulary (Optional[str]): Optional vocabulary form.
+        status (Optional[str]): User status of the vocabulary form, if requested.
     """
 
     surface: str
-    morphs: List[MorphSchema]
+    morphs: Optional[List[MorphSchema]] = None
     word: str
     vocabulary: Optional[str]
+    status: Optional[str] = None
 
 
 class AnalysisSchema(BaseModel):
@@ -43,16 +45,40 @@ class AnalysisSchema(BaseModel):
     Schema representing the complete analysis result.
 
     Attributes:
-        units (List[UnitSchema]): Analyzed units.
-        vocab (List[WordWithSensesSchema]): Vocabulary from analysis.
+        units (Optional[List[UnitSchema]]): Analyzed units, if requested.
+        vocab (Optional[List[Union[WordWithSensesSchema, WordSchema]]]): Vocabulary
+            from analysis, with senses if requested.
     """
 
-    units: List[UnitSchema]
-    vocab: List["WordWithSensesSchema"]
+    units: Optional[List[UnitSchema]] = None
+    vocab: Optional[List[Union["WordWithSensesSchema", "WordSchema"]]] = None
 
 
 LANGUAGES_SUPPORTED = {"en_US", "ko_KR", "fr_FR", "es_ES", "ja_JP"}
 
+# Parts of the responses which can be selected
+ANALYSIS_FIELDS = {"units", "morphs", "vocab", "senses", "definitions"}
+WORD_FIELDS = {"senses", "definitions"}
+
+
+def check_fields(value: Optional[List[str]], allowed: Set[str]) -> Optional[List[str]]:
+    """
+    Validates a selection of response parts.
+
+    Args:
+        value (Optional[List[str]]): Parts requested by the user, all if None.
+        allowed (Set[str]): Parts which can be selected.
+
+    Raises:
+        ValueError: If a requested part is unknown.
+
+    Returns:
+        Optional[List[str]]: The validated parts.
+    """
+    if value is not None and not allowed.issuperset(value):
+        raise ValueError(f"Fields must be among {sorted(allowed)}")
+    return value
+
 
 class AnalyseRequestSchema(BaseModel):
     """
@@ -61,10 +87,22 @@ class AnalyseRequestSchema(BaseModel):
     Attributes:
         text (str): Text to be analyzed.
         language (str): Language of the dictionary.
+        languages (Optional[List[str]]): Languages of the per-language
+            translations map, the first one being the main language.
+        fields (Optional[List[str]]): Parts of the analysis to return, among
+            ANALYSIS_FIELDS, all if None.
+        with_status (bool): Whether to annotate the units and vocabulary with
+            the status of the authenticated user.
+        drop_known (bool): Whether to drop the vocabulary words the
+            authenticated user has learned or ignored.
     """
 
     text: str
     language: str = Field(default="en_US")
+    languages: Optional[List[str]] = None
+    fields: Optional[List[str]] = None
+    with_status: bool = False
+    drop_known: bool = False
 
     @validator("language", pre=True, always=True)
     # pylint: disable=no-self-argument
@@ -82,6 +120,39 @@ class AnalyseRequestSchema(BaseModel):
             return "en_US"
         return value
 
+    @validator("languages")
+    # pylint: disable=no-self-argument
+    def check_languages(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        """
+        Validates the 'languages' field, dropping unsupported and duplicate ones.
+
+        Args:
+            value (Optional[List[str]]): Languages value provided by the user.
+
+        Returns:
+            Optional[List[str]]: The valid language codes, None if there is none.
+        """
+        if value is None:
+            return None
+        languages = [
+            code for code in dict.fromkeys(value) if code in LANGUAGES_SUPPORTED
+        ]
+        return languages or None
+
+    @validator("fields")
+    # pylint: disable=no-self-argument
+    def check_fields(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        """
+        Validates the 'fields' field.
+
+        Args:
+            value (Optional[List[str]]): Fields value provided by the user.
+
+        Returns:
+            Optional[List[str]]: The valid fields.
+        """
+        return check_fields(value, ANALYSIS_FIELDS)
+
 
 class ExampleSchema(BaseModel):
     """
@@ -103,6 +174,19 @@ class ExampleSchema(BaseModel):
         from_attributes = True
 
 
+class TranslationSchema(BaseModel):
+    """
+    Schema representing the translation of a sense in a language.
+
+    Attributes:
+        translation (str): Translation written form.
+        definition (Optional[str]): Translation definition, if requested.
+    """
+
+    translation: str
+    definition: Optional[str] = None
+
+
 class SenseSchema(BaseModel):
     """
     Schema representing a sense of a word.
@@ -110,12 +194,15 @@ class SenseSchema(BaseModel):
     Attributes:
         id (int): Unique identifier.
         translation (str): Translation written form.
-        definition (str): Translation definition.
+        definition (Optional[str]): Translation definition, if requested.
+        translations (Optional[Dict[str, TranslationSchema]]): Translations by
+            language code, when many languages are requested.
     """
 
     id: int
     translation: str
-    definition: str
+    definition: Optional[str] = None
+    translations: Optional[Dict[str, TranslationSchema]] = None
 
     class Config:
         """
@@ -133,11 +220,13 @@ class WordSchema(BaseModel):
         id (int): Unique identifier.
         written (str): Written form.
         category (str): Word category.
+        status (Optional[str]): User status of the word, if requested.
     """
 
     id: int
     written: str
     category: str
+    status: Optional[str] = None
 
     class Config:
         """
@@ -180,6 +269,30 @@ class UserInfoSchema(BaseModel):
         from_attributes = True
 
 
+class CurrentUserSchema(UserInfoSchema):
+    """
+    Schema representing the authenticated user of a request.
+
+    Attributes:
+        id (int): Unique identifier.
+    """
+
+    id: int
+
+
+# Statuses of a vocabulary word
+VOCAB_STATUSES = ("unknown", "learned", "ignore", "seen")
+
+# Statuses of the words counted in the vocabulary status
+KNOWN_STATUSES = ("learned", "seen", "ignore")
+
+# Statuses of the words dropped by the vocabulary filter
+FILTERED_STATUSES = ("learned", "ignore")
+
+# Sort keys of the vocabulary listing
+VOCAB_SORTS = ("written", "updated_at", "status")
+
+
 class VocabWordSchema(BaseModel):
     """
     Schema representing a vocab word.
@@ -209,7 +322,7 @@ class VocabWordSchema(BaseModel):
         Returns:
             str: The validated status value.
         """
-        allowed_statuses = {"unknown", "learned", "ignore", "seen"}
+        allowed_statuses = set(VOCAB_STATUSES)
         if value not in allowed_statuses:
             raise ValueError(f"Status must be one of {allowed_statuses}")
         return value
@@ -228,13 +341,146 @@ class VocStatusSchema(BaseModel):
 
     Attributes:
         status_count (int): Total number of seen and learned words.
+        counts (Dict[str, int]): Number of words of each status.
         last_update (datetime): Timestamp of the most recent voc update.
     """
 
     status_count: int
+    counts: Dict[str, int] = {}
     last_update: datetime
 
 
+class VocChangesSchema(BaseModel):
+    """
+    Represents a page of vocabulary changes
+
+    Attributes:
+        changes (List[Tuple[str, Optional[str], Optional[int]]]): Changes in
+            order, as [written, status, updated_at] with the update timestamp in
+            milliseconds, a removed word having a null status and timestamp.
+        cursor (Optional[str]): Cursor of the last change, to pass to get the
+            next changes.
+        more (bool): Whether more changes follow this page.
+        reset (bool): Whether the cursor is unknown, in which case the client must
+            drop its vocabulary and sync again from the start.
+    """
+
+    changes: List[Tuple[str, Optional[str], Optional[int]]]
+    cursor: Optional[str]
+    more: bool
+    reset: bool = False
+
+
+class VocPageSchema(BaseModel):
+    """
+    Represents a page of the vocabulary listing
+
+    Attributes:
+        words (List[VocabWordSchema]): Words of the page, in order.
+        cursor (Optional[str]): Cursor of the last word, to pass to get the next
+            page.
+        more (bool): Whether more words follow this page.
+    """
+
+    words: List[VocabWordSchema]
+    cursor: Optional[str]
+    more: bool
+
+
+class WordListSchema(BaseModel):
+    """
+    Represents a ranked word list
+
+    Attributes:
+        id (int): Unique identifier.
+        name (str): Unique name.
+        size (int): Number of written forms.
+    """
+
+    id: int
+    name: str
+    size: int
+
+    class Config:
+        """
+        Configuration for the WordListSchema class.
+        """
+
+        from_attributes = True
+
+
+class VocMarkSchema(BaseModel):
+    """
+    Represents a request to mark a band of a word list in the vocabulary
+
+    Attributes:
+        list_id (int): Identifier of the word list.
+        start (int): Rank of the first written form of the band, from 0.
+        stop (Optional[int]): Rank following the last written form of the band,
+            None for the end of the list.
+        status (str): Status to give to the words.
+        overwrite (bool): Whether to change the words which already have a
+            status other than unknown.
+    """
+
+    list_id: int
+    start: int = Field(default=0, ge=0)
+    stop: Optional[int] = Field(default=None, ge=0)
+    status: str = "learned"
+    overwrite: bool = False
+
+    @validator("status")
+    # pylint: disable=no-self-argument
+    def validate_status(cls, value: str) -> str:
+        """
+        Validates the 'status' field to ensure it is one of the allowed statuses.
+
+        Args:
+            value (str): The status value provided by the user.
+
+        Raises:
+            ValueError: If the provided status is not in the allowed set.
+
+        Returns:
+            str: The validated status value.
+        """
+        if value not in VOCAB_STATUSES:
+            raise ValueError(f"Status must be one of {set(VOCAB_STATUSES)}")
+        return value
+
+
+class ImportErrorSchema(BaseModel):
+    """
+    Represents a rejected line of a vocabulary import
+
+    Attributes:
+        line (int): Line number, starting at 1.
+        error (str): Reason of the rejection.
+    """
+
+    line: int
+    error: str
+
+
+class VocImportSchema(BaseModel):
+    """
+    Represents the progress of a vocabulary import
+
+    Attributes:
+        lines (int): Number of lines read.
+        imported (int): Number of words written.
+        failed (int): Number of lines rejected.
+        errors (List[ImportErrorSchema]): First rejected lines.
+        done (bool): Whether the import is over.
+    """
+
+    lines: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[ImportErrorSchema] = []
+    done: bool = False
+
+
 class MobileInfoSchema(BaseModel):
     """
     Represents the mobile information
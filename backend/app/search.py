@@ -0,0 +1,247 @@
+"""
+Module for typo-tolerant search over the dictionary written forms.
+
+Written forms are decomposed into their Hangul jamo so that a learner's typical
+mistakes (ㅐ/ㅔ confusion, a missing 받침, ...) only cost one edit, and are
+indexed in a BK-tree to answer "closest words within a distance" queries without
+scanning the whole dictionary.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.databases.dict_db import SessionLocal
+from app.repository import WordRepository
+
+# Hangul syllables block layout
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+MEDIAL_COUNT = 21
+FINAL_COUNT = 28
+
+# Compatibility jamo for each syllable position
+INITIALS = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+MEDIALS = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+FINALS = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+# BK-tree node, as its key and its children by distance to the key
+Node = Tuple[str, Dict[int, "Node"]]
+
+
+def decompose(text: str) -> str:
+    """
+    Decompose the Hangul syllables of a text into compatibility jamo.
+
+    Args:
+        text (str): Text to decompose.
+
+    Returns:
+        str: Text with every Hangul syllable replaced by its jamo.
+    """
+    jamos = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            index = code - HANGUL_BASE
+            jamos.append(INITIALS[index // (MEDIAL_COUNT * FINAL_COUNT)])
+            jamos.append(MEDIALS[(index // FINAL_COUNT) % MEDIAL_COUNT])
+            if index % FINAL_COUNT:
+                jamos.append(FINALS[index % FINAL_COUNT])
+        else:
+            jamos.append(char)
+    return "".join(jamos)
+
+
+def pattern_masks(pattern: str) -> Dict[str, int]:
+    """
+    Compute the bit mask of the positions of each character of a pattern.
+
+    Args:
+        pattern (str): Pattern string.
+
+    Returns:
+        Dict[str, int]: Position bit mask for each character.
+    """
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def edit_distance(
+    pattern: str, text: str, masks: Optional[Dict[str, int]] = None
+) -> int:
+    """
+    Compute the Levenshtein distance between two strings.
+
+    Uses Myers' bit-parallel algorithm, the pattern masks can be precomputed with
+    pattern_masks when the same pattern is compared against many strings.
+
+    Args:
+        pattern (str): First string.
+        text (str): Second string.
+        masks (Optional[Dict[str, int]]): Precomputed masks of the pattern.
+
+    Returns:
+        int: Minimum number of insertions, deletions and substitutions.
+    """
+    length = len(pattern)
+    if length == 0:
+        return len(text)
+    if masks is None:
+        masks = pattern_masks(pattern)
+
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    positive, negative, score = full, 0, length
+    for char in text:
+        equal = masks.get(char, 0)
+        vertical = equal | negative
+        horizontal = (((equal & positive) + positive) ^ positive) | equal
+        horizontal_positive = negative | (~(horizontal | positive) & full)
+        horizontal_negative = positive & horizontal
+        if horizontal_positive & last:
+            score += 1
+        elif horizontal_negative & last:
+            score -= 1
+        horizontal_positive = ((horizontal_positive << 1) | 1) & full
+        horizontal_negative = (horizontal_negative << 1) & full
+        positive = horizontal_negative | (~(vertical | horizontal_positive) & full)
+        negative = horizontal_positive & vertical
+    return score
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over strings under the edit distance.
+
+    Each node keeps its children keyed by their distance to the node, so the
+    triangle inequality bounds which subtrees can hold a match.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty BKTree.
+        """
+        self.root: Optional[Node] = None
+        self.size = 0
+
+    def add(self, key: str) -> None:
+        """
+        Insert a key in the tree, duplicates are ignored.
+
+        Args:
+            key (str): Key to insert.
+        """
+        if self.root is None:
+            self.root = (key, {})
+            self.size = 1
+            return
+
+        masks = pattern_masks(key)
+        node = self.root
+        while True:
+            distance = edit_distance(key, node[0], masks)
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (key, {})
+                self.size += 1
+                return
+            node = child
+
+    def search(self, key: str, max_distance: int) -> List[Tuple[int, str]]:
+        """
+        Find all keys within a maximum distance of the given key.
+
+        Args:
+            key (str): Searched key.
+            max_distance (int): Maximum edit distance.
+
+        Returns:
+            List[Tuple[int, str]]: Matching (distance, key) pairs, closest first.
+        """
+        if self.root is None:
+            return []
+
+        masks = pattern_masks(key)
+        matches = []
+        stack = [self.root]
+        while stack:
+            node_key, children = stack.pop()
+            distance = edit_distance(key, node_key, masks)
+            if distance <= max_distance:
+                matches.append((distance, node_key))
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(
+                child for dist, child in children.items() if low <= dist <= high
+            )
+
+        matches.sort()
+        return matches
+
+
+class FuzzyIndex:
+    """
+    Typo-tolerant index of the dictionary written forms.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty FuzzyIndex.
+        """
+        self.tree = BKTree()
+        self.writtens: Dict[str, List[str]] = {}
+
+    def build(self, writtens: Iterable[str]) -> None:
+        """
+        Build the index from written forms.
+
+        Args:
+            writtens (Iterable[str]): Written forms to index.
+        """
+        tree = BKTree()
+        index: Dict[str, List[str]] = {}
+        for written in writtens:
+            jamos = decompose(written)
+            if jamos not in index:
+                index[jamos] = []
+                tree.add(jamos)
+            if written not in index[jamos]:
+                index[jamos].append(written)
+
+        self.tree = tree
+        self.writtens = index
+
+    def search(self, written: str, max_distance: int, limit: int) -> List[str]:
+        """
+        Retrieve the closest written forms within a jamo edit distance.
+
+        Args:
+            written (str): Possibly misspelled written form.
+            max_distance (int): Maximum jamo edit distance.
+            limit (int): Maximum number of written forms returned.
+
+        Returns:
+            List[str]: Matching written forms, closest first.
+        """
+        results: List[str] = []
+        for _, jamos in self.tree.search(decompose(written), max_distance):
+            results.extend(self.writtens[jamos])
+            if len(results) >= limit:
+                break
+        return results[:limit]
+
+
+# Shared index of the dictionary, built on startup
+fuzzy_index = FuzzyIndex()
+
+
+async def init_index() -> None:
+    """
+    Initialize the fuzzy index from the dictionary database.
+    """
+    async with SessionLocal() as session:
+        repository = WordRepository(session)
+        writtens = await repository.get_all_writtens()
+    fuzzy_index.build(writtens)
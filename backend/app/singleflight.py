@@ -0,0 +1,68 @@
+"""
+Module for single-flight deduplication of concurrent identical computations.
+
+While a computation is in flight, callers asking for the same key await its
+result instead of starting their own.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+from app.metrics import metrics
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Group of in-flight computations keyed by their inputs.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize the SingleFlight group.
+
+        Args:
+            name (str): Name prefixing the group metrics.
+        """
+        self.name = name
+        self.calls: Dict[Hashable, "asyncio.Task[T]"] = {}
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a computation, or join the in-flight one with the same key.
+
+        The computation runs in its own task, so a cancelled caller does not
+        cancel it for the others.
+
+        Args:
+            key (Hashable): Key identifying the computation.
+            function (Callable[[], Awaitable[T]]): Computation to run.
+
+        Returns:
+            T: Result of the computation.
+        """
+        metrics.increment(f"{self.name}.calls")
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(function())
+            self.calls[key] = task
+            task.add_done_callback(lambda done: self.forget(key, done))
+        else:
+            metrics.increment(f"{self.name}.shared")
+        metrics.ratio(
+            f"{self.name}.dedup_ratio", f"{self.name}.shared", f"{self.name}.calls"
+        )
+
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable, task: "asyncio.Task[T]") -> None:
+        """
+        Remove a finished computation so the next call starts a new one.
+
+        Args:
+            key (Hashable): Key identifying the computation.
+            task (asyncio.Task[T]): Finished computation task.
+        """
+        if self.calls.get(key) is task:
+            del self.calls[key]
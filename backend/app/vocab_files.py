@@ -0,0 +1,178 @@
+"""
+Module for the file formats of vocabulary exports and imports.
+
+Rows are encoded chunk by chunk, so that exports can be streamed while they
+are read from the database, and decoded line by line, so that imports can be
+written while they are uploaded.
+"""
+
+import codecs
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.schemas import VocabWordSchema
+
+# Media type of each export format
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Columns of the CSV exports
+CSV_HEADER = ("written", "status", "updated_at")
+
+# Status of the imported words without one
+IMPORT_DEFAULT_STATUS = "learned"
+
+# Maximum length of an imported line
+IMPORT_MAX_LINE_LENGTH = 4096
+
+# Vocabulary word row, as written form, status and update timestamp
+VocabRow = Tuple[str, str, datetime]
+
+
+def encode_ndjson(rows: Iterable[VocabRow]) -> str:
+    """
+    Encode vocabulary rows as newline delimited JSON objects.
+
+    Args:
+        rows (Iterable[VocabRow]): Rows to encode.
+
+    Returns:
+        str: One JSON object per line.
+    """
+    return "".join(
+        json.dumps(
+            {
+                "written": written,
+                "status": status,
+                "updated_at": updated_at.isoformat(),
+            },
+            ensure_ascii=False,
+        )
+        + "\n"
+        for written, status, updated_at in rows
+    )
+
+
+def encode_csv(rows: Iterable[VocabRow], header: bool = False) -> str:
+    """
+    Encode vocabulary rows as CSV lines.
+
+    Args:
+        rows (Iterable[VocabRow]): Rows to encode.
+        header (bool): Whether to start with the header line.
+
+    Returns:
+        str: One CSV line per row.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(CSV_HEADER)
+    writer.writerows(
+        (written, status, updated_at.isoformat())
+        for written, status, updated_at in rows
+    )
+    return buffer.getvalue()
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Decode UTF-8 lines from a stream of bytes.
+
+    Args:
+        chunks (AsyncIterator[bytes]): Stream of bytes.
+
+    Raises:
+        UnicodeDecodeError: If the stream is not valid UTF-8.
+        ValueError: If a line is longer than IMPORT_MAX_LINE_LENGTH.
+
+    Yields:
+        Tuple[int, str]: Line number, starting at 1, and line without its
+        terminator.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    line_number = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, line.rstrip("\r")
+        if len(pending) > IMPORT_MAX_LINE_LENGTH:
+            raise ValueError(f"Line longer than {IMPORT_MAX_LINE_LENGTH} characters")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield line_number + 1, pending.rstrip("\r")
+
+
+def decode_ndjson(line: str, now: datetime) -> VocabWordSchema:
+    """
+    Decode a vocabulary word from a JSON object line.
+
+    Args:
+        line (str): JSON object with a written form, and optionally a status and
+            an update timestamp.
+        now (datetime): Update timestamp of the words without one.
+
+    Raises:
+        ValueError: If the line is not a valid word.
+
+    Returns:
+        VocabWordSchema: Decoded word.
+    """
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError("Line is not a JSON object")
+    data.setdefault("status", IMPORT_DEFAULT_STATUS)
+    data.setdefault("updated_at", now)
+    return VocabWordSchema(**data)
+
+
+def decode_csv(line: str, now: datetime) -> Optional[VocabWordSchema]:
+    """
+    Decode a vocabulary word from a CSV line.
+
+    Args:
+        line (str): Written form, and optionally status and update timestamp.
+        now (datetime): Update timestamp of the words without one.
+
+    Raises:
+        ValueError: If the line is not a valid word.
+
+    Returns:
+        Optional[VocabWordSchema]: Decoded word, None for the header line.
+    """
+    fields = next(csv.reader([line]))
+    if tuple(fields) == CSV_HEADER:
+        return None
+    if not fields or len(fields) > len(CSV_HEADER):
+        raise ValueError(f"Line must have 1 to {len(CSV_HEADER)} fields")
+    written, status, updated_at = (fields + ["", ""])[:3]
+    return VocabWordSchema(
+        written=written,
+        status=status or IMPORT_DEFAULT_STATUS,
+        updated_at=updated_at or now,
+    )
+
+
+def describe_error(error: Exception) -> str:
+    """
+    Describe why an imported line was rejected.
+
+    Args:
+        error (Exception): Error raised while decoding the line.
+
+    Returns:
+        str: One line description of the error.
+    """
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(loc) for loc in detail['loc'])}: {detail['msg']}"
+            for detail in error.errors()
+        )
+    return str(error)
@@ -0,0 +1,903 @@
+"""
+Module providing async repositories for the users' vocabulary.
+
+The vocabulary words of a user are summarized by a status summary, which also
+versions the vocabulary with the change sequence number of its last write.
+"""
+
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from sqlalchemy import (
+    ColumnElement,
+    and_,
+    case,
+    delete,
+    literal,
+    null,
+    or_,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import functions
+
+from app.cache import vocab_cache
+from app.models import Lemma, VocabStatus, VocabTombstone, VocabWord, WordListEntry
+from app.models.user import naive_utc
+from app.notifier import voc_changes
+from app.repository import LemmaRepository, dialect_insert
+from app.schemas import (
+    KNOWN_STATUSES,
+    VOCAB_STATUSES,
+    VocabWordSchema,
+    VocMarkSchema,
+    VocStatusSchema,
+)
+from app.writer import voc_writer
+
+# Maximum number of vocabulary words written by a single statement
+VOC_CHUNK_SIZE = 500
+
+# Number of vocabulary words fetched at once when streaming
+VOC_STREAM_CHUNK_SIZE = 1000
+
+
+class VocOrder(NamedTuple):
+    """
+    Order of a listing of vocabulary words.
+
+    Attributes:
+        sort (str): Sort key, among VOCAB_SORTS.
+        descending (bool): If True, sort in descending order.
+    """
+
+    sort: str = "written"
+    descending: bool = False
+
+
+# Columns of each sort key of the vocabulary listings, in the order of its index
+VOC_SORT_COLUMNS: Dict[str, List[ColumnElement[Any]]] = {
+    "written": [Lemma.written.expression],
+    "updated_at": [
+        VocabWord.updated_at.expression,
+        VocabWord.status.expression,
+        VocabWord.lemma_id.expression,
+    ],
+    "status": [
+        VocabWord.status.expression,
+        VocabWord.updated_at.expression,
+        VocabWord.lemma_id.expression,
+    ],
+}
+
+
+class VocSummaryRepository:
+    """
+    Repository for VocabStatus model.
+    """
+
+    def __init__(self, session: AsyncSession, user_id: int):
+        """
+        Initialize the vocabulary summary repository.
+
+        Args:
+            session (AsyncSession): Async session used for operations.
+            user_id (int): User identifier for operation.
+        """
+        self.session = session
+        self.user_id = user_id
+
+    async def get_change_seq(self) -> Optional[int]:
+        """
+        Retrieve the change sequence number of the user's last write, which
+        versions the vocabulary.
+
+        Returns:
+            Optional[int]: Last change sequence number if the user has a status
+            summary; otherwise, None.
+        """
+        stmt = select(VocabStatus.change_seq).where(VocabStatus.user_id == self.user_id)
+        result = await self.session.execute(stmt)
+        return result.scalar()
+
+    async def next_change_seq(self) -> int:
+        """
+        Allocate the change sequence number of a write, the change being
+        committed with the session.
+
+        The user's summary row stays locked until then, which serializes the
+        writes of the user so that their sequence numbers follow commit order.
+
+        Returns:
+            int: Change sequence number of the write.
+        """
+        bump = (
+            update(VocabStatus)
+            .where(VocabStatus.user_id == self.user_id)
+            .values(change_seq=VocabStatus.change_seq + 1)
+            .execution_options(synchronize_session=False)
+        )
+        bumped = await self.session.execute(bump)
+        if bumped.rowcount == 0:
+            await self.create_summary()
+            await self.session.execute(bump)
+
+        stmt = select(VocabStatus.change_seq).where(VocabStatus.user_id == self.user_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
+    async def get_summary(self) -> VocabStatus:
+        """
+        Retrieve the user's vocabulary status summary, creating it from the
+        vocabulary words through the writer if missing.
+
+        Returns:
+            VocabStatus: Vocabulary status summary.
+        """
+        stmt = (
+            select(VocabStatus)
+            .where(VocabStatus.user_id == self.user_id)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        summary = result.scalars().first()
+        if summary is None:
+            user_id = self.user_id
+            summary = await voc_writer.run(
+                lambda session: VocSummaryRepository(session, user_id).save_summary()
+            )
+        return summary
+
+    async def save_summary(self) -> VocabStatus:
+        """
+        Create the user's vocabulary status summary from the vocabulary words
+        and commit it.
+
+        Returns:
+            VocabStatus: Vocabulary status summary.
+        """
+        summary = await self.create_summary()
+        await self.session.commit()
+        return summary
+
+    async def compute_summary(self) -> VocabStatus:
+        """
+        Compute the user's vocabulary status summary from the vocabulary words.
+
+        Returns:
+            VocabStatus: Transient vocabulary status summary.
+        """
+        stmt = (
+            select(
+                VocabWord.status,
+                functions.count(),
+                functions.max(VocabWord.updated_at),
+            )
+            .where(VocabWord.user_id == self.user_id)
+            .group_by(VocabWord.status)
+        )
+        result = await self.session.execute(stmt)
+
+        summary = VocabStatus(user_id=self.user_id, last_update=None, change_seq=0)
+        for status in VOCAB_STATUSES:
+            setattr(summary, f"{status}_count", 0)
+        for status, count, last_update in result.tuples():
+            if status in VOCAB_STATUSES:
+                setattr(summary, f"{status}_count", count)
+            if summary.last_update is None or last_update > summary.last_update:
+                summary.last_update = last_update
+
+        # Sequence numbers are never given again, even to removed words
+        for model in (VocabWord, VocabTombstone):
+            last_seq = select(functions.max(model.change_seq)).where(
+                model.user_id == self.user_id
+            )
+            change_seq = await self.session.scalar(last_seq)
+            summary.change_seq = max(summary.change_seq, change_seq or 0)
+        return summary
+
+    async def create_summary(self) -> VocabStatus:
+        """
+        Create the user's vocabulary status summary from the vocabulary words,
+        the change being committed with the session.
+
+        Returns:
+            VocabStatus: Vocabulary status summary.
+        """
+        summary = await self.compute_summary()
+        values = {
+            column.key: getattr(summary, column.key)
+            for column in VocabStatus.__table__.columns
+        }
+        stmt = (
+            dialect_insert(self.session, VocabStatus)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[VocabStatus.user_id])
+        )
+        await self.session.execute(stmt)
+        return summary
+
+    async def update_summary(
+        self, deltas: Dict[str, int], last_update: Optional[datetime]
+    ) -> None:
+        """
+        Apply a vocabulary change to the user's status summary, the change being
+        committed with the session.
+
+        Args:
+            deltas (Dict[str, int]): Change of the number of words by status.
+            last_update (Optional[datetime]): Most recent update of the change.
+        """
+        values: Dict[str, Any] = {
+            f"{status}_count": getattr(VocabStatus, f"{status}_count") + delta
+            for status, delta in deltas.items()
+            if delta != 0 and status in VOCAB_STATUSES
+        }
+        if last_update is not None:
+            values["last_update"] = case(
+                (
+                    or_(
+                        VocabStatus.last_update.is_(None),
+                        VocabStatus.last_update < last_update,
+                    ),
+                    literal(last_update, VocabStatus.last_update.type),
+                ),
+                else_=VocabStatus.last_update,
+            )
+        if not values:
+            return
+
+        stmt = (
+            update(VocabStatus)
+            .where(VocabStatus.user_id == self.user_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        if result.rowcount == 0:
+            # No summary yet, create it from the words including this change
+            await self.session.flush()
+            await self.create_summary()
+
+
+class VocRepository:
+    """
+    Repository for VocabWord model.
+    """
+
+    def __init__(self, session: AsyncSession, user_id: int):
+        """
+        Initialize the vocabulary repository.
+
+        Args:
+            session (AsyncSession): Async session used for operations.
+            user_id (int): User identifier for operation.
+        """
+        self.session = session
+        self.user_id = user_id
+        self.lemmas = LemmaRepository(session)
+        self.summary = VocSummaryRepository(session, user_id)
+
+    async def commit_change(self, change_seq: int) -> None:
+        """
+        Commit a change of the user's vocabulary, then invalidate its cached
+        statuses and notify the subscribers once it is visible.
+
+        Args:
+            change_seq (int): Change sequence number of the change.
+        """
+        await self.session.commit()
+
+        def notify() -> None:
+            vocab_cache.invalidate(self.user_id)
+            voc_changes.publish(self.user_id, change_seq)
+
+        # Sessions of a group of writes are committed with the group
+        after_commit = self.session.info.get("after_commit")
+        if after_commit is not None:
+            after_commit.append(notify)
+        else:
+            notify()
+
+    async def get_by_written(self, written: str) -> Optional[VocabWord]:
+        """
+        Retrieve a VocabWord record by its written form.
+
+        Args:
+            written (str): Written form of the word.
+
+        Returns:
+            Optional[VocabWord]: Matching VocabWord record if found,
+            otherwise, None.
+        """
+        stmt = select(VocabWord).where(
+            VocabWord.user_id == self.user_id,
+            VocabWord.lemma_id
+            == select(Lemma.id).where(Lemma.written == written).scalar_subquery(),
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().first()
+
+    async def get_by_writtens(
+        self,
+        writtens: List[str],
+    ) -> Sequence[VocabWord]:
+        """
+        Retrieve VocabWord records by many writtens form.
+
+        Args:
+            writtens (List[str]): Written forms of the words.
+
+        Returns:
+            Sequence[VocabWord]: Matching VocabWord records if found
+        """
+        if len(writtens) == 0:
+            return []
+
+        stmt = select(VocabWord).where(
+            VocabWord.user_id == self.user_id,
+            VocabWord.lemma_id.in_(select(Lemma.id).where(Lemma.written.in_(writtens))),
+        )
+        result = await self.session.execute(stmt)
+        words = result.scalars().all()
+
+        return words
+
+    async def get_all(self, statuses: Sequence[str]) -> Sequence[VocabWord]:
+        """
+        Retrieve all VocabWord records whose status is in the provided list.
+
+        Args:
+            statuses (Sequence[str]): List of statuses to filter by.
+
+        Returns:
+            Sequence[VocabWord]: Matching VocabWord.
+        """
+        if not statuses:
+            return []
+
+        stmt = select(VocabWord).where(
+            VocabWord.user_id == self.user_id, VocabWord.status.in_(statuses)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_statuses(self) -> Dict[str, str]:
+        """
+        Retrieve the status of the user's vocabulary words, except unknown ones.
+
+        Returns:
+            Dict[str, str]: Status of each written form.
+        """
+        stmt = (
+            select(Lemma.written, VocabWord.status)
+            .join(Lemma, Lemma.id == VocabWord.lemma_id)
+            .where(VocabWord.user_id == self.user_id, VocabWord.status != "unknown")
+        )
+        result = await self.session.execute(stmt)
+        return dict(result.tuples().all())
+
+    async def stream(
+        self, statuses: Sequence[str]
+    ) -> AsyncIterator[Sequence[Tuple[str, str, datetime]]]:
+        """
+        Stream the VocabWord records whose status is in the provided list, by
+        chunks of VOC_STREAM_CHUNK_SIZE fetched from a server-side cursor.
+
+        Args:
+            statuses (Sequence[str]): List of statuses to filter by.
+
+        Yields:
+            Sequence[Tuple[str, str, datetime]]: Written form, status and update
+            timestamp of the words, in written order.
+        """
+        if not statuses:
+            return
+
+        stmt = (
+            select(Lemma.written, VocabWord.status, VocabWord.updated_at)
+            .join(Lemma, Lemma.id == VocabWord.lemma_id)
+            .where(VocabWord.user_id == self.user_id, VocabWord.status.in_(statuses))
+            .order_by(Lemma.written)
+            .execution_options(yield_per=VOC_STREAM_CHUNK_SIZE)
+        )
+        result = await self.session.stream(stmt)
+        async for rows in result.partitions():
+            # Rows are named tuples of the selected columns
+            yield cast(Sequence[Tuple[str, str, datetime]], rows)
+
+    async def get_page(
+        self,
+        order: VocOrder,
+        statuses: Sequence[str],
+        after: Optional[Sequence[Any]],
+        limit: int,
+    ) -> List[Tuple[str, str, datetime, int]]:
+        """
+        Retrieve a page of the VocabWord records whose status is in the provided
+        list, sorted by a key following a keyset.
+
+        The keys follow the order of the indexes, so pages are read from the
+        index ranges following the keyset: by written form from the lemmas
+        index, by update timestamp from idx_user_updated and by status from
+        idx_user_status.
+
+        Args:
+            order (VocOrder): Sort key and direction.
+            statuses (Sequence[str]): List of statuses to filter by.
+            after (Optional[Sequence[Any]]): Sort key values of the last word
+                already retrieved, None to start over. The values are the written
+                form for the written sort, the update timestamp, status and lemma
+                identifier for the updated_at sort, and the status, update
+                timestamp and lemma identifier for the status sort.
+            limit (int): Maximum number of words.
+
+        Returns:
+            List[Tuple[str, str, datetime, int]]: Written form, status, update
+            timestamp and lemma identifier of the words, in order.
+        """
+        if not statuses:
+            return []
+
+        columns = VOC_SORT_COLUMNS[order.sort]
+        stmt = (
+            select(Lemma.written, VocabWord.status, VocabWord.updated_at, Lemma.id)
+            .join(Lemma, Lemma.id == VocabWord.lemma_id)
+            .where(VocabWord.user_id == self.user_id, VocabWord.status.in_(statuses))
+        )
+        keyset: Optional[ColumnElement[bool]] = None
+        if after is not None:
+            key = tuple_(*columns)
+            values = tuple_(
+                *(literal(value, column.type) for column, value in zip(columns, after))
+            )
+            keyset = key < values if order.descending else key > values
+        order_by = [column.desc() if order.descending else column for column in columns]
+
+        if order.sort == "written" and await self.is_dense(statuses, limit):
+            # Scan the lemmas in order, probing the words of the user, rather
+            # than sorting all of them
+            lemma_ids = (
+                select(Lemma.id)
+                .where(
+                    select(VocabWord.lemma_id)
+                    .where(
+                        VocabWord.user_id == self.user_id,
+                        VocabWord.lemma_id == Lemma.id,
+                        VocabWord.status.in_(statuses),
+                    )
+                    .exists()
+                )
+                .order_by(*order_by)
+                .limit(limit)
+            )
+            if keyset is not None:
+                lemma_ids = lemma_ids.where(keyset)
+            stmt = stmt.where(VocabWord.lemma_id.in_(lemma_ids))
+        elif keyset is not None:
+            stmt = stmt.where(keyset)
+
+        stmt = stmt.order_by(*order_by).limit(limit)
+        result = await self.session.execute(stmt)
+        return list(result.tuples())
+
+    async def is_dense(self, statuses: Sequence[str], limit: int) -> bool:
+        """
+        Tell whether the user's words with the provided statuses are dense
+        enough among the lemmas for a page of them to be found by scanning the
+        lemmas in order.
+
+        Scanning takes about limit * lemmas / words probes, while sorting takes
+        about words steps.
+
+        Args:
+            statuses (Sequence[str]): List of statuses to filter by.
+            limit (int): Maximum number of words of the page.
+
+        Returns:
+            bool: Whether scanning the lemmas is cheaper than sorting the words.
+        """
+        summary = await self.summary.get_summary()
+        words = sum(
+            cast(int, getattr(summary, f"{status}_count")) for status in set(statuses)
+        )
+
+        # Lemmas are never deleted, the last identifier is their number
+        result = await self.session.execute(select(functions.max(Lemma.id)))
+        lemmas = result.scalar() or 0
+        return words * words > lemmas * limit
+
+    async def get_since(self, since: datetime) -> Sequence[VocabWord]:
+        """
+        Retrieve all VocabWord records updated on or after the specified datetime.
+
+        Args:
+            since (datetime): Datetime to start the search from.
+
+        Returns:
+            Sequence[VocabWord]: VocabWord records updated since the given datetime.
+        """
+        stmt = select(VocabWord).where(
+            VocabWord.user_id == self.user_id, VocabWord.updated_at >= since
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def add_word(self, word: VocabWordSchema) -> VocabWord:
+        """
+        Add a new VocabWord record to the user's vocabulary.
+
+        Args:
+            word (VocabWordSchema): Data schema containing the VocabWord details.
+
+        Returns:
+            VocabWord: Newly created VocabWord record.
+        """
+        vocab_words = await self.add_words([word])
+        return vocab_words[0]
+
+    async def add_words(self, words: List[VocabWordSchema]) -> List[VocabWord]:
+        """
+        Add a new VocabWord record to the user's vocabulary.
+
+        Args:
+            word (List[VocabWordSchema]): Data schema containing the VocabWord details.
+
+        Returns:
+            VocabWord: Newly created VocabWord records.
+        """
+        change_seq = await self.summary.next_change_seq()
+        lemma_ids = await self.lemmas.get_ids(
+            [word.written for word in words], create=True
+        )
+        vocab_words = []
+        deltas: Dict[str, int] = {}
+        for word in words:
+            vocab_word = VocabWord(
+                lemma_id=lemma_ids[word.written],
+                status=word.status,
+                updated_at=word.updated_at,
+                change_seq=change_seq,
+                user_id=self.user_id,
+            )
+            self.session.add(vocab_word)
+            vocab_words.append(vocab_word)
+            deltas[word.status] = deltas.get(word.status, 0) + 1
+        await self.summary.update_summary(
+            deltas, max((naive_utc(word.updated_at) for word in words), default=None)
+        )
+        await self.commit_change(change_seq)
+        return vocab_words
+
+    async def put_words(self, words: Sequence[VocabWordSchema]) -> None:
+        """
+        Add or update VocabWord records of the user's vocabulary.
+
+        Words are upserted by chunks of VOC_CHUNK_SIZE, each chunk being one
+        INSERT ... ON CONFLICT DO UPDATE statement executed for all its rows,
+        within one transaction.
+
+        Args:
+            words (Sequence[VocabWordSchema]): Words to put, with unique writtens.
+        """
+        if not words:
+            return
+
+        change_seq = await self.summary.next_change_seq()
+        deltas: Dict[str, int] = {}
+        for start in range(0, len(words), VOC_CHUNK_SIZE):
+            chunk = words[start : start + VOC_CHUNK_SIZE]
+            lemma_ids = await self.lemmas.get_ids(
+                [word.written for word in chunk], create=True
+            )
+
+            # Previous statuses of the words, to update the status counts
+            previous = select(VocabWord.status).where(
+                VocabWord.user_id == self.user_id,
+                VocabWord.lemma_id.in_(lemma_ids.values()),
+            )
+            result = await self.session.execute(previous)
+            for status in result.scalars():
+                deltas[status] = deltas.get(status, 0) - 1
+
+            # Words put back are not removed anymore
+            revive = delete(VocabTombstone).where(
+                VocabTombstone.user_id == self.user_id,
+                VocabTombstone.lemma_id.in_(lemma_ids.values()),
+            )
+            await self.session.execute(revive)
+
+            insert = dialect_insert(self.session, VocabWord.__table__)
+            upsert = insert.on_conflict_do_update(
+                index_elements=[VocabWord.user_id, VocabWord.lemma_id],
+                set_={
+                    "status": insert.excluded.status,
+                    "updated_at": insert.excluded.updated_at,
+                    "change_seq": insert.excluded.change_seq,
+                },
+            )
+            await self.session.execute(
+                upsert,
+                [
+                    {
+                        "user_id": self.user_id,
+                        "lemma_id": lemma_ids[word.written],
+                        "status": word.status,
+                        "updated_at": word.updated_at,
+                        "change_seq": change_seq,
+                    }
+                    for word in chunk
+                ],
+            )
+            for word in chunk:
+                deltas[word.status] = deltas.get(word.status, 0) + 1
+
+        # Timestamps may mix naive UTC and aware ones, as in imported files
+        await self.summary.update_summary(
+            deltas, max(naive_utc(word.updated_at) for word in words)
+        )
+        await self.commit_change(change_seq)
+
+    async def mark_list(self, mark: VocMarkSchema, updated_at: datetime) -> int:
+        """
+        Give a status to the words of a band of a word list.
+
+        The words are written by a single INSERT ... SELECT ... ON CONFLICT DO
+        UPDATE statement from the word list entries, the written forms never
+        leaving the database.
+
+        Args:
+            mark (VocMarkSchema): Word list band, status to give to its words
+                and whether to change the words which already have a status
+                other than unknown.
+            updated_at (datetime): Update timestamp of the words.
+
+        Returns:
+            int: Number of words added or changed.
+        """
+        band = [WordListEntry.list_id == mark.list_id, WordListEntry.rank >= mark.start]
+        if mark.stop is not None:
+            band.append(WordListEntry.rank < mark.stop)
+        lemma_ids = select(WordListEntry.lemma_id).where(*band)
+
+        # Words of the band which are changed, the others being left untouched
+        changed = [VocabWord.status != mark.status]
+        if not mark.overwrite:
+            changed.append(VocabWord.status == "unknown")
+
+        change_seq = await self.summary.next_change_seq()
+
+        # Previous statuses of the words, to update the status counts
+        previous = (
+            select(VocabWord.status, functions.count())
+            .where(
+                VocabWord.user_id == self.user_id,
+                VocabWord.lemma_id.in_(lemma_ids),
+                *changed,
+            )
+            .group_by(VocabWord.status)
+        )
+        result = await self.session.execute(previous)
+        deltas = {status: -count for status, count in result.tuples()}
+
+        # Words put back are not removed anymore
+        revive = delete(VocabTombstone).where(
+            VocabTombstone.user_id == self.user_id,
+            VocabTombstone.lemma_id.in_(lemma_ids),
+        )
+        await self.session.execute(revive)
+
+        words = select(
+            literal(self.user_id),
+            WordListEntry.lemma_id,
+            literal(mark.status, VocabWord.status.type),
+            literal(updated_at, VocabWord.updated_at.type),
+            literal(change_seq),
+        ).where(*band)
+        insert = dialect_insert(self.session, VocabWord.__table__).from_select(
+            ["user_id", "lemma_id", "status", "updated_at", "change_seq"], words
+        )
+        upsert = insert.on_conflict_do_update(
+            index_elements=[VocabWord.user_id, VocabWord.lemma_id],
+            set_={
+                "status": insert.excluded.status,
+                "updated_at": insert.excluded.updated_at,
+                "change_seq": insert.excluded.change_seq,
+            },
+            where=and_(*changed),
+        )
+        result = await self.session.execute(upsert)
+        marked = result.rowcount
+
+        if marked:
+            deltas[mark.status] = deltas.get(mark.status, 0) + marked
+            await self.summary.update_summary(deltas, updated_at)
+            await self.commit_change(change_seq)
+        else:
+            await self.session.commit()
+        return marked
+
+    async def remove_word(self, word: VocabWord) -> None:
+        """
+        Remove an existing VocabWord record from the user's vocabulary.
+
+        Args:
+            word (VocabWord): VocabWord record to remove.
+        """
+        change_seq = await self.summary.next_change_seq()
+        insert = dialect_insert(self.session, VocabTombstone).values(
+            user_id=self.user_id, lemma_id=word.lemma_id, change_seq=change_seq
+        )
+        bury = insert.on_conflict_do_update(
+            index_elements=[VocabTombstone.user_id, VocabTombstone.lemma_id],
+            set_={"change_seq": insert.excluded.change_seq},
+        )
+        await self.session.execute(bury)
+        await self.session.delete(word)
+        await self.summary.update_summary({word.status: -1}, None)
+        await self.commit_change(change_seq)
+
+    async def get_changes(
+        self, after: Optional[Tuple[int, int]], limit: int
+    ) -> List[Tuple[str, Optional[str], Optional[datetime], int, int]]:
+        """
+        Retrieve the changes of the user's vocabulary in change sequence order.
+
+        Args:
+            after (Optional[Tuple[int, int]]): Change sequence number and lemma
+                identifier of the last change already retrieved, None to start
+                over.
+            limit (int): Maximum number of changes.
+
+        Returns:
+            List[Tuple[str, Optional[str], Optional[datetime], int, int]]:
+            Written form, status, update timestamp, change sequence number and
+            lemma identifier of each change, a removed word having no status nor
+            update timestamp.
+        """
+        words = select(
+            VocabWord.status,
+            VocabWord.updated_at,
+            VocabWord.change_seq,
+            VocabWord.lemma_id,
+        ).where(VocabWord.user_id == self.user_id)
+        tombstones = select(
+            null().cast(VocabWord.status.type).label("status"),
+            null().cast(VocabWord.updated_at.type).label("updated_at"),
+            VocabTombstone.change_seq,
+            VocabTombstone.lemma_id,
+        ).where(VocabTombstone.user_id == self.user_id)
+        if after is not None:
+            change_seq, lemma_id = after
+            words = words.where(
+                or_(
+                    VocabWord.change_seq > change_seq,
+                    and_(
+                        VocabWord.change_seq == change_seq,
+                        VocabWord.lemma_id > lemma_id,
+                    ),
+                )
+            )
+            tombstones = tombstones.where(
+                or_(
+                    VocabTombstone.change_seq > change_seq,
+                    and_(
+                        VocabTombstone.change_seq == change_seq,
+                        VocabTombstone.lemma_id > lemma_id,
+                    ),
+                )
+            )
+
+        # Bound each side by the page size before merging them
+        words_page = (
+            words.order_by(VocabWord.change_seq, VocabWord.lemma_id)
+            .limit(limit)
+            .subquery()
+        )
+        tombstones_page = (
+            tombstones.order_by(VocabTombstone.change_seq, VocabTombstone.lemma_id)
+            .limit(limit)
+            .subquery()
+        )
+        changes = union_all(select(words_page), select(tombstones_page)).subquery()
+        stmt = (
+            select(
+                select(Lemma.written)
+                .where(Lemma.id == changes.c.lemma_id)
+                .scalar_subquery(),
+                changes.c.status,
+                changes.c.updated_at,
+                changes.c.change_seq,
+                changes.c.lemma_id,
+            )
+            .order_by(changes.c.change_seq, changes.c.lemma_id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.tuples()]
+
+    async def get_status(
+        self, pending: Sequence[VocabWordSchema] = ()
+    ) -> VocStatusSchema:
+        """
+        Retrieve the user's vocabulary status.
+
+        Args:
+            pending (Sequence[VocabWordSchema]): Words put but not written yet,
+                accounted for as if they were.
+
+        Returns:
+            VocStatusSchema: Schema containing vocabulary status details.
+        """
+        summary = await self.summary.get_summary()
+        counts = {
+            status: getattr(summary, f"{status}_count") for status in VOCAB_STATUSES
+        }
+        last_update = summary.last_update
+
+        if pending:
+            stored = {
+                word.written: word.status
+                for word in await self.get_by_writtens([w.written for w in pending])
+            }
+            for word in pending:
+                counts[word.status] += 1
+                if word.written in stored:
+                    counts[stored[word.written]] -= 1
+                # Timestamps are stored in UTC without their time zone
+                updated_at = naive_utc(word.updated_at)
+                if last_update is None or updated_at > last_update:
+                    last_update = updated_at
+
+        status_count = sum(counts[status] for status in KNOWN_STATUSES)
+        if status_count != 0 and last_update is not None:
+            last_update_at = last_update
+        else:
+            last_update_at = datetime.fromtimestamp(0)
+        return VocStatusSchema(
+            status_count=status_count, counts=counts, last_update=last_update_at
+        )
+
+    async def clear_all(self) -> None:
+        """
+        Delete all vocabulary words for the user, leaving their tombstones.
+        """
+        change_seq = await self.summary.next_change_seq()
+        insert = dialect_insert(self.session, VocabTombstone).from_select(
+            ["user_id", "lemma_id", "change_seq"],
+            select(VocabWord.user_id, VocabWord.lemma_id, literal(change_seq)).where(
+                VocabWord.user_id == self.user_id
+            ),
+        )
+        bury = insert.on_conflict_do_update(
+            index_elements=[VocabTombstone.user_id, VocabTombstone.lemma_id],
+            set_={"change_seq": insert.excluded.change_seq},
+        )
+        await self.session.execute(bury)
+
+        remove = delete(VocabWord).where(VocabWord.user_id == self.user_id)
+        await self.session.execute(remove)
+        reset = (
+            update(VocabStatus)
+            .where(VocabStatus.user_id == self.user_id)
+            .values(
+                last_update=None,
+                **{f"{status}_count": 0 for status in VOCAB_STATUSES},
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(reset)
+        await self.commit_change(change_seq)
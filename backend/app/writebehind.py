@@ -0,0 +1,169 @@
+"""
+Module for coalescing bursts of vocabulary updates.
+
+Words put by a user within a short window are kept in memory, the last put of
+each word winning, then written in a single transaction. The pending words of
+a user are written before any of their vocabulary is read, and all of them are
+written on shutdown, so only a crash of the worker may lose the last window.
+"""
+
+import asyncio
+from typing import Dict, List
+
+from app.config import settings
+from app.logs import get_logger
+from app.metrics import metrics
+from app.schemas import VocabWordSchema
+from app.vocabulary import VocRepository
+from app.writer import voc_writer
+
+logger = get_logger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Buffer of the vocabulary words put by each user, written behind.
+    """
+
+    def __init__(self, enabled: bool, window: float, max_pending: int) -> None:
+        """
+        Initialize the WriteBehindBuffer.
+
+        Args:
+            enabled (bool): If False, words must be written by the caller.
+            window (float): Seconds a word is kept before being written.
+            max_pending (int): Maximum number of pending words of a user, more
+                being written at once.
+        """
+        self.enabled = enabled
+        self.window = window
+        self.max_pending = max_pending
+        self.pending: Dict[int, Dict[str, VocabWordSchema]] = {}
+        self.timers: Dict[int, "asyncio.Task[None]"] = {}
+        # The flushes of a user are run one at a time, so that a read waits for
+        # the write in flight, voc_writer serializing those of all users
+        self.locks: Dict[int, asyncio.Lock] = {}
+        self.flushing: Dict[int, int] = {}
+
+    def get_pending(self, user_id: int) -> List[VocabWordSchema]:
+        """
+        Retrieve the words of a user not written yet.
+
+        Args:
+            user_id (int): User identifier.
+
+        Returns:
+            List[VocabWordSchema]: Pending words.
+        """
+        return list(self.pending.get(user_id, {}).values())
+
+    async def put(self, user_id: int, word: VocabWordSchema) -> None:
+        """
+        Put a word, to be written once the window of the user elapsed.
+
+        Args:
+            user_id (int): User identifier.
+            word (VocabWordSchema): Word to put.
+        """
+        pending = self.pending.setdefault(user_id, {})
+        pending[word.written] = word
+        metrics.increment("write_behind.puts")
+
+        if len(pending) >= self.max_pending:
+            await self.flush(user_id)
+        elif user_id not in self.timers:
+            self.timers[user_id] = asyncio.create_task(self.flush_later(user_id))
+
+    async def flush_later(self, user_id: int) -> None:
+        """
+        Write the pending words of a user once the window elapsed.
+
+        Args:
+            user_id (int): User identifier.
+        """
+        await asyncio.sleep(self.window)
+        self.timers.pop(user_id, None)
+        try:
+            await self.flush(user_id)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Failed to write the vocabulary of user {}", user_id)
+
+            # The words were put back, retry after another window
+            if user_id in self.pending and user_id not in self.timers:
+                self.timers[user_id] = asyncio.create_task(self.flush_later(user_id))
+
+    async def flush(self, user_id: int) -> None:
+        """
+        Write the pending words of a user, waiting for a write in flight.
+
+        Args:
+            user_id (int): User identifier.
+
+        Raises:
+            Exception: If the words cannot be written, in which case they are
+                kept pending.
+        """
+        timer = self.timers.pop(user_id, None)
+        if timer is not None:
+            timer.cancel()
+
+        if user_id not in self.pending and user_id not in self.locks:
+            # Nothing to write nor being written, as for most reads
+            return
+
+        lock = self.locks.setdefault(user_id, asyncio.Lock())
+        self.flushing[user_id] = self.flushing.get(user_id, 0) + 1
+        try:
+            async with lock:
+                await self.write(user_id)
+        finally:
+            self.flushing[user_id] -= 1
+            if not self.flushing[user_id]:
+                del self.flushing[user_id]
+                del self.locks[user_id]
+
+    async def write(self, user_id: int) -> None:
+        """
+        Write the pending words of a user, holding the lock of the user.
+
+        Args:
+            user_id (int): User identifier.
+
+        Raises:
+            Exception: If the words cannot be written, in which case they are
+                kept pending.
+        """
+        words = self.pending.pop(user_id, None)
+        if not words:
+            return
+        values = list(words.values())
+        try:
+            await voc_writer.run(
+                lambda session: VocRepository(session, user_id).put_words(values)
+            )
+        except Exception:
+            metrics.increment("write_behind.errors")
+            # Words put meanwhile are newer and win
+            words.update(self.pending.get(user_id, {}))
+            self.pending[user_id] = words
+            raise
+        metrics.increment("write_behind.flushes")
+        metrics.observe("write_behind.flush_words", len(words))
+
+    async def flush_all(self) -> None:
+        """
+        Write the pending words of every user.
+        """
+        for user_id in list(self.pending):
+            try:
+                await self.flush(user_id)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Failed to write the vocabulary of user {}", user_id)
+
+
+# Shared buffer of the worker
+voc_write_behind = WriteBehindBuffer(
+    enabled=settings.VOC_WRITE_BEHIND_ENABLED,
+    window=settings.VOC_WRITE_BEHIND_WINDOW_MS / 1000,
+    max_pending=settings.VOC_WRITE_BEHIND_MAX_PENDING,
+)
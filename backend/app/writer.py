@@ -0,0 +1,141 @@
+"""
+Module for serializing the vocabulary writes of the worker.
+
+SQLite has a single writer at a time, so concurrent write transactions wait
+for each other's lock and fail once the busy timeout elapsed. The writes are
+instead queued and run one after the other by a single task, on a connection
+of its own. The writes queued meanwhile are run as savepoints of one
+transaction, committed at once.
+
+With other backends, which have concurrent writers, each write is run in its
+own session right away.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.databases.main_db import IS_SQLITE, SessionLocal, write_engine
+from app.logs import get_logger
+from app.metrics import metrics
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Write run with a session, whose commits are committed with its group
+WriteJob = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class SerialWriter:
+    """
+    Queue of the writes of the worker, run by a single task with group commits.
+    """
+
+    def __init__(self, enabled: bool, max_group: int) -> None:
+        """
+        Initialize the SerialWriter.
+
+        Args:
+            enabled (bool): If False, writes are run at once in their own
+                session.
+            max_group (int): Maximum number of writes committed at once.
+        """
+        self.enabled = enabled
+        self.max_group = max_group
+        self.jobs: Deque[Tuple[WriteJob, "asyncio.Future[Any]"]] = deque()
+        self.task: Optional["asyncio.Task[None]"] = None
+
+    async def run(self, job: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """
+        Run a write, once the writes queued before it are committed.
+
+        The session given to the write may be shared by a group of writes, its
+        commits then being savepoints of the group transaction. Callbacks
+        appended to its "after_commit" info are called once the group is
+        committed.
+
+        Args:
+            job (Callable[[AsyncSession], Awaitable[T]]): Write to run.
+
+        Returns:
+            T: Result of the write, once committed.
+        """
+        if not self.enabled:
+            async with SessionLocal() as session:
+                return await job(session)
+
+        future: "asyncio.Future[T]" = asyncio.get_running_loop().create_future()
+        self.jobs.append((job, future))
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.process())
+        return await future
+
+    async def process(self) -> None:
+        """
+        Run the queued writes by groups until the queue is empty.
+        """
+        while self.jobs:
+            group: List[Tuple[WriteJob, "asyncio.Future[Any]"]] = []
+            while self.jobs and len(group) < self.max_group:
+                group.append(self.jobs.popleft())
+            await self.write(group)
+
+    async def write(self, group: List[Tuple[WriteJob, "asyncio.Future[Any]"]]) -> None:
+        """
+        Run a group of writes in a single transaction, each one in a savepoint
+        so that a failed write does not fail the others.
+
+        Args:
+            group (List[Tuple[WriteJob, asyncio.Future[Any]]]): Writes to run,
+                with the future of their result.
+        """
+        results: List[Tuple["asyncio.Future[Any]", Any, Optional[BaseException]]] = []
+        after_commit: List[Callable[[], None]] = []
+        try:
+            async with write_engine.connect() as connection:
+                await connection.begin()
+                for job, future in group:
+                    # The caller is gone before its write started
+                    if future.cancelled():
+                        continue
+                    session = AsyncSession(
+                        bind=connection,
+                        join_transaction_mode="create_savepoint",
+                        autoflush=False,
+                        expire_on_commit=False,
+                        info={"after_commit": after_commit},
+                    )
+                    try:
+                        async with session:
+                            results.append((future, await job(session), None))
+                    except Exception as e:  # pylint: disable=broad-exception-caught
+                        metrics.increment("writer.errors")
+                        results.append((future, None, e))
+                await connection.commit()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.exception("Failed to commit {} vocabulary writes", len(group))
+            metrics.increment("writer.errors")
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        metrics.increment("writer.groups")
+        metrics.observe("writer.group_writes", len(results))
+        for callback in after_commit:
+            callback()
+        for future, result, error in results:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+# Shared writer of the worker
+voc_writer = SerialWriter(enabled=IS_SQLITE, max_group=settings.VOC_WRITER_MAX_GROUP)
@@ -0,0 +1,251 @@
+"""
+Stress test of the vocabulary writes, under hundreds of concurrent writers.
+
+Starts the backend on a local port, then has each writer put words, put
+batches of words and clear the vocabulary of its user through the API while
+readers read vocabulary statuses, for a fixed duration. Run from the backend
+directory, against a scratch main database of DATABASE_MAIN_URL, as users are
+added to it:
+
+    python -m benchmarks.concurrent_writes --writers 300 --readers 30
+"""
+
+import argparse
+import asyncio
+import random
+import subprocess
+import sys
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+import jwt
+
+import app.models  # pylint: disable=unused-import
+from app.config import settings
+from app.databases.main_db import SessionLocal, close_db, init_db
+from app.repository import UserRepository
+
+
+class Stats:
+    """
+    Latencies and failures of the requests of a kind.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the Stats.
+        """
+        self.latencies: List[float] = []
+        self.failures: Dict[str, int] = {}
+
+    def add(self, start: float, failure: str = "") -> None:
+        """
+        Account for a request.
+
+        Args:
+            start (float): Start of the request, from time.perf_counter.
+            failure (str): Status code or error of a failed request, empty if
+                it succeeded.
+        """
+        self.latencies.append((time.perf_counter() - start) * 1000)
+        if failure:
+            self.failures[failure] = self.failures.get(failure, 0) + 1
+
+    def summary(self, seconds: float) -> str:
+        """
+        Summarize the requests.
+
+        Args:
+            seconds (float): Duration of the run.
+
+        Returns:
+            str: Throughput, failures and latency percentiles.
+        """
+        latencies = sorted(self.latencies) or [0.0]
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[int(len(latencies) * 0.99)]
+        failed = sum(self.failures.values())
+        causes = f" {self.failures}" if self.failures else ""
+        return (
+            f"{len(self.latencies) / seconds:6.0f}/s, {failed} failed{causes}, "
+            f"p50 {p50:.0f} ms, p99 {p99:.0f} ms"
+        )
+
+
+async def create_tokens(users: int) -> List[str]:
+    """
+    Create users, and their session tokens.
+
+    Args:
+        users (int): Number of users.
+
+    Returns:
+        List[str]: Session token of each user.
+    """
+    await init_db()
+    prefix = f"benchmark-{uuid.uuid4()}"
+    async with SessionLocal() as session:
+        for i in range(users):
+            name = f"{prefix}-{i}"
+            await UserRepository(session).create_with_google(
+                name, f"{name}@example.com", name
+            )
+    await close_db()
+    return [
+        jwt.encode(
+            {"google_id": f"{prefix}-{i}"}, settings.AUTH_SECRET, algorithm="HS256"
+        )
+        for i in range(users)
+    ]
+
+
+async def write(
+    client: httpx.AsyncClient, token: str, seed: int, deadline: float, stats: Stats
+) -> None:
+    """
+    Write the vocabulary of a user until the deadline.
+
+    Args:
+        client (httpx.AsyncClient): Client of the backend.
+        token (str): Session token of the user.
+        seed (int): Seed of the writes.
+        deadline (float): End of the run, from time.perf_counter.
+        stats (Stats): Stats of the writes.
+    """
+    rng = random.Random(seed)
+    cookies = {"auth_session": token}
+    while time.perf_counter() < deadline:
+        kind = rng.choices(["put", "batch", "clear"], (80, 19, 1))[0]
+        word = {"status": "seen", "updated_at": "2024-01-01T00:00:00Z"}
+        start = time.perf_counter()
+        try:
+            if kind == "put":
+                response = await client.put(
+                    "/user/voc",
+                    cookies=cookies,
+                    json={**word, "written": f"단어{rng.randrange(5000)}"},
+                )
+            elif kind == "batch":
+                response = await client.put(
+                    "/user/voc/batch",
+                    cookies=cookies,
+                    json=[
+                        {**word, "written": f"단어{rng.randrange(5000)}"}
+                        for _ in range(20)
+                    ],
+                )
+            else:
+                response = await client.delete("/user/voc", cookies=cookies)
+        except httpx.HTTPError as e:
+            stats.add(start, type(e).__name__)
+            continue
+        stats.add(start, "" if response.is_success else str(response.status_code))
+
+
+async def read(
+    client: httpx.AsyncClient,
+    tokens: List[str],
+    seed: int,
+    deadline: float,
+    stats: Stats,
+) -> None:
+    """
+    Read the vocabulary statuses of random users until the deadline.
+
+    Args:
+        client (httpx.AsyncClient): Client of the backend.
+        tokens (List[str]): Session tokens of the users.
+        seed (int): Seed of the reads.
+        deadline (float): End of the run, from time.perf_counter.
+        stats (Stats): Stats of the reads.
+    """
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        cookies = {"auth_session": rng.choice(tokens)}
+        start = time.perf_counter()
+        try:
+            response = await client.get("/user/voc/status", cookies=cookies)
+        except httpx.HTTPError as e:
+            stats.add(start, type(e).__name__)
+            continue
+        stats.add(start, "" if response.is_success else str(response.status_code))
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float) -> None:
+    """
+    Wait for the backend to answer.
+
+    Args:
+        client (httpx.AsyncClient): Client of the backend.
+        timeout (float): Maximum number of seconds to wait.
+
+    Raises:
+        TimeoutError: If the backend does not answer in time.
+    """
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            await client.get("/docs")
+            return
+        except httpx.HTTPError:
+            await asyncio.sleep(0.2)
+    raise TimeoutError("The backend did not start")
+
+
+async def run(args: argparse.Namespace, tokens: List[str]) -> None:
+    """
+    Run the writers and readers against the started backend.
+
+    Args:
+        args (argparse.Namespace): Arguments of the benchmark.
+        tokens (List[str]): Session tokens of the writers.
+    """
+    limits = httpx.Limits(max_connections=args.writers + args.readers)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{args.port}", timeout=60, limits=limits
+    ) as client:
+        await wait_ready(client, 60)
+        writes, reads = Stats(), Stats()
+        deadline = time.perf_counter() + args.seconds
+        await asyncio.gather(
+            *(
+                write(client, token, n, deadline, writes)
+                for n, token in enumerate(tokens)
+            ),
+            *(read(client, tokens, -n, deadline, reads) for n in range(args.readers)),
+        )
+    print(f"{args.writers} writers: writes {writes.summary(args.seconds)}")
+    print(f"{args.readers} readers: reads  {reads.summary(args.seconds)}")
+
+
+def main() -> None:
+    """
+    Parse the arguments and run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Stress the vocabulary writes.")
+    parser.add_argument("--writers", type=int, default=300)
+    parser.add_argument("--readers", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8791)
+    args = parser.parse_args()
+
+    tokens = asyncio.run(create_tokens(args.writers))
+    with subprocess.Popen(
+        [
+            sys.executable,
+            *("-m", "uvicorn", "app.main:app", "--log-level", "error"),
+            *("--port", str(args.port), "--workers", str(args.workers)),
+            *("--backlog", "4096"),
+        ]
+    ) as server:
+        try:
+            asyncio.run(run(args, tokens))
+        finally:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark of the authenticated user cache, in time per request.
+
+Requests /user/me as a user, once with the user resolved from the database on
+each request and once from the cache. Run from the backend directory, against
+a scratch main database of DATABASE_MAIN_URL, as a user is added to it:
+
+    python -m benchmarks.user_cache --requests 1000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import jwt
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.models  # pylint: disable=unused-import
+from app.cache import user_cache
+from app.config import settings
+from app.databases.main_db import SessionLocal, close_db, init_db
+from app.repository import UserRepository
+from app.routes import user
+
+
+async def create_token() -> str:
+    """
+    Create a user, and its session token.
+
+    Returns:
+        str: Session token of the user.
+    """
+    await init_db()
+    google_id = f"benchmark-{uuid.uuid4()}"
+    async with SessionLocal() as session:
+        await UserRepository(session).create_with_google(
+            google_id, f"{google_id}@example.com", google_id
+        )
+    await close_db()
+    return jwt.encode({"google_id": google_id}, settings.AUTH_SECRET, algorithm="HS256")
+
+
+def run_requests(client: TestClient, requests: int, cached: bool) -> float:
+    """
+    Request the authenticated user repeatedly.
+
+    Args:
+        client (TestClient): Client of the user routes, with a session cookie.
+        requests (int): Number of requests.
+        cached (bool): Whether the user is kept in the cache between requests.
+
+    Returns:
+        float: Elapsed seconds.
+    """
+    # Warm up the connection pool and the statement caches
+    for _ in range(10):
+        client.get("/user/me").raise_for_status()
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        if not cached:
+            user_cache.clear()
+        client.get("/user/me").raise_for_status()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """
+    Parse the arguments and run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the user cache.")
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    token = asyncio.run(create_token())
+    user_app = FastAPI()
+    user_app.include_router(user.router)
+    with TestClient(user_app) as client:
+        client.cookies.set("auth_session", token)
+        for cached in (False, True):
+            elapsed = run_requests(client, args.requests, cached)
+            print(
+                f"cached={cached}: {elapsed * 1000 / args.requests:.2f} ms per request"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark of the bulk vocabulary upserts, by batch size.
+
+Puts batches of new words in the vocabulary of a new user, then puts them
+again with another status. Run from the backend directory, against a scratch
+main database of DATABASE_MAIN_URL, as users are added to it:
+
+    python -m benchmarks.vocabulary_upserts --sizes 100 1000 10000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+import app.models  # pylint: disable=unused-import
+from app.databases.main_db import SessionLocal, close_db, init_db
+from app.repository import UserRepository
+from app.schemas import VocabWordSchema
+from app.vocabulary import VocRepository
+
+
+def make_words(size: int, status: str) -> List[VocabWordSchema]:
+    """
+    Build a batch of distinct vocabulary words.
+
+    Args:
+        size (int): Number of words.
+        status (str): Status of the words.
+
+    Returns:
+        List[VocabWordSchema]: Vocabulary words.
+    """
+    base = datetime(2024, 1, 1)
+    return [
+        VocabWordSchema(
+            written=f"단어{i}", status=status, updated_at=base + timedelta(seconds=i)
+        )
+        for i in range(size)
+    ]
+
+
+async def main() -> None:
+    """
+    Parse the arguments and run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the vocabulary upserts.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    await init_db()
+    for size in args.sizes:
+        async with SessionLocal() as session:
+            name = f"benchmark-{uuid.uuid4()}"
+            user = await UserRepository(session).create_with_google(
+                name, f"{name}@example.com", name
+            )
+
+        timings = []
+        for status in ("seen", "learned"):
+            words = make_words(size, status)
+            async with SessionLocal() as session:
+                start = time.perf_counter()
+                await VocRepository(session, user.id).put_words(words)
+                timings.append((time.perf_counter() - start) * 1000)
+        print(f"size={size:6} insert {timings[0]:8.1f} ms, update {timings[1]:8.1f} ms")
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""
+Benchmark of the dictionary word lookups, in time and allocations.
+
+Looks up random batches of written forms of the dictionary with their senses,
+as the analysis does. Run from the backend directory, against the dictionary
+database of DATABASE_DICT_URL:
+
+    python -m benchmarks.word_lookups --lookups 100 --size 20
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from app.databases.dict_db import SessionLocal
+from app.repository import WordOptions, WordRepository
+
+
+async def run_lookups(
+    queries: List[List[str]], options: WordOptions
+) -> Tuple[float, int, int]:
+    """
+    Run the lookups once for timing, then once again under tracemalloc.
+
+    Args:
+        queries (List[List[str]]): Written forms of each lookup.
+        options (WordOptions): Parts of the words to include.
+
+    Returns:
+        Tuple[float, int, int]: Elapsed seconds, peak traced bytes and number of
+        allocated blocks alive at the end of the lookups.
+    """
+
+    async def lookups() -> None:
+        for writtens in queries:
+            async with SessionLocal() as session:
+                await WordRepository(session).get_by_writtens(writtens, options)
+
+    # Warm up the connection pool and the statement caches
+    await lookups()
+
+    start = time.perf_counter()
+    await lookups()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    await lookups()
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    return elapsed, peak, blocks
+
+
+async def main() -> None:
+    """
+    Parse the arguments and run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the word lookups.")
+    parser.add_argument("--lookups", type=int, default=100)
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--language", default="fr_FR")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    async with SessionLocal() as session:
+        writtens = list(await WordRepository(session).get_all_writtens())
+    rng = random.Random(args.seed)
+    queries = [rng.sample(writtens, args.size) for _ in range(args.lookups)]
+
+    for senses in (False, True):
+        options = WordOptions(senses=senses, language=args.language)
+        elapsed, peak, blocks = await run_lookups(queries, options)
+        print(
+            f"senses={senses}: {elapsed * 1000 / args.lookups:.2f} ms per lookup, "
+            f"peak {peak / 1024:.0f} KiB, {blocks} live blocks"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""
+Benchmark of the lookups of large written form lists, by list size.
+
+Half of each list are written forms of the dictionary, half are missing from
+it, as for a long text. Run from the backend directory, against the dictionary
+database of DATABASE_DICT_URL:
+
+    python -m benchmarks.writtens_lookup --sizes 100 1000 10000 30000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.databases.dict_db import SessionLocal
+from app.repository import WordOptions, WordRepository
+
+
+async def main() -> None:
+    """
+    Parse the arguments and run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the writtens lookups.")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 5000, 10000, 30000]
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    async with SessionLocal() as session:
+        writtens = list(await WordRepository(session).get_all_writtens())
+
+    for size in args.sizes:
+        found = min(size // 2, len(writtens))
+        query = rng.sample(writtens, found)
+        query += [f"없음{i}" for i in range(size - found)]
+        rng.shuffle(query)
+        for senses in (False, True):
+            async with SessionLocal() as session:
+                start = time.perf_counter()
+                words = await WordRepository(session).get_by_writtens(
+                    query, WordOptions(senses=senses)
+                )
+                elapsed = time.perf_counter() - start
+            print(
+                f"size={size:6} senses={senses!s:5} {elapsed * 1000:8.1f} ms "
+                f"({len(words)} words)"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,149 @@
+"""
+Shared configuration of the backend tests.
+"""
+
+import os
+import tempfile
+import uuid
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+import jwt
+import pytest
+
+# Settings are read when the app is imported, the tests use their own databases
+TEST_DIR = tempfile.mkdtemp(prefix="dicorago-tests-")
+os.environ["DATABASE_MAIN_URL"] = f"sqlite+aiosqlite:///{TEST_DIR}/main.db"
+os.environ["DATABASE_DICT_URL"] = f"sqlite+aiosqlite:///{TEST_DIR}/krdict.db"
+os.environ.setdefault("GOOGLE_CLIENT_ID", "google-client")
+os.environ.setdefault("APPLE_CLIENT_ID", "apple-client")
+os.environ.setdefault("AUTH_SECRET", "secret")
+os.environ.setdefault("MIN_VERSION_IOS", "0")
+os.environ.setdefault("MIN_VERSION_ANDROID", "0")
+
+# pylint: disable=wrong-import-position
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.models  # pylint: disable=unused-import
+from app.config import settings
+from app.databases import main_db
+from app.models.user import VocabStatus
+from app.repository import UserRepository
+from app.routes import user
+from app.schemas import VOCAB_STATUSES
+from app.vocabulary import VocSummaryRepository
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """
+    Run the async tests on asyncio, the event loop of the app.
+
+    Returns:
+        str: Name of the anyio backend.
+    """
+    return "asyncio"
+
+
+@pytest.fixture(name="client")
+def fixture_client() -> Iterator[TestClient]:
+    """
+    Serve the user routes on the test main database, the analysis routes
+    needing khaiii.
+
+    Yields:
+        TestClient: Client of the user routes.
+    """
+    user_app = FastAPI()
+    user_app.include_router(user.router)
+    user_app.add_event_handler("startup", main_db.init_db)
+    with TestClient(user_app) as client:
+        yield client
+
+
+@pytest.fixture(name="create_user")
+def fixture_create_user(client: TestClient) -> Callable[[str], int]:
+    """
+    Provide the creation of users signed in with Google.
+
+    Args:
+        client (TestClient): Client of the user routes.
+
+    Returns:
+        Callable[[str], int]: Creation of a user from its Google identifier,
+        returning the user identifier.
+    """
+
+    def create_user(google_id: str) -> int:
+        async def create() -> int:
+            async with main_db.SessionLocal() as session:
+                created = await UserRepository(session).create_with_google(
+                    google_id, f"{google_id}@example.com", google_id
+                )
+                return created.id
+
+        assert client.portal is not None
+        user_id: int = client.portal.call(create)
+        return user_id
+
+    return create_user
+
+
+@pytest.fixture(name="user_id")
+def fixture_user_id(client: TestClient, create_user: Callable[[str], int]) -> int:
+    """
+    Create a user, authenticated by the session cookie of the client.
+
+    Args:
+        client (TestClient): Client of the user routes.
+        create_user (Callable[[str], int]): Creation of a user.
+
+    Returns:
+        int: User identifier.
+    """
+    google_id = f"google-{uuid.uuid4()}"
+    user_id = create_user(google_id)
+    client.cookies.set(
+        "auth_session",
+        jwt.encode({"google_id": google_id}, settings.AUTH_SECRET, algorithm="HS256"),
+    )
+    return user_id
+
+
+@pytest.fixture(name="read_summaries")
+def fixture_read_summaries(
+    client: TestClient,
+) -> Callable[[int], Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Provide the reading of the vocabulary status summary of users, as
+    maintained along with the writes and as computed from the words.
+
+    Args:
+        client (TestClient): Client of the user routes.
+
+    Returns:
+        Callable[[int], Tuple[Dict[str, Any], Dict[str, Any]]]: Reading of the
+        status counts and last update of the maintained and computed summaries
+        of a user.
+    """
+
+    def values(summary: VocabStatus) -> Dict[str, Any]:
+        counts = {
+            status: getattr(summary, f"{status}_count") for status in VOCAB_STATUSES
+        }
+        return {**counts, "last_update": summary.last_update}
+
+    def read_summaries(user_id: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        async def read() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+            async with main_db.SessionLocal() as session:
+                summaries = VocSummaryRepository(session, user_id)
+                return (
+                    values(await summaries.get_summary()),
+                    values(await summaries.compute_summary()),
+                )
+
+        assert client.portal is not None
+        summaries: Tuple[Dict[str, Any], Dict[str, Any]] = client.portal.call(read)
+        return summaries
+
+    return read_summaries
@@ -0,0 +1,166 @@
+"""
+Stress test of the vocabulary writes, under concurrent writers and readers.
+
+Scaled down by default, the number of writers and of writes of each writer are
+raised with the STRESS_WRITERS and STRESS_WRITES environment variables:
+
+    STRESS_WRITERS=300 STRESS_WRITES=50 python -m pytest tests/test_concurrent_writes.py
+"""
+
+import asyncio
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+import jwt
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.databases import main_db
+from app.vocabulary import VocRepository
+
+WRITERS = int(os.environ.get("STRESS_WRITERS", "20"))
+WRITES = int(os.environ.get("STRESS_WRITES", "15"))
+STATUSES = ("learned", "seen", "ignore")
+
+
+async def write(
+    client: httpx.AsyncClient, token: str, seed: int, errors: List[str]
+) -> Dict[str, str]:
+    """
+    Put words, put batches of words and clear the vocabulary of a user.
+
+    Args:
+        client (httpx.AsyncClient): Client of the user routes.
+        token (str): Session token of the user.
+        seed (int): Seed of the writes.
+        errors (List[str]): Errors of the failed requests, appended to.
+
+    Returns:
+        Dict[str, str]: Status of each written form once written.
+    """
+    rng = random.Random(seed)
+    headers = {"Cookie": f"auth_session={token}"}
+    vocabulary: Dict[str, str] = {}
+    updated_at = datetime(2024, 1, 1)
+    for _ in range(WRITES):
+        updated_at += timedelta(seconds=1)
+        words = [
+            {
+                "written": f"단어{rng.randrange(20)}",
+                "status": rng.choice(STATUSES),
+                "updated_at": updated_at.isoformat(),
+            }
+            for _ in range(rng.choice((1, 1, 5)))
+        ]
+        kind = rng.choices(["put", "batch", "clear"], (60, 35, 5))[0]
+        try:
+            if kind == "put":
+                response = await client.put("/user/voc", headers=headers, json=words[0])
+                words = words[:1]
+            elif kind == "batch":
+                response = await client.put(
+                    "/user/voc/batch", headers=headers, json=words
+                )
+            else:
+                response = await client.delete("/user/voc", headers=headers)
+                words = []
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            errors.append(repr(e))
+            continue
+        if not response.is_success:
+            errors.append(f"{response.status_code} {response.text}")
+            continue
+
+        if kind == "clear":
+            vocabulary.clear()
+        for word in words:
+            vocabulary[word["written"]] = word["status"]
+    return vocabulary
+
+
+async def read(client: httpx.AsyncClient, tokens: List[str], errors: List[str]) -> None:
+    """
+    Read the vocabulary statuses of the users, alongside the writes.
+
+    Args:
+        client (httpx.AsyncClient): Client of the user routes.
+        tokens (List[str]): Session tokens of the users.
+        errors (List[str]): Errors of the failed requests, appended to.
+    """
+    for token in tokens:
+        try:
+            response = await client.get(
+                "/user/voc/status", headers={"Cookie": f"auth_session={token}"}
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            errors.append(repr(e))
+            continue
+        if not response.is_success:
+            errors.append(f"{response.status_code} {response.text}")
+
+
+async def get_statuses(user_id: int) -> Dict[str, str]:
+    """
+    Read the written vocabulary of a user.
+
+    Args:
+        user_id (int): User identifier.
+
+    Returns:
+        Dict[str, str]: Status of each written form.
+    """
+    async with main_db.SessionLocal() as session:
+        return await VocRepository(session, user_id).get_statuses()
+
+
+def test_concurrent_writes(
+    client: TestClient,
+    create_user: Callable[[str], int],
+    read_summaries: Callable[[int], Tuple[Dict[str, Any], Dict[str, Any]]],
+) -> None:
+    """
+    Concurrent writers never fail on a locked database, and leave the words and
+    status counts of each user as written.
+    """
+    google_ids = [f"google-{uuid.uuid4()}" for _ in range(WRITERS)]
+    user_ids = [create_user(google_id) for google_id in google_ids]
+    tokens = [
+        jwt.encode({"google_id": google_id}, settings.AUTH_SECRET, algorithm="HS256")
+        for google_id in google_ids
+    ]
+    errors: List[str] = []
+
+    async def run() -> List[Dict[str, str]]:
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as stress_client:
+            vocabularies, _ = await asyncio.gather(
+                asyncio.gather(
+                    *(
+                        write(stress_client, token, seed, errors)
+                        for seed, token in enumerate(tokens)
+                    )
+                ),
+                asyncio.gather(
+                    *(
+                        read(stress_client, tokens, errors)
+                        for _ in range(WRITERS // 10 + 1)
+                    )
+                ),
+            )
+        return vocabularies
+
+    assert client.portal is not None
+    vocabularies = client.portal.call(run)
+
+    assert not [error for error in errors if "database is locked" in error]
+    assert not errors
+    for user_id, vocabulary in zip(user_ids, vocabularies):
+        assert client.portal.call(get_statuses, user_id) == vocabulary
+        maintained, computed = read_summaries(user_id)
+        assert maintained == computed
@@ -0,0 +1,232 @@
+"""
+Tests of the identity provider key sets cache, against a stand-in provider.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app import jwks
+from app.config import settings
+from app.jwks import JWKSCache, parse_max_age
+from app.metrics import metrics
+
+CERTS_URL = "https://provider.test/certs"
+
+
+def make_jwk(kid: str) -> Dict[str, Any]:
+    """
+    Generate the public JWK of a new RSA key.
+
+    Args:
+        kid (str): Key ID.
+
+    Returns:
+        Dict[str, Any]: Public JWK.
+    """
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk: Dict[str, Any] = json.loads(
+        jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key())
+    )
+    jwk["kid"] = kid
+    return jwk
+
+
+class Provider:
+    """
+    Stand-in identity provider serving a key set.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the Provider with a single key and a max-age of 1000s.
+        """
+        self.jwks = [make_jwk("k1")]
+        self.cache_control = "public, max-age=1000"
+        self.status_code = 200
+        self.requests = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """
+        Answer a key set request.
+
+        Args:
+            request (httpx.Request): Request of the cache.
+
+        Returns:
+            httpx.Response: Key set, or the configured error.
+        """
+        assert str(request.url) == CERTS_URL
+        self.requests += 1
+        if self.status_code != 200:
+            return httpx.Response(self.status_code)
+        return httpx.Response(
+            200,
+            json={"keys": self.jwks},
+            headers={"Cache-Control": self.cache_control},
+        )
+
+
+class Clock:
+    """
+    Monotonic clock moved by the tests.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the Clock at an arbitrary time.
+        """
+        self.now = 10000.0
+
+    def __call__(self) -> float:
+        """
+        Read the clock.
+
+        Returns:
+            float: Current time in seconds.
+        """
+        return self.now
+
+
+@pytest.fixture(name="provider")
+async def fixture_provider() -> AsyncIterator[Provider]:
+    """
+    Serve the key sets of the shared HTTP client from a stand-in provider.
+
+    Yields:
+        Provider: Stand-in provider.
+    """
+    provider = Provider()
+    jwks.http_client = httpx.AsyncClient(transport=httpx.MockTransport(provider.handle))
+    yield provider
+    await jwks.close_http_client()
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    """
+    Replace the monotonic clock of the cache.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Patcher of the clock.
+
+    Returns:
+        Clock: Clock of the cache.
+    """
+    clock = Clock()
+    monkeypatch.setattr("app.jwks.time.monotonic", clock)
+    return clock
+
+
+def test_parse_max_age() -> None:
+    """
+    The freshness lifetime follows the Cache-Control directives.
+    """
+    assert parse_max_age("public, max-age=19800, must-revalidate") == 19800
+    assert parse_max_age('max-age="60"') == 60
+    assert parse_max_age("no-cache, max-age=60") == 0
+    assert parse_max_age("public") == settings.JWKS_DEFAULT_MAX_AGE
+    assert parse_max_age(None) == settings.JWKS_DEFAULT_MAX_AGE
+
+
+@pytest.mark.anyio
+async def test_keys_cached_for_max_age(provider: Provider, clock: Clock) -> None:
+    """
+    Keys are served from the cache until their max-age elapses.
+    """
+    cache = JWKSCache("test_max_age", CERTS_URL)
+    assert await cache.get_key("k1") is not None
+    assert provider.requests == 1
+
+    clock.now += 500
+    assert await cache.get_key("k1") is not None
+    assert provider.requests == 1
+
+    clock.now += 501
+    assert await cache.get_key("k1") is not None
+    assert provider.requests == 2
+    assert metrics.values["jwks.test_max_age.fetches"] == 2
+
+
+@pytest.mark.anyio
+async def test_keys_refreshed_in_background(provider: Provider, clock: Clock) -> None:
+    """
+    Keys close to their expiry are served while being refreshed.
+    """
+    cache = JWKSCache("test_background", CERTS_URL)
+    await cache.get_key("k1")
+
+    clock.now += 1000 - settings.JWKS_REFRESH_MARGIN / 2
+    assert await cache.get_key("k1") is not None
+    assert cache.refresh_task is not None
+    await cache.refresh_task
+    assert provider.requests == 2
+    assert cache.expires_at == clock.now + 1000
+
+
+@pytest.mark.anyio
+async def test_unknown_kid_refetches(provider: Provider, clock: Clock) -> None:
+    """
+    A rotated key is fetched on first use, at most once per refresh interval.
+    """
+    cache = JWKSCache("test_unknown_kid", CERTS_URL)
+    await cache.get_key("k1")
+    provider.jwks = provider.jwks + [make_jwk("k2")]
+
+    # Fetched too recently, forged kids must not flood the provider
+    assert await cache.get_key("k2") is None
+    assert provider.requests == 1
+
+    clock.now += settings.JWKS_MIN_REFRESH_INTERVAL
+    assert await cache.get_key("k2") is not None
+    assert provider.requests == 2
+    assert metrics.values["jwks.test_unknown_kid.unknown_kid"] == 1
+
+    # Both keys are served from the cache now
+    assert await cache.get_key("k1") is not None
+    assert provider.requests == 2
+
+
+@pytest.mark.anyio
+async def test_failed_fetch_keeps_last_keys(provider: Provider, clock: Clock) -> None:
+    """
+    Keys of the last successful fetch are kept while the provider fails.
+    """
+    cache = JWKSCache("test_fallback", CERTS_URL)
+    key = await cache.get_key("k1")
+    provider.status_code = 503
+
+    clock.now += 1001
+    assert await cache.get_key("k1") is key
+    assert provider.requests == 2
+    assert metrics.values["jwks.test_fallback.errors"] == 1
+
+    # The failure is not retried before the refresh interval, even in background
+    clock.now += settings.JWKS_MIN_REFRESH_INTERVAL / 2
+    assert await cache.get_key("k1") is key
+    await asyncio.sleep(0)
+    assert provider.requests == 2
+
+    provider.status_code = 200
+    provider.jwks = [make_jwk("k3")]
+    clock.now += settings.JWKS_MIN_REFRESH_INTERVAL
+    assert await cache.get_key("k3") is not None
+    assert await cache.get_key("k1") is None
+    assert provider.requests == 3
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_share_one_fetch(provider: Provider) -> None:
+    """
+    Concurrent lookups on a cold cache share a single fetch.
+    """
+    cache = JWKSCache("test_concurrent", CERTS_URL)
+    keys = await asyncio.gather(*(cache.get_key("k1") for _ in range(5)))
+    assert all(key is keys[0] for key in keys)
+    assert keys[0] is not None
+    assert provider.requests == 1
@@ -0,0 +1,121 @@
+"""
+Tests of the typo-tolerant word search.
+"""
+
+import random
+from typing import List
+
+from app.search import BKTree, FuzzyIndex, decompose, edit_distance
+
+
+def levenshtein(first: str, second: str) -> int:
+    """
+    Compute the Levenshtein distance with the textbook dynamic programming.
+
+    Args:
+        first (str): First string.
+        second (str): Second string.
+
+    Returns:
+        int: Minimum number of insertions, deletions and substitutions.
+    """
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (first_char != second_char),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def random_hangul(rng: random.Random, syllables: List[str]) -> str:
+    """
+    Draw a short Hangul word from a small set of syllables, so that words
+    share jamo.
+
+    Args:
+        rng (random.Random): Random generator.
+        syllables (List[str]): Syllables to draw from.
+
+    Returns:
+        str: Word of 1 to 4 syllables.
+    """
+    return "".join(rng.choice(syllables) for _ in range(rng.randint(1, 4)))
+
+
+def make_syllables(rng: random.Random) -> List[str]:
+    """
+    Draw a set of Hangul syllables, with and without final consonant.
+
+    Args:
+        rng (random.Random): Random generator.
+
+    Returns:
+        List[str]: Hangul syllables.
+    """
+    return [chr(0xAC00 + rng.randrange(11172)) for _ in range(12)] + [
+        chr(0xAC00 + rng.randrange(399) * 28) for _ in range(6)
+    ]
+
+
+def test_decompose() -> None:
+    """
+    Syllables are split into their jamo, other characters are kept.
+    """
+    assert decompose("학교") == "ㅎㅏㄱㄱㅛ"
+    assert decompose("예뻐a") == "ㅇㅖㅃㅓa"
+
+
+def test_edit_distance_matches_levenshtein() -> None:
+    """
+    The bit-parallel distance over jamo equals the textbook one.
+    """
+    rng = random.Random(26)
+    syllables = make_syllables(rng)
+    for _ in range(2000):
+        first = decompose(random_hangul(rng, syllables))
+        second = decompose(random_hangul(rng, syllables))
+        assert edit_distance(first, second) == levenshtein(first, second)
+    assert edit_distance("", "ㅎㅏ") == 2
+    assert edit_distance("ㅎㅏ", "") == 2
+
+
+def test_bktree_search_matches_scan() -> None:
+    """
+    The BK-tree finds the same keys as a scan of all keys.
+    """
+    rng = random.Random(27)
+    syllables = make_syllables(rng)
+    keys = {decompose(random_hangul(rng, syllables)) for _ in range(500)}
+    tree = BKTree()
+    for key in keys:
+        tree.add(key)
+    assert tree.size == len(keys)
+
+    for _ in range(50):
+        query = decompose(random_hangul(rng, syllables))
+        for max_distance in (0, 1, 2, 3):
+            expected = sorted(
+                (levenshtein(query, key), key)
+                for key in keys
+                if levenshtein(query, key) <= max_distance
+            )
+            assert tree.search(query, max_distance) == expected
+
+
+def test_fuzzy_index_search() -> None:
+    """
+    A missing final consonant or a vowel confusion costs one edit.
+    """
+    index = FuzzyIndex()
+    index.build(["학교", "학생", "예쁘다", "사과"])
+    assert index.search("학꾜", 1, 10) == ["학교"]
+    assert index.search("예뻐다", 1, 10) == ["예쁘다"]
+    assert not index.search("사", 1, 10)
+    assert index.search("학교", 3, 1) == ["학교"]
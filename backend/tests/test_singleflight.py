@@ -0,0 +1,127 @@
+"""
+Tests of the single-flight deduplication of concurrent computations.
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from app.metrics import metrics
+from app.singleflight import SingleFlight
+
+
+class Computation:
+    """
+    Computation counting its runs, which waits to be released so that callers
+    pile up while it is in flight.
+    """
+
+    def __init__(self, error: bool = False) -> None:
+        """
+        Initialize the Computation.
+
+        Args:
+            error (bool): If True, the computation raises instead of returning.
+        """
+        self.error = error
+        self.runs = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> List[int]:
+        """
+        Run the computation once released.
+
+        Raises:
+            ValueError: If the computation is set to fail.
+
+        Returns:
+            List[int]: Number of the run, in a fresh list.
+        """
+        self.runs += 1
+        await self.release.wait()
+        if self.error:
+            raise ValueError("computation failed")
+        return [self.runs]
+
+
+@pytest.mark.anyio
+async def test_concurrent_duplicates_run_once() -> None:
+    """
+    Concurrent calls of a key share a single run and its result.
+    """
+    group: SingleFlight[List[int]] = SingleFlight("test_dedup")
+    computation = Computation()
+    calls = [asyncio.create_task(group.do("key", computation)) for _ in range(10)]
+    await asyncio.sleep(0)
+    computation.release.set()
+    results = await asyncio.gather(*calls)
+
+    assert computation.runs == 1
+    assert all(result is results[0] for result in results)
+    assert results[0] == [1]
+    assert metrics.values["test_dedup.calls"] == 10
+    assert metrics.values["test_dedup.shared"] == 9
+    assert metrics.values["test_dedup.dedup_ratio"] == pytest.approx(0.9)
+
+    # The finished computation is forgotten, the next call runs it again
+    assert await group.do("key", computation) == [2]
+    assert computation.runs == 2
+    assert metrics.values["test_dedup.dedup_ratio"] == pytest.approx(9 / 11)
+
+
+@pytest.mark.anyio
+async def test_distinct_keys_run_separately() -> None:
+    """
+    Calls of distinct keys do not share their runs.
+    """
+    group: SingleFlight[List[int]] = SingleFlight("test_keys")
+    first, second = Computation(), Computation()
+    calls = [
+        asyncio.create_task(group.do("first", first)),
+        asyncio.create_task(group.do("second", second)),
+        asyncio.create_task(group.do("first", first)),
+    ]
+    await asyncio.sleep(0)
+    first.release.set()
+    second.release.set()
+    await asyncio.gather(*calls)
+
+    assert (first.runs, second.runs) == (1, 1)
+    assert metrics.values["test_keys.dedup_ratio"] == pytest.approx(1 / 3)
+
+
+@pytest.mark.anyio
+async def test_exception_reaches_every_waiter() -> None:
+    """
+    A failed computation raises its exception in every caller.
+    """
+    group: SingleFlight[List[int]] = SingleFlight("test_error")
+    computation = Computation(error=True)
+    calls = [asyncio.create_task(group.do("key", computation)) for _ in range(5)]
+    await asyncio.sleep(0)
+    computation.release.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert computation.runs == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert not group.calls
+
+
+@pytest.mark.anyio
+async def test_cancelled_caller_does_not_cancel_others() -> None:
+    """
+    Cancelling a caller leaves the shared computation running for the others.
+    """
+    group: SingleFlight[List[int]] = SingleFlight("test_cancel")
+    computation = Computation()
+    cancelled = asyncio.create_task(group.do("key", computation))
+    waiting = asyncio.create_task(group.do("key", computation))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    computation.release.set()
+
+    assert await waiting == [1]
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert computation.runs == 1
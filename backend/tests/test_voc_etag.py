@@ -0,0 +1,95 @@
+"""
+Tests of the conditional reads of the vocabulary, by entity tag.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+ROUTES = ["/user/voc", "/user/voc/status"]
+
+
+def put(client: TestClient, written: str) -> None:
+    """
+    Put a word in the vocabulary of the client's user.
+
+    Args:
+        client (TestClient): Client of the user routes.
+        written (str): Written form of the word.
+    """
+    response = client.put(
+        "/user/voc",
+        json={"written": written, "status": "learned", "updated_at": "2024-01-01"},
+    )
+    assert response.status_code == 200
+
+
+def get_etag(client: TestClient, route: str) -> str:
+    """
+    Read the vocabulary, and its entity tag.
+
+    Args:
+        client (TestClient): Client of the user routes.
+        route (str): Route of the read.
+
+    Returns:
+        str: Entity tag of the vocabulary.
+    """
+    response = client.get(route)
+    assert response.status_code == 200
+    return response.headers["ETag"]
+
+
+@pytest.mark.usefixtures("user_id")
+@pytest.mark.parametrize("route", ROUTES)
+def test_matching_etag_not_modified(client: TestClient, route: str) -> None:
+    """
+    A read with the current entity tag is answered with no body.
+    """
+    put(client, "학교")
+    etag = get_etag(client, route)
+
+    response = client.get(route, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get(route, headers={"If-None-Match": '"0.0"'})
+    assert response.status_code == 200
+    assert response.content
+
+
+@pytest.mark.usefixtures("user_id")
+@pytest.mark.parametrize("route", ROUTES)
+def test_write_changes_etag(client: TestClient, route: str) -> None:
+    """
+    A write changes the entity tag, so the former one is answered in full.
+    """
+    put(client, "학교")
+    etag = get_etag(client, route)
+    put(client, "사과")
+
+    response = client.get(route, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.usefixtures("user_id")
+@pytest.mark.parametrize("route", ROUTES)
+@pytest.mark.parametrize(
+    "if_none_match",
+    ["W/{etag}", '"0.0", {etag}', 'W/"0.0" ,  W/{etag}', '{etag},W/"0.0"', "*"],
+)
+def test_weak_listed_and_any_etags_match(
+    client: TestClient, route: str, if_none_match: str
+) -> None:
+    """
+    Weak entity tags, lists of entity tags and the wildcard match.
+    """
+    put(client, "학교")
+    etag = get_etag(client, route)
+
+    response = client.get(
+        route, headers={"If-None-Match": if_none_match.format(etag=etag)}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
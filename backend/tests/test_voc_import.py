@@ -0,0 +1,52 @@
+"""
+Tests of the vocabulary imports.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.mark.usefixtures("user_id")
+def test_import_mixes_naive_and_aware_timestamps(client: TestClient) -> None:
+    """
+    Words without timestamp, given the naive import time, are imported along
+    words with a time zone.
+    """
+    lines = [
+        {"written": "학교"},
+        {"written": "사과", "status": "seen", "updated_at": "2024-01-01T09:00:00Z"},
+        {"written": "나무", "updated_at": "2024-01-01T09:00:00+09:00"},
+    ]
+    body = "\n".join(json.dumps(line, ensure_ascii=False) for line in lines)
+    response = client.post(
+        "/user/voc/import", params={"format": "ndjson"}, content=body.encode()
+    )
+    assert response.status_code == 200
+    assert response.json()["imported"] == 3
+    assert response.json()["failed"] == 0
+
+    words = {word["written"]: word for word in client.get("/user/voc").json()}
+    assert set(words) == {"학교", "사과", "나무"}
+    assert words["나무"]["updated_at"].startswith("2024-01-01T00:00:00")
+    counts = client.get("/user/voc/status").json()["counts"]
+    assert (counts["learned"], counts["seen"]) == (2, 1)
+
+
+@pytest.mark.usefixtures("user_id")
+def test_batch_mixes_naive_and_aware_timestamps(client: TestClient) -> None:
+    """
+    A batch of words with and without time zone is written at once.
+    """
+    response = client.put(
+        "/user/voc/batch",
+        json=[
+            {"written": "학교", "status": "seen", "updated_at": "2024-01-01T00:00:00"},
+            {"written": "사과", "status": "seen", "updated_at": "2024-01-02T00:00:00Z"},
+        ],
+    )
+    assert response.status_code == 200
+    status = client.get("/user/voc/status").json()
+    assert status["counts"]["seen"] == 2
+    assert status["last_update"].startswith("2024-01-02T00:00:00")
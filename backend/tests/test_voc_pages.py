@@ -0,0 +1,158 @@
+"""
+Tests of the vocabulary listing by pages, with ties on the sort keys.
+"""
+
+import random
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.databases import main_db
+from app.models.user import VOCAB_STATUS_CODES
+from app.schemas import VOCAB_SORTS
+from app.vocabulary import VocRepository
+
+STATUSES = ("learned", "seen", "ignore")
+TIMESTAMPS = ("2024-01-01T00:00:00", "2024-01-02T00:00:00")
+
+# Keys the words are sorted by, statuses by their stored code, ties being
+# broken by lemma identifiers
+SORT_KEYS: Dict[str, Callable[[Tuple[str, str, str]], Tuple[Any, ...]]] = {
+    "written": lambda word: (word[0],),
+    "updated_at": lambda word: (word[2], VOCAB_STATUS_CODES[word[1]]),
+    "status": lambda word: (VOCAB_STATUS_CODES[word[1]], word[2]),
+}
+
+
+@pytest.fixture(name="words")
+def fixture_words(client: TestClient, user_id: int) -> List[Tuple[str, str, str]]:
+    """
+    Put words sharing their statuses and update timestamps in the vocabulary,
+    in random order so that their lemma identifiers do not follow any sort.
+    The written forms are shared by the users, so the lemmas stay few.
+
+    Args:
+        client (TestClient): Client of the user routes.
+        user_id (int): User identifier.
+
+    Returns:
+        List[Tuple[str, str, str]]: Written form, status and update timestamp
+        of the words.
+    """
+    words = [(f"말{i:02d}", STATUSES[i % 3], TIMESTAMPS[i % 2]) for i in range(30)]
+    random.Random(user_id).shuffle(words)
+    response = client.put(
+        "/user/voc/batch",
+        json=[
+            {"written": written, "status": status, "updated_at": updated_at}
+            for written, status, updated_at in words
+        ],
+    )
+    assert response.status_code == 200
+    return words
+
+
+def read_pages(
+    client: TestClient, params: Dict[str, Any], limit: int
+) -> List[Tuple[str, str, str]]:
+    """
+    List the vocabulary following the cursors, page by page.
+
+    Args:
+        client (TestClient): Client of the user routes.
+        params (Dict[str, Any]): Sort, order and statuses of the listing.
+        limit (int): Maximum number of words of a page.
+
+    Returns:
+        List[Tuple[str, str, str]]: Written form, status and update timestamp
+        of the listed words, in order.
+    """
+    words: List[Tuple[str, str, str]] = []
+    cursor = None
+    while True:
+        page_params = {**params, "limit": limit}
+        if cursor is not None:
+            page_params["cursor"] = cursor
+        response = client.get("/user/voc/list", params=page_params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["words"]) <= limit
+        words += [
+            (word["written"], word["status"], word["updated_at"])
+            for word in page["words"]
+        ]
+        cursor = page["cursor"]
+        if not page["more"]:
+            return words
+
+
+def is_dense(
+    client: TestClient, user_id: int, statuses: Sequence[str], limit: int
+) -> bool:
+    """
+    Tell whether the pages of the words with the provided statuses are read by
+    scanning the lemmas.
+
+    Args:
+        client (TestClient): Client of the user routes.
+        user_id (int): User identifier.
+        statuses (Sequence[str]): Statuses of the listed words.
+        limit (int): Maximum number of words of a page.
+
+    Returns:
+        bool: Whether the words are dense among the lemmas.
+    """
+
+    async def check() -> bool:
+        async with main_db.SessionLocal() as session:
+            return await VocRepository(session, user_id).is_dense(statuses, limit)
+
+    assert client.portal is not None
+    dense: bool = client.portal.call(check)
+    return dense
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("sort", VOCAB_SORTS)
+def test_pages_follow_full_listing(
+    client: TestClient, words: List[Tuple[str, str, str]], sort: str, order: str
+) -> None:
+    """
+    Pages cut within words of tied sort keys list every word once, in the order
+    of the listing in a single page.
+    """
+    params = {"sort": sort, "order": order}
+    full = read_pages(client, params, 1000)
+    assert sorted(full) == sorted(words)
+    assert full == sorted(full, key=SORT_KEYS[sort], reverse=order == "desc")
+
+    for limit in (1, 4, 7):
+        assert read_pages(client, params, limit) == full
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize(
+    "listing",
+    [(STATUSES, 4, True), (["ignore"], 4, False), (["seen", "ignore"], 2, True)],
+)
+def test_written_pages_dense_and_sparse(
+    client: TestClient,
+    user_id: int,
+    words: List[Tuple[str, str, str]],
+    order: str,
+    listing: Tuple[Sequence[str], int, bool],
+) -> None:
+    """
+    Pages by written form are the same whether they are read by scanning the
+    lemmas or by sorting the words.
+    """
+    statuses, limit, dense = listing
+    assert is_dense(client, user_id, statuses, limit) == dense
+
+    params = {"sort": "written", "order": order, "status": list(statuses)}
+    expected = sorted(
+        (word for word in words if word[1] in statuses), reverse=order == "desc"
+    )
+    assert read_pages(client, params, limit) == expected
+    assert read_pages(client, params, 1000) == expected
@@ -0,0 +1,94 @@
+"""
+Tests of the vocabulary status summary, maintained along with the writes.
+"""
+
+from typing import Any, Callable, Dict, Tuple
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.databases import main_db
+from app.repository import WordListRepository
+from app.vocabulary import VocRepository
+from app.writer import voc_writer
+
+
+def test_summary_follows_writes(
+    client: TestClient,
+    user_id: int,
+    read_summaries: Callable[[int], Tuple[Dict[str, Any], Dict[str, Any]]],
+) -> None:
+    """
+    The maintained summary matches the one computed from the words after puts,
+    status changes, removals, marks and clears.
+    """
+
+    def check(counts: Dict[str, int]) -> None:
+        maintained, computed = read_summaries(user_id)
+        assert maintained == computed
+        assert {
+            status: count for status, count in maintained.items() if status in counts
+        } == counts
+
+    response = client.put(
+        "/user/voc/batch",
+        json=[
+            {
+                "written": "학교",
+                "status": "learned",
+                "updated_at": "2024-01-01T00:00:00",
+            },
+            {"written": "사과", "status": "seen", "updated_at": "2024-01-02T00:00:00"},
+            {"written": "나무", "status": "seen", "updated_at": "2024-01-01T00:00:00"},
+        ],
+    )
+    assert response.status_code == 200
+    check({"learned": 1, "seen": 2, "ignore": 0})
+
+    # Status change of a word already counted
+    response = client.put(
+        "/user/voc",
+        json={
+            "written": "학교",
+            "status": "ignore",
+            "updated_at": "2024-01-03T00:00:00",
+        },
+    )
+    assert response.status_code == 200
+    check({"learned": 0, "seen": 2, "ignore": 1})
+
+    async def remove() -> None:
+        async def remove_word(session: AsyncSession) -> None:
+            repository = VocRepository(session, user_id)
+            word = await repository.get_by_written("나무")
+            assert word is not None
+            await repository.remove_word(word)
+
+        await voc_writer.run(remove_word)
+
+    assert client.portal is not None
+    client.portal.call(remove)
+    check({"learned": 0, "seen": 1, "ignore": 1})
+
+    async def create_list() -> int:
+        async with main_db.SessionLocal() as session:
+            word_list = await WordListRepository(session).replace(
+                f"list-{user_id}", ["학교", "사과", "바다", "하늘"]
+            )
+            return word_list.id
+
+    list_id = client.portal.call(create_list)
+
+    # Only the new words of the band, then all of them
+    response = client.post("/user/voc/mark", json={"list_id": list_id, "stop": 3})
+    assert response.status_code == 200
+    check({"learned": 1, "seen": 1, "ignore": 1})
+    response = client.post(
+        "/user/voc/mark",
+        json={"list_id": list_id, "status": "seen", "overwrite": True},
+    )
+    assert response.status_code == 200
+    check({"learned": 0, "seen": 4, "ignore": 0})
+
+    assert client.delete("/user/voc").status_code == 204
+    check({"learned": 0, "seen": 0, "ignore": 0})
@@ -0,0 +1,202 @@
+"""
+Tests of the vocabulary sync by change sequence, with the tombstones of the
+removed words.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.vocabulary import VocRepository
+from app.writer import voc_writer
+
+
+def put(client: TestClient, writtens: List[str], status: str = "learned") -> None:
+    """
+    Put words in the vocabulary of the client's user.
+
+    Args:
+        client (TestClient): Client of the user routes.
+        writtens (List[str]): Written forms of the words.
+        status (str): Status of the words.
+    """
+    response = client.put(
+        "/user/voc/batch",
+        json=[
+            {"written": written, "status": status, "updated_at": "2024-01-01T00:00:00"}
+            for written in writtens
+        ],
+    )
+    assert response.status_code == 200
+
+
+def remove(client: TestClient, user_id: int, written: str) -> None:
+    """
+    Remove a word from the vocabulary of a user.
+
+    Args:
+        client (TestClient): Client of the user routes.
+        user_id (int): User identifier.
+        written (str): Written form of the word.
+    """
+
+    async def remove_word(session: AsyncSession) -> None:
+        repository = VocRepository(session, user_id)
+        word = await repository.get_by_written(written)
+        assert word is not None
+        await repository.remove_word(word)
+
+    async def run() -> None:
+        await voc_writer.run(remove_word)
+
+    assert client.portal is not None
+    client.portal.call(run)
+
+
+def sync(
+    client: TestClient, cursor: Optional[str] = None, limit: int = 1000
+) -> Dict[str, Any]:
+    """
+    Read the vocabulary changes following a cursor.
+
+    Args:
+        client (TestClient): Client of the user routes.
+        cursor (Optional[str]): Sync cursor, None to read from the start.
+        limit (int): Maximum number of changes.
+
+    Returns:
+        Dict[str, Any]: Changes, cursor and whether more follow.
+    """
+    params: Dict[str, Any] = {"limit": limit}
+    if cursor is not None:
+        params["cursor"] = cursor
+    response = client.get("/user/voc/sync", params=params)
+    assert response.status_code == 200
+    changes: Dict[str, Any] = response.json()
+    return changes
+
+
+def statuses(changes: List[Tuple[str, Optional[str], Optional[int]]]) -> Dict[str, str]:
+    """
+    Apply changes to an empty vocabulary, as a client does.
+
+    Args:
+        changes (List[Tuple[str, Optional[str], Optional[int]]]): Changes in
+            order.
+
+    Returns:
+        Dict[str, str]: Status of each written form.
+    """
+    vocabulary: Dict[str, str] = {}
+    for written, status, _ in changes:
+        if status is None:
+            vocabulary.pop(written, None)
+        else:
+            vocabulary[written] = status
+    return vocabulary
+
+
+def test_removed_words_synced_as_tombstones(client: TestClient, user_id: int) -> None:
+    """
+    Removed and cleared words follow the cursor as changes without status.
+    """
+    put(client, ["학교", "사과", "나무"])
+    first = sync(client)
+    assert len(first["changes"]) == 3
+    assert not first["more"]
+
+    remove(client, user_id, "학교")
+    removed = sync(client, first["cursor"])
+    assert removed["changes"] == [["학교", None, None]]
+
+    assert client.delete("/user/voc").status_code == 204
+    cleared = sync(client, removed["cursor"])
+    assert sorted(cleared["changes"]) == [["나무", None, None], ["사과", None, None]]
+    assert not statuses(first["changes"] + removed["changes"] + cleared["changes"])
+
+    # Nothing follows the last change
+    assert sync(client, cleared["cursor"])["changes"] == []
+
+
+def test_put_back_word_revived(client: TestClient, user_id: int) -> None:
+    """
+    A word put back after its removal is synced with its status, once.
+    """
+    put(client, ["학교", "사과"])
+    cursor = sync(client)["cursor"]
+    remove(client, user_id, "학교")
+    put(client, ["학교"], status="seen")
+
+    revived = sync(client, cursor)
+    assert [change[:2] for change in revived["changes"]] == [["학교", "seen"]]
+
+    everything = sync(client)["changes"]
+    assert sorted(change[:2] for change in everything) == [
+        ["사과", "learned"],
+        ["학교", "seen"],
+    ]
+
+
+@pytest.mark.usefixtures("user_id")
+def test_resume_from_mid_sequence_cursor(client: TestClient) -> None:
+    """
+    Pages cut within the words of a change, with writes between them, neither
+    drop nor duplicate changes.
+    """
+    put(client, [f"단어{i}" for i in range(25)])
+    put(client, [f"낱말{i}" for i in range(10)], status="seen")
+
+    changes: List[Tuple[str, Optional[str], Optional[int]]] = []
+    cursor = None
+    pages = 0
+    while True:
+        page = sync(client, cursor, limit=7)
+        changes += [tuple(change) for change in page["changes"]]
+        cursor = page["cursor"]
+        pages += 1
+        if pages == 2:
+            # Changes of words already read come again, after the others
+            put(client, ["단어0", "새말"], status="ignore")
+        if not page["more"]:
+            break
+
+    assert pages > 5
+    assert len(changes) == len(set(changes)) == 37
+    assert [written for written, _, _ in changes[-2:]] == ["단어0", "새말"]
+    expected = {f"단어{i}": "learned" for i in range(1, 25)}
+    expected.update({f"낱말{i}": "seen" for i in range(10)})
+    expected.update({"단어0": "ignore", "새말": "ignore"})
+    assert statuses(changes) == expected
+    assert statuses(sync(client)["changes"]) == expected
+
+
+@pytest.mark.usefixtures("user_id")
+def test_changes_since_timestamp(client: TestClient) -> None:
+    """
+    The words updated after a timestamp are retrieved by their update time.
+    """
+    put(client, ["학교"])
+    response = client.put(
+        "/user/voc",
+        json={"written": "사과", "status": "seen", "updated_at": "2024-02-01T00:00:00"},
+    )
+    assert response.status_code == 200
+
+    response = client.get("/user/voc/change/2024-01-15T00:00:00")
+    assert response.status_code == 200
+    assert [word["written"] for word in response.json()] == ["사과"]
+
+
+@pytest.mark.usefixtures("user_id")
+def test_malformed_cursor(client: TestClient) -> None:
+    """
+    Malformed cursors are rejected, and cursors ahead of the vocabulary reset
+    the sync.
+    """
+    put(client, ["학교"])
+    for cursor in ("x", "1:학교", "1.", ".1"):
+        response = client.get("/user/voc/sync", params={"cursor": cursor})
+        assert response.status_code == 400
+    assert sync(client, "1000.1")["reset"]
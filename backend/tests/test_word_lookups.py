@@ -0,0 +1,125 @@
+"""
+Tests of the dictionary word lookups by written forms.
+"""
+
+import random
+from typing import AsyncIterator, Dict, List
+
+import pytest
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.databases.dict_db import SessionLocal, init_db
+from app.models import Sense, SenseTranslation, Word
+from app.repository import WRITTENS_CHUNK_SIZE, WordOptions, WordRepository
+
+# Number of written forms of the test dictionary, many lookup chunks
+LEMMAS = 12000
+
+
+def make_written(i: int) -> str:
+    """
+    Build the written form of a test lemma.
+
+    Args:
+        i (int): Lemma number.
+
+    Returns:
+        str: Hangul written form, unique to the lemma number.
+    """
+    return chr(0xAC00 + i // 100) + chr(0xAC00 + i % 100)
+
+
+@pytest.fixture(name="session")
+async def fixture_session() -> AsyncIterator[AsyncSession]:
+    """
+    Fill the dictionary with LEMMAS written forms, every tenth having a
+    homonym, and every word a sense translated in English.
+
+    Yields:
+        AsyncSession: Dictionary session.
+    """
+    await init_db()
+    words = [
+        {"id": i + 1, "written": make_written(i), "category": "noun"}
+        for i in range(LEMMAS)
+    ]
+    words += [
+        {"id": LEMMAS + i + 1, "written": make_written(i), "category": "verb"}
+        for i in range(0, LEMMAS, 10)
+    ]
+    async with SessionLocal() as dict_session:
+        await dict_session.execute(insert(Word), words)
+        await dict_session.execute(
+            insert(Sense), [{"id": w["id"], "word_id": w["id"]} for w in words]
+        )
+        await dict_session.execute(
+            insert(SenseTranslation),
+            [
+                {
+                    "sense_id": w["id"],
+                    "language": "en_US",
+                    "written": f"word {w['id']}",
+                    "definition": f"definition {w['id']}",
+                }
+                for w in words
+            ],
+        )
+        await dict_session.commit()
+
+        yield dict_session
+
+        for model in (SenseTranslation, Sense, Word):
+            await dict_session.execute(delete(model))
+        await dict_session.commit()
+
+
+@pytest.mark.anyio
+async def test_get_by_writtens_across_chunks(session: AsyncSession) -> None:
+    """
+    Lookups spanning many chunks keep the order of the written forms, skip the
+    missing ones and return each homonym once.
+    """
+    assert LEMMAS > 10 * WRITTENS_CHUNK_SIZE
+    rng = random.Random(28)
+    writtens = [make_written(i) for i in range(LEMMAS)]
+    rng.shuffle(writtens)
+    missing = [f"없음{i}" for i in range(2000)]
+    query = writtens + missing + rng.sample(writtens, 3000)
+    rng.shuffle(query)
+
+    repository = WordRepository(session)
+    words = await repository.get_by_writtens(query)
+
+    # One word per lemma, plus the homonyms, none for the missing forms
+    assert len(words) == LEMMAS + LEMMAS // 10
+    assert len({word.id for word in words}) == len(words)
+
+    # Ordered by first occurrence in the query, homonyms by identifier
+    positions: Dict[str, int] = {}
+    for i, written in enumerate(query):
+        positions.setdefault(written, i)
+    keys = [(positions[word.written], word.id) for word in words]
+    assert keys == sorted(keys)
+
+
+@pytest.mark.anyio
+async def test_get_by_writtens_with_senses(session: AsyncSession) -> None:
+    """
+    Lookups with senses attach the senses of each word, chunk after chunk.
+    """
+    query: List[str] = [make_written(i) for i in range(0, LEMMAS, 3)]
+    query += ["없음", query[0]]
+
+    repository = WordRepository(session)
+    words = await repository.get_by_writtens(query, WordOptions(senses=True))
+    unordered = await repository.get_by_writtens(
+        query, WordOptions(senses=True), order=False
+    )
+
+    assert len(words) == len(query) - 2 + len(range(0, LEMMAS, 30))
+    assert sorted(word.id for word in unordered) == sorted(word.id for word in words)
+    for word in words:
+        senses = word.model_dump()["senses"]
+        assert [sense["translation"] for sense in senses] == [f"word {word.id}"]
+        assert senses[0]["definition"] == f"definition {word.id}"
@@ -0,0 +1,202 @@
+"""
+Tests of the vocabulary words written behind: reads, retries and shutdown.
+"""
+
+import asyncio
+import uuid
+from typing import Callable, Dict, Sequence, Set
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.databases import main_db
+from app.schemas import VocabWordSchema
+from app.vocabulary import VocRepository
+from app.writebehind import WriteBehindBuffer, voc_write_behind
+
+UPDATED_AT = "2024-01-01T00:00:00"
+
+
+def word(written: str, status: str = "learned") -> VocabWordSchema:
+    """
+    Create a word to put.
+
+    Args:
+        written (str): Written form.
+        status (str): Status of the word.
+
+    Returns:
+        VocabWordSchema: Word to put.
+    """
+    return VocabWordSchema(written=written, status=status, updated_at=UPDATED_AT)
+
+
+async def get_statuses(user_id: int) -> Dict[str, str]:
+    """
+    Read the written vocabulary of a user.
+
+    Args:
+        user_id (int): User identifier.
+
+    Returns:
+        Dict[str, str]: Status of each written form.
+    """
+    async with main_db.SessionLocal() as session:
+        return await VocRepository(session, user_id).get_statuses()
+
+
+@pytest.fixture(name="failing")
+def fixture_failing(monkeypatch: pytest.MonkeyPatch) -> Set[int]:
+    """
+    Fail the vocabulary writes of some users, as when the database is locked.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Patcher of VocRepository.put_words.
+
+    Returns:
+        Set[int]: Identifiers of the users whose writes fail.
+    """
+    failing: Set[int] = set()
+    put_words = VocRepository.put_words
+
+    async def fail(self: VocRepository, words: Sequence[VocabWordSchema]) -> None:
+        if self.user_id in failing:
+            raise RuntimeError("database is locked")
+        await put_words(self, words)
+
+    monkeypatch.setattr(VocRepository, "put_words", fail)
+    return failing
+
+
+def test_read_flushes_pending_words(
+    client: TestClient, user_id: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Words put within the window are written before the vocabulary is read.
+    """
+    monkeypatch.setattr(voc_write_behind, "enabled", True)
+    monkeypatch.setattr(voc_write_behind, "window", 60)
+    for written in ("학교", "사과"):
+        response = client.put(
+            "/user/voc",
+            json={"written": written, "status": "seen", "updated_at": UPDATED_AT},
+        )
+        assert response.status_code == 200
+    assert len(voc_write_behind.get_pending(user_id)) == 2
+
+    response = client.get("/user/voc/list")
+    assert response.status_code == 200
+    assert [word["written"] for word in response.json()["words"]] == ["사과", "학교"]
+    assert not voc_write_behind.get_pending(user_id)
+    assert user_id not in voc_write_behind.timers
+
+
+def test_failed_write_retried(
+    client: TestClient, user_id: int, failing: Set[int]
+) -> None:
+    """
+    Words whose write failed are kept pending, newer puts winning, and written
+    after another window.
+    """
+    buffer = WriteBehindBuffer(enabled=True, window=0.05, max_pending=100)
+    failing.add(user_id)
+
+    async def run() -> None:
+        await buffer.put(user_id, word("학교"))
+        with pytest.raises(RuntimeError):
+            await buffer.flush(user_id)
+        await buffer.put(user_id, word("학교", "seen"))
+        assert [word.status for word in buffer.get_pending(user_id)] == ["seen"]
+
+        # Timed flushes fail until the database recovers
+        await asyncio.sleep(0.12)
+        assert user_id in buffer.timers
+        failing.clear()
+        for _ in range(100):
+            if not (buffer.pending or buffer.timers or buffer.locks):
+                break
+            await asyncio.sleep(0.02)
+
+    assert client.portal is not None
+    client.portal.call(run)
+    assert not buffer.get_pending(user_id)
+    assert not buffer.timers
+    assert client.portal.call(get_statuses, user_id) == {"학교": "seen"}
+
+
+def test_flush_all_writes_every_user(
+    client: TestClient,
+    user_id: int,
+    create_user: Callable[[str], int],
+    failing: Set[int],
+) -> None:
+    """
+    On shutdown, the words of every user are written, a failed user not
+    keeping the others from being written.
+    """
+    buffer = WriteBehindBuffer(enabled=True, window=60, max_pending=100)
+    failing_id = create_user(f"google-{uuid.uuid4()}")
+    other_id = create_user(f"google-{uuid.uuid4()}")
+    failing.add(failing_id)
+
+    async def run() -> None:
+        for written in ("학교", "사과"):
+            for pending_id in (failing_id, user_id, other_id):
+                await buffer.put(pending_id, word(written))
+        await buffer.flush_all()
+
+    assert client.portal is not None
+    client.portal.call(run)
+    assert client.portal.call(get_statuses, user_id) == {
+        "학교": "learned",
+        "사과": "learned",
+    }
+    assert client.portal.call(get_statuses, other_id) == {
+        "학교": "learned",
+        "사과": "learned",
+    }
+    assert [word.written for word in buffer.get_pending(failing_id)] == ["학교", "사과"]
+    assert not buffer.timers
+
+
+def test_flush_waits_only_for_own_writes(
+    client: TestClient,
+    user_id: int,
+    create_user: Callable[[str], int],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    A read waits for the write in flight of its user, while a read of a user
+    with nothing pending does not wait for the writes of others.
+    """
+    buffer = WriteBehindBuffer(enabled=True, window=60, max_pending=100)
+    put_words = VocRepository.put_words
+    other_id = create_user(f"google-{uuid.uuid4()}")
+
+    async def run() -> None:
+        released = asyncio.Event()
+
+        async def wait(self: VocRepository, words: Sequence[VocabWordSchema]) -> None:
+            await released.wait()
+            await put_words(self, words)
+
+        monkeypatch.setattr(VocRepository, "put_words", wait)
+        await buffer.put(user_id, word("학교"))
+        await buffer.put(other_id, word("사과"))
+        writing = asyncio.create_task(buffer.flush(user_id))
+        await asyncio.sleep(0.01)
+
+        # Nothing pending nor in flight
+        await asyncio.wait_for(buffer.flush(-1), 1)
+        other = asyncio.create_task(buffer.flush(other_id))
+        reading = asyncio.create_task(buffer.flush(user_id))
+        await asyncio.sleep(0.01)
+        assert not reading.done()
+
+        released.set()
+        await asyncio.gather(writing, reading, other)
+        assert await get_statuses(user_id) == {"학교": "learned"}
+        assert not buffer.locks and not buffer.flushing
+
+    assert client.portal is not None
+    client.portal.call(run)
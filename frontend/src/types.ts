@@ -86,6 +86,8 @@ export interface User {
 export interface VocStatus {
   /** Total number of words learned, seen and ignored. */
   status_count: number
+  /** Number of words of each status. */
+  counts: Record<string, number>
   /** Timestamp of the most recent vocabulary update. */
   last_update: Date
 }